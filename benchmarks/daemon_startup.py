@@ -0,0 +1,69 @@
+"""
+Measures daemon cold start: the time to import daemon.py and the resident memory afterwards.
+
+Each measurement runs in a fresh interpreter. The "eager" variant also imports the
+task modules up front, as the daemon did before tasks were resolved lazily.
+
+Usage: python benchmarks/daemon_startup.py [--runs N]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import daemon
+{extra}
+elapsed = time.perf_counter() - start
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    peak = peak if sys.platform == "darwin" else peak * 1024
+except ImportError:
+    peak = None
+print(json.dumps({{"seconds": elapsed, "peak_rss": peak, "pandas": "pandas" in sys.modules}}))
+"""
+
+VARIANTS = {
+    "lazy": "",
+    "eager": "import src.automation.data_entry, src.automation.email_sender",
+}
+
+
+def measure(extra, runs):
+    samples = []
+    for _ in range(runs):
+        output = subprocess.run(
+            [sys.executable, "-c", PROBE.format(extra=extra)],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout
+        samples.append(json.loads(output.strip().splitlines()[-1]))
+    return samples
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="fresh interpreters per variant (default: 5)")
+    args = parser.parse_args()
+
+    print(f"{'variant':<8} {'import ms (median)':>20} {'peak RSS MB':>12} {'pandas loaded':>14}")
+    for name, extra in VARIANTS.items():
+        samples = measure(extra, args.runs)
+        seconds = statistics.median(s["seconds"] for s in samples)
+        peaks = [s["peak_rss"] for s in samples if s["peak_rss"] is not None]
+        peak = f"{statistics.median(peaks) / 2**20:.1f}" if peaks else "n/a"
+        print(f"{name:<8} {seconds * 1000:>20.1f} {peak:>12} {str(samples[0]['pandas']):>14}")
+
+
+if __name__ == "__main__":
+    main()
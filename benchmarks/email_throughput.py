@@ -0,0 +1,172 @@
+"""
+Measures email throughput of each transport, entirely offline.
+
+The SMTP and Mailgun transports talk to local stand-in servers started by this script,
+with an optional artificial response delay per message. Two paths are measured:
+"bulk" sends a personalized message to every recipient with send_bulk_emails, as a
+send_bulk_email job does (Mailgun gets them in batches of up to 1000 per request);
+"outbox" queues every message and drains the outbox, as scheduled send_email jobs do.
+
+Usage: python benchmarks/email_throughput.py [--messages N] [--latency SECONDS] [--concurrency N]
+"""
+
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import os
+import socketserver
+import sys
+import tempfile
+import threading
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+from src.automation import email_sender  # noqa: E402
+from src.automation.email_outbox import EmailOutbox, OutboxSender  # noqa: E402
+from src.automation.email_transport import MailgunTransport, SMTPTransport, StubTransport  # noqa: E402
+
+# Seconds each stand-in server waits before accepting a message
+LATENCY = 0.0
+
+
+class SMTPSink(socketserver.StreamRequestHandler):
+    """Accepts every message, like a relay that queues everything."""
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        self.reply("220 localhost sink")
+        while line := self.rfile.readline():
+            verb = line.split(b" ", 1)[0].strip().upper()
+            if verb == b"EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif verb == b"DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                for _ in iter(self.rfile.readline, b".\r\n"):
+                    pass
+                time.sleep(LATENCY)
+                self.reply("250 Queued")
+            elif verb == b"QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+class MailgunStub(BaseHTTPRequestHandler):
+    """Accepts every message like the Mailgun messages endpoint."""
+
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        time.sleep(LATENCY)
+        body = b'{"id": "<stub@mailgun>", "message": "Queued. Thank you."}'
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(server):
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def build_messages(count):
+    return [
+        {
+            "from_address": "sender@example.com",
+            "to_addresses": [f"user{i}@example.com"],
+            "subject": f"Notice {i}",
+            "body_text": f"Hello user {i},\nyour report is ready.",
+        }
+        for i in range(count)
+    ]
+
+
+def run_bulk(transport, messages, concurrency):
+    recipients = [{"email": m["to_addresses"][0], "subject": m["subject"]} for m in messages]
+    started = time.perf_counter()
+    results = email_sender.send_bulk_emails(
+        "sender@example.com",
+        recipients,
+        "{subject}",
+        "Hello {email},\nyour report is ready.",
+        max_concurrency=concurrency,
+        transport=transport,
+    )
+    elapsed = time.perf_counter() - started
+    return elapsed, sum(r["status"] == "sent" for r in results)
+
+
+def run_outbox(transport, messages, concurrency):
+    with tempfile.TemporaryDirectory() as spool:
+        outbox = EmailOutbox(os.path.join(spool, "outbox.db"), os.path.join(spool, "attachments"))
+        for message in messages:
+            outbox.enqueue(message)
+
+        sender = OutboxSender(outbox, send=transport.send_email, batch_size=concurrency)
+        started = time.perf_counter()
+        while sender.drain_once():
+            pass
+        elapsed = time.perf_counter() - started
+        sent = outbox.counts().get("sent", 0)
+        outbox.close()
+    return elapsed, sent
+
+
+def main():
+    global LATENCY
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--messages", type=int, default=500, help="messages per run (default: 500)")
+    parser.add_argument("--latency", type=float, default=0.005, help="server delay per message (default: 0.005)")
+    parser.add_argument("--concurrency", type=int, default=email_sender.BULK_CONCURRENCY, help="parallel sends")
+    args = parser.parse_args()
+    LATENCY = args.latency
+
+    smtp_server = serve(socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPSink))
+    http_server = serve(ThreadingHTTPServer(("127.0.0.1", 0), MailgunStub))
+    os.environ.update(
+        MAILGUN_API_KEY="benchmark",
+        MAILGUN_DOMAIN="benchmark.example.com",
+        MAILGUN_API_URL=f"http://127.0.0.1:{http_server.server_address[1]}/v3",
+    )
+    smtp_port = smtp_server.server_address[1]
+
+    transports = {
+        "stub": lambda: StubTransport(latency=args.latency, keep_messages=False),
+        "smtp": lambda: SMTPTransport("127.0.0.1", smtp_port, starttls=False),
+        "smtp-no-reuse": lambda: SMTPTransport("127.0.0.1", smtp_port, starttls=False, max_idle_connections=0),
+        "mailgun": MailgunTransport,
+    }
+    messages = build_messages(args.messages)
+
+    print(f"{args.messages} messages, {args.latency * 1000:.0f} ms server latency, concurrency {args.concurrency}")
+    print(f"{'transport':<14} {'path':<7} {'seconds':>8} {'msg/s':>8} {'sent':>6} {'connections':>12}")
+    for name, make_transport in transports.items():
+        for path, run in (("bulk", run_bulk), ("outbox", run_outbox)):
+            transport = make_transport()
+            elapsed, sent = run(transport, messages, args.concurrency)
+            connections = getattr(transport, "connections_opened", None)
+            transport.close()
+            print(
+                f"{name:<14} {path:<7} {elapsed:>8.2f} {sent / elapsed:>8.0f} {sent:>6} "
+                f"{'-' if connections is None else connections:>12}"
+            )
+
+    smtp_server.shutdown()
+    http_server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
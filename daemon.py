@@ -1,9 +1,14 @@
+import argparse
 import logging
+import multiprocessing
 import os
+import signal
 import time
 
 from watchdog.observers import Observer
 
+from src.automation.email_outbox import OutboxSender, get_outbox
+from src.automation.scheduler.coordination import WorkerCoordinator
 from src.automation.scheduler.job_handler import JSONFileChangeHandler
 from src.automation.scheduler.logging_config import setup_temporary_logging
 from src.automation.scheduler.scheduler_manager import SchedulerManager
@@ -11,17 +16,29 @@ from src.automation.scheduler.scheduler_manager import SchedulerManager
 # Create a logger object
 logger = logging.getLogger(__name__)
 
+# Recurring jobs saved for the same time are staggered across this many seconds
+SPREAD_WINDOW = 10 * 60
 
-def run_daemon():
+# Database the daemon workers coordinate through, next to the jobs file
+COORDINATION_DB = "scheduler_workers.db"
+
+# Seconds to wait for a worker to stop before terminating it
+WORKER_SHUTDOWN_TIMEOUT = 15
+
+
+def run_daemon(worker_id=None):
     """
     Run the daemon with watchdog to detect changes in scheduled_jobs.json.
     Logs go to a temporary file, deleted on normal exit or interrupt.
+    Several daemons (see run_workers) can share the jobs file; each run fires on one of them.
     """
     # Set up temporary logging
     setup_temporary_logging()
 
     logger.info("Starting daemon process.")
-    manager = SchedulerManager(start_scheduler=True)
+    coordinator = WorkerCoordinator(COORDINATION_DB, worker_id=worker_id)
+    logger.info(f"Running as worker {coordinator.worker_id}.")
+    manager = SchedulerManager(start_scheduler=True, spread_window=SPREAD_WINDOW, coordinator=coordinator)
 
     # Set up watchdog event handler
     event_handler = JSONFileChangeHandler(manager)
@@ -32,12 +49,18 @@ def run_daemon():
     observer.schedule(event_handler, path=watch_dir, recursive=False)
     observer.start()
 
+    # Scheduled emails are queued in the outbox; this sends them and retries through outages
+    outbox_sender = OutboxSender(get_outbox())
+    outbox_sender.start()
+
     try:
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
         logger.info("KeyboardInterrupt detected. Shutting down gracefully.")
         print("\nShutting down daemon...")
+        event_handler.stop()
+        outbox_sender.stop()
         manager.shutdown()
         observer.stop()
 
@@ -53,6 +76,8 @@ def run_daemon():
                     logger.error(f"Failed to delete temporary log file: {e}")
     except Exception as e:
         logger.error(f"Daemon error: {e}")
+        event_handler.stop()
+        outbox_sender.stop()
         manager.shutdown()
         observer.stop()
 
@@ -60,5 +85,36 @@ def run_daemon():
     logger.info("Daemon has stopped.")
 
 
+def run_workers(count):
+    """
+    Runs `count` daemon workers as separate processes until interrupted.
+    """
+    workers = [
+        multiprocessing.Process(target=run_daemon, args=(f"{os.getpid()}-worker-{i}",), name=f"worker-{i}")
+        for i in range(count)
+    ]
+    for worker in workers:
+        worker.start()
+
+    try:
+        for worker in workers:
+            worker.join()
+    except KeyboardInterrupt:
+        print("\nShutting down workers...")
+        # Workers receive the same interrupt and shut down on their own; don't abort waiting for them
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        for worker in workers:
+            worker.join(WORKER_SHUTDOWN_TIMEOUT)
+            if worker.is_alive():
+                worker.terminate()
+
+
 if __name__ == "__main__":
-    run_daemon()
+    parser = argparse.ArgumentParser(description="Run the AutoMate scheduling daemon.")
+    parser.add_argument("--workers", type=int, default=1, help="number of worker processes (default: 1)")
+    args = parser.parse_args()
+
+    if args.workers > 1:
+        run_workers(args.workers)
+    else:
+        run_daemon()
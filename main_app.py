@@ -9,6 +9,7 @@ from PyQt5.QtWidgets import (
     QGraphicsDropShadowEffect,
     QHBoxLayout,
     QMainWindow,
+    QMessageBox,
     QPushButton,
     QStackedWidget,
     QVBoxLayout,
@@ -18,12 +19,16 @@ from PyQt5.QtWidgets import (
 from daemon import SchedulerManager
 from src.ui.modals.running_modal import RunningJobsModal
 from src.ui.style import MAIN_WINDOW_STYLE, NAV_BUTTON_STYLE, SIDEBAR_STYLE
+from src.ui.task_runner import wait_for_tasks
 from src.ui.views.data_view import DataView
 from src.ui.views.email_view import EmailView
 from src.ui.views.file_view import FileView
 from src.ui.views.login_view import LoginView
 from src.utils.auth import get_user_by_token, load_user_data, save_user_data
 
+# How long closing the window waits for cancelled background operations to stop
+TASK_SHUTDOWN_TIMEOUT_MS = 5000
+
 
 class MainApp(QMainWindow):
     """
@@ -235,7 +240,17 @@ class MainApp(QMainWindow):
         return container
 
     def closeEvent(self, event):
-        # Gracefully shut down the scheduler on app exit
+        # Stop operations running in the background, then shut down the scheduler on app exit
+        if not wait_for_tasks(TASK_SHUTDOWN_TIMEOUT_MS):
+            # An operation is past its last cancellation point; closing now could leave files half-written
+            QMessageBox.warning(
+                self,
+                "Operations Still Running",
+                "Some file operations are still finishing and can't be interrupted safely. "
+                "Please try closing again in a moment.",
+            )
+            event.ignore()
+            return
         self.scheduler_manager.shutdown()
         super().closeEvent(event)
 
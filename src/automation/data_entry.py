@@ -1,16 +1,64 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
 import ctypes
+import json
+import logging
 import os
 import platform
 import shutil
+import tempfile
+import time
 
+from openpyxl import load_workbook
 import pandas as pd
+from pandas.io.parsers import TextParser
 
 from src.utils.column_mappings import SYNONYMS
+from src.utils.frame_cache import CACHE_DIR, MAX_CACHE_BYTES, FrameCache
 from src.utils.undo_manager import clear_previous_log, log_operation
 
+# Optional fast backends; every reader and writer falls back to pandas' defaults without them
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pa_compute
+    import pyarrow.csv as pa_csv
+
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import xlsxwriter  # noqa: F401
+
+    HAS_XLSXWRITER = True
+except ImportError:
+    HAS_XLSXWRITER = False
+
+logger = logging.getLogger(__name__)
+
 # Define a log file for data operations
 LOG_FILE = "operation_log.json"
 
+# Binary formats used for intermediate or master files
+PARQUET_EXTENSIONS = (".parquet", ".pq")
+FEATHER_EXTENSIONS = (".feather", ".arrow")
+
+# Excel formats the streaming openpyxl reader understands
+OPENPYXL_EXTENSIONS = (".xlsx", ".xlsm")
+
+# Unified column names that must stay text, so codes like "01234" keep their leading zeros
+TEXT_COLUMNS = {
+    "phone",
+    "postal_code",
+    "id",
+    "employee_id",
+    "ssn",
+    "tax_id",
+    "national_id",
+    "passport",
+    "license",
+    "fax",
+}
+
 
 def make_file_hidden_windows(filepath):
     """
@@ -139,30 +187,230 @@ def unify_column_name(col_name: str) -> str:
     return col_name
 
 
-def read_csv_or_excel(path: str) -> pd.DataFrame:
-    """Reads a CSV or Excel file and returns a DataFrame."""
+def infer_column_dtypes(columns) -> dict:
+    """Builds dtype hints from header names, keeping identifier-like columns as text."""
+    return {col: str for col in columns if unify_column_name(col) in TEXT_COLUMNS}
+
+
+def resolve_usecols(columns, wanted) -> list:
+    """
+    Matches the requested columns against a file header, either by exact
+    name or by unified name (e.g. 'email' selects 'E-mail'), in header order.
+    """
+    wanted = list(wanted)
+    unified_wanted = {unify_column_name(col) for col in wanted}
+    return [col for col in columns if col in wanted or unify_column_name(col) in unified_wanted]
+
+
+def read_header(path: str) -> list:
+    """Reads only the column names of a data file."""
     _, ext = os.path.splitext(path.lower())
     if ext == ".csv":
         try:
-            return pd.read_csv(path)
+            return pd.read_csv(path, nrows=0).columns.tolist()
         except pd.errors.EmptyDataError:
-            return pd.DataFrame()
-    else:
+            return []
+    if ext in PARQUET_EXTENSIONS and HAS_PYARROW:
+        import pyarrow.parquet as pa_parquet
+
+        return pa_parquet.read_schema(path).names
+    if ext in OPENPYXL_EXTENSIONS:
+        workbook = load_workbook(path, read_only=True, data_only=True)
         try:
-            return pd.read_excel(path)
-        except pd.errors.EmptyDataError:
-            return pd.DataFrame()
+            first_row = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        finally:
+            workbook.close()
+        return TextParser([[_convert_excel_cell(v) for v in first_row]], header=0).read().columns.tolist()
+    return read_csv_or_excel(path).columns.tolist()
+
+
+def _convert_excel_cell(value):
+    """Converts an openpyxl cell value the same way pandas' openpyxl reader does."""
+    if value is None:
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def _read_xlsx_streaming(path, usecols=None, dtype=None):
+    """
+    Reads the first sheet of an .xlsx file in openpyxl's read-only streaming mode,
+    pulling plain values instead of cell objects and parsing them in one pass.
+    """
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = []
+        last_row_with_data = -1
+        for row in workbook.worksheets[0].iter_rows(values_only=True):
+            converted = [_convert_excel_cell(v) for v in row]
+            # Trim trailing empty cells and rows, as pandas does
+            while converted and converted[-1] == "":
+                converted.pop()
+            if converted:
+                last_row_with_data = len(rows)
+            rows.append(converted)
+    finally:
+        workbook.close()
+
+    rows = rows[: last_row_with_data + 1]
+    if not rows:
+        return pd.DataFrame()
+
+    # Pad short rows so every row has the same width
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    return TextParser(rows, header=0, usecols=usecols, dtype=dtype).read()
+
+
+def _read_csv_pyarrow(path, usecols=None, dtype=None):
+    """
+    Reads a CSV with pyarrow's multithreaded parser. Columns hinted as text and any
+    column pyarrow would turn into dates are kept as strings, matching the C parser.
+    Raises ValueError for files pyarrow can't read exactly, so the caller falls back.
+    """
+    column_types = {col: pa.string() for col in (dtype or {})}
+
+    def read_table():
+        convert_options = pa_csv.ConvertOptions(
+            column_types=column_types, include_columns=usecols or [], strings_can_be_null=True
+        )
+        return pa_csv.read_csv(path, convert_options=convert_options)
+
+    table = read_table()
+    if len(set(table.column_names)) != len(table.column_names):
+        raise ValueError("Duplicate column names are not supported by the pyarrow reader.")
+
+    # Re-read date-like columns as text so they are written back unchanged
+    temporal = [field.name for field in table.schema if pa.types.is_temporal(field.type)]
+    if temporal:
+        column_types.update({name: pa.string() for name in temporal})
+        table = read_table()
+
+    # Integers too big for int64 come back as lossy doubles, where the C parser keeps them exact
+    doubles = [field.name for field in table.schema if pa.types.is_floating(field.type)]
+    if doubles:
+        text = pa_csv.read_csv(
+            path,
+            convert_options=pa_csv.ConvertOptions(
+                column_types={name: pa.string() for name in doubles},
+                include_columns=doubles,
+                strings_can_be_null=True,
+            ),
+        )
+        for name in doubles:
+            values = text.column(name).drop_null()
+            if len(values) and pa_compute.all(pa_compute.match_substring_regex(values, r"^\s*[+-]?\d+\s*$")).as_py():
+                raise ValueError(f"Column '{name}' holds integers too large for the pyarrow reader.")
+
+    df = table.to_pandas()
+
+    # Empty columns are float NaN with the C parser, not None
+    empty = [field.name for field in table.schema if pa.types.is_null(field.type)]
+    if empty:
+        df[empty] = df[empty].astype("float64")
+    return df
+
+
+def _read_csv(path, usecols=None, dtype=None, engine=None):
+    """Reads a CSV with pyarrow when available, otherwise with pandas' C parser."""
+    text_only = not dtype or all(kind in (str, "str", "string", object) for kind in dtype.values())
+    if engine is None:
+        engine = "pyarrow" if HAS_PYARROW and text_only else "c"
+
+    if engine == "pyarrow":
+        try:
+            return _read_csv_pyarrow(path, usecols, dtype)
+        except Exception:
+            # Empty files, duplicate headers and ragged rows go through the C parser
+            pass
+
+    try:
+        return pd.read_csv(path, usecols=usecols, dtype=dtype)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def read_csv_or_excel(path: str, usecols=None, dtype=None, engine=None) -> pd.DataFrame:
+    """
+    Reads a CSV, Excel, Parquet or Feather file and returns a DataFrame.
+    - `usecols`: Optional list of columns to load, matched by exact or unified name.
+    - `dtype`: Optional dtype mapping, or "infer" to derive text hints from the header.
+    - `engine`: Optional reader override ("pyarrow"/"c" for CSV, "openpyxl" for Excel).
+    """
+    _, ext = os.path.splitext(path.lower())
+    if ext in PARQUET_EXTENSIONS:
+        return pd.read_parquet(path, columns=resolve_usecols(read_header(path), usecols) if usecols else None)
+    if ext in FEATHER_EXTENSIONS:
+        df = pd.read_feather(path)
+        return df[resolve_usecols(df.columns, usecols)] if usecols else df
+
+    # Resolve column selection and dtype hints from the header up front
+    if usecols is not None or dtype == "infer":
+        header = read_header(path)
+        if usecols is not None:
+            usecols = resolve_usecols(header, usecols)
+        if dtype == "infer":
+            dtype = infer_column_dtypes(usecols if usecols is not None else header)
+
+    if ext == ".csv":
+        return _read_csv(path, usecols, dtype, engine)
+    if ext in OPENPYXL_EXTENSIONS and engine is None:
+        return _read_xlsx_streaming(path, usecols, dtype)
+
+    try:
+        return pd.read_excel(path, usecols=usecols, dtype=dtype)
+    except pd.errors.EmptyDataError:
+        return pd.DataFrame()
+
+
+def _arrow_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Converts mixed-type object columns (e.g. numbers filled with "") to text for Arrow formats."""
+    mixed = [
+        col
+        for col in df.columns
+        if df[col].dtype == "object" and pd.api.types.infer_dtype(df[col], skipna=True).startswith("mixed")
+    ]
+    if not mixed:
+        return df
+    df = df.copy()
+    for col in mixed:
+        df[col] = df[col].astype(str)
+    return df
 
 
 def write_csv_or_excel(df: pd.DataFrame, path: str):
-    """Writes a DataFrame to a CSV or Excel file."""
+    """Writes a DataFrame to a CSV, Excel, Parquet or Feather file."""
     _, ext = os.path.splitext(path.lower())
     if ext == ".csv":
         df.to_csv(path, index=False)
+    elif ext in PARQUET_EXTENSIONS:
+        _arrow_safe(df).to_parquet(path, index=False)
+    elif ext in FEATHER_EXTENSIONS:
+        _arrow_safe(df).reset_index(drop=True).to_feather(path)
+    elif ext == ".xlsx" and HAS_XLSXWRITER:
+        df.to_excel(path, index=False, engine="xlsxwriter")
     else:
         df.to_excel(path, index=False)
 
 
+def get_frame_cache(data_params):
+    """
+    Returns the parsed-file cache enabled by `use_cache` in the job parameters, or None.
+    `cache_dir` and `cache_max_bytes` override the default location and size budget.
+    """
+    if not data_params or not data_params.get("use_cache"):
+        return None
+    return FrameCache(data_params.get("cache_dir", CACHE_DIR), data_params.get("cache_max_bytes", MAX_CACHE_BYTES))
+
+
+def load_data_file(path: str, cache=None) -> pd.DataFrame:
+    """Reads a data file, going through the parsed-file cache when one is given."""
+    if cache is None:
+        return read_csv_or_excel(path)
+    return cache.load(path, read_csv_or_excel)
+
+
 def find_duplicates(df, matching_columns=None):
     """Identifies duplicates using normalized string comparison."""
 
@@ -183,8 +431,86 @@ def find_duplicates(df, matching_columns=None):
     return dup_mask
 
 
-def merge_data(source_directory, data_params=None):
-    """Merges multiple data files while ensuring consistent name handling."""
+def _normalize_incoming(incoming_df, file_column_map, master_has_full, master_has_split, force_single=False):
+    """
+    Applies a file's explicit column mapping and converts its name columns to the master's format.
+    """
+    # Apply explicit column mapping
+    if file_column_map:
+        incoming_df.rename(columns=file_column_map, inplace=True)
+
+    # Handle name columns based on master structure
+    if master_has_full and not master_has_split:
+        # Master only has full name
+        combine_first_last_into_full(incoming_df)
+        if force_single:
+            # Remove first/last name columns after combining
+            for col in list(incoming_df.columns):
+                if unify_column_name(col) in ["first_name", "last_name"]:
+                    incoming_df.drop(columns=[col], inplace=True)
+    elif master_has_split and not master_has_full:
+        # Master only has split names
+        split_full_into_first_last(incoming_df)
+        if force_single:
+            # Remove full name column after splitting
+            for col in list(incoming_df.columns):
+                if unify_column_name(col) == "full_name":
+                    incoming_df.drop(columns=[col], inplace=True)
+    elif master_has_full and master_has_split:
+        # Master has both - maintain both formats
+        if any(unify_column_name(col) == "full_name" for col in incoming_df.columns):
+            split_full_into_first_last(incoming_df, create_if_missing=not force_single)
+        if any(unify_column_name(col) in ["first_name", "last_name"] for col in incoming_df.columns):
+            combine_first_last_into_full(incoming_df, create_if_missing=not force_single)
+
+    return incoming_df
+
+
+def _read_normalized(path, file_column_map=None, master_has_full=False, master_has_split=False, force_single=False):
+    """Reads one file for merging and normalizes it to the master's format; empty files are returned as read."""
+    incoming_df = read_csv_or_excel(path)
+    if incoming_df.empty:
+        return incoming_df
+    return _normalize_incoming(incoming_df, file_column_map, master_has_full, master_has_split, force_single)
+
+
+def _load_incoming(path, file_column_map, master_has_full, master_has_split, force_single=False, cache=None):
+    """
+    Reads and normalizes one file for merging. Returns None for empty files.
+    The cache stores the normalized frame, keyed by the normalization options,
+    so a hit skips both parsing and normalization.
+    Runs in worker processes when merging in parallel.
+    """
+    options = {
+        "file_column_map": file_column_map,
+        "master_has_full": master_has_full,
+        "master_has_split": master_has_split,
+        "force_single": force_single,
+    }
+    if cache is None:
+        incoming_df = _read_normalized(path, **options)
+    else:
+        incoming_df = cache.load(path, _read_normalized, options)
+    return None if incoming_df.empty else incoming_df
+
+
+def _align_to_columns(df: pd.DataFrame, columns) -> pd.DataFrame:
+    """Adds any missing columns as empty strings and orders the frame by `columns`."""
+    for col in columns:
+        if col not in df.columns:
+            df[col] = ""
+    return df[columns]
+
+
+def merge_data(source_directory, data_params=None, progress=None):
+    """
+    Merges multiple data files while ensuring consistent name handling.
+    Inputs are aligned to a union schema and concatenated once; with `parallel`
+    set in data_params they are loaded in a process pool (`max_workers` sets its size).
+    `progress(done, total)` is called as inputs are loaded; it cancels the merge by raising,
+    in which case the master file is left untouched. The final report (done == total)
+    comes after the master was written, when there's nothing left to cancel.
+    """
     # Remove leftover backups from any previous operation
     clear_previous_log()
 
@@ -196,6 +522,7 @@ def merge_data(source_directory, data_params=None):
     other_files = data_params.get("other_files", [])
     column_map = data_params.get("column_map")
     force_single = data_params.get("force_single_name_col", False)
+    cache = get_frame_cache(data_params)
 
     # Backup the master file before overwiting it
     if master_file and os.path.isfile(master_file):
@@ -206,8 +533,8 @@ def merge_data(source_directory, data_params=None):
         make_file_hidden_windows(backup_file)
         log_operation("merge_data", master_file, backup_file)
 
-    # Read master file
-    master_df = read_csv_or_excel(master_file)
+    # Read master file; it's rewritten on every merge, so a cache entry for it could never be hit again
+    master_df = load_data_file(master_file)
 
     # Check if master is empty
     master_is_empty = master_df.empty
@@ -217,7 +544,7 @@ def merge_data(source_directory, data_params=None):
         # Find first non-empty file to use as template
         for template_file in other_files:
             if os.path.isfile(template_file):
-                template_df = read_csv_or_excel(template_file)
+                template_df = load_data_file(template_file, cache)
                 if not template_df.empty:
                     # Use the exact column names from the template file
                     master_df = template_df.copy()
@@ -266,51 +593,48 @@ def merge_data(source_directory, data_params=None):
         unified = unify_column_name(col)
         master_mapping[unified] = col
 
-    # Track processed files
-    processed_files = set()
-
-    # Process each additional file
-    for f in other_files:
-        if not os.path.isfile(f):
-            continue
-
-        if master_is_empty and f == other_files[0] and len(processed_files) == 0:
-            # Skip re-processing the template file already incorporated
-            processed_files.add(f)
-            continue
-
-        incoming_df = read_csv_or_excel(f)
-        if incoming_df.empty:
+    # Files to merge, skipping the template file already incorporated
+    incoming_files = [
+        f for position, f in enumerate(other_files) if os.path.isfile(f) and not (master_is_empty and position == 0)
+    ]
+
+    # Load and normalize every input, in parallel workers if requested
+    load_args = [
+        (f, column_map.get(f) if column_map else None, master_has_full, master_has_split, force_single, cache)
+        for f in incoming_files
+    ]
+    if data_params.get("parallel") and len(load_args) > 1:
+        max_workers = data_params.get("max_workers") or min(len(load_args), os.cpu_count() or 1)
+        incoming_frames = [None] * len(load_args)
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(_load_incoming, *args): position for position, args in enumerate(load_args)}
+            try:
+                # Check for cancellation as each input arrives, keeping the frames in input order
+                for done, future in enumerate(as_completed(futures)):
+                    if progress is not None:
+                        progress(done, len(load_args) + 1)
+                    incoming_frames[futures[future]] = future.result()
+            except BaseException:
+                # Don't start inputs that are still queued; running ones finish on shutdown
+                for future in futures:
+                    future.cancel()
+                raise
+    else:
+        incoming_frames = []
+        for done, args in enumerate(load_args):
+            if progress is not None:
+                progress(done, len(load_args) + 1)
+            incoming_frames.append(_load_incoming(*args))
+    if progress is not None:
+        progress(len(load_args), len(load_args) + 1)
+
+    # Compute the union schema: master columns, then new columns in order of appearance
+    master_columns = list(master_df.columns)
+    aligned_frames = []
+    for incoming_df in incoming_frames:
+        if incoming_df is None:
             continue
 
-        # Apply explicit column mapping
-        if column_map and f in column_map:
-            incoming_df.rename(columns=column_map[f], inplace=True)
-
-        # Handle name columns based on master structure
-        if master_has_full and not master_has_split:
-            # Master only has full name
-            combine_first_last_into_full(incoming_df)
-            if force_single:
-                # Remove first/last name columns after combining
-                for col in list(incoming_df.columns):
-                    if unify_column_name(col) in ["first_name", "last_name"]:
-                        incoming_df.drop(columns=[col], inplace=True)
-        elif master_has_split and not master_has_full:
-            # Master only has split names
-            split_full_into_first_last(incoming_df)
-            if force_single:
-                # Remove full name column after splitting
-                for col in list(incoming_df.columns):
-                    if unify_column_name(col) == "full_name":
-                        incoming_df.drop(columns=[col], inplace=True)
-        elif master_has_full and master_has_split:
-            # Master has both - maintain both formats
-            if any(unify_column_name(col) == "full_name" for col in incoming_df.columns):
-                split_full_into_first_last(incoming_df, create_if_missing=not force_single)
-            if any(unify_column_name(col) in ["first_name", "last_name"] for col in incoming_df.columns):
-                combine_first_last_into_full(incoming_df, create_if_missing=not force_single)
-
         # Map incoming columns to master columns based on unified names
         col_mapping = {}
         for col in incoming_df.columns:
@@ -328,20 +652,14 @@ def merge_data(source_directory, data_params=None):
             unified = unify_column_name(col)
             if unified not in master_mapping:
                 # This is a new column - add it to master with original formatting
-                master_df[col] = ""
+                master_columns.append(col)
                 master_mapping[unified] = col
 
-        # Add new columns from master if they don't exist in incoming
-        for mcol in master_df.columns:
-            if mcol not in incoming_df.columns:
-                incoming_df[mcol] = ""
+        aligned_frames.append(incoming_df)
 
-        # Reorder columns to match master
-        incoming_df = incoming_df[master_df.columns]
-
-        # Concatenate dataframes efficiently
-        master_df = pd.concat([master_df, incoming_df], ignore_index=True)
-        processed_files.add(f)
+    # Align every frame to the union schema and concatenate once
+    frames = [_align_to_columns(df, master_columns) for df in [master_df] + aligned_frames]
+    master_df = pd.concat(frames, ignore_index=True) if aligned_frames else frames[0]
 
     # Final processing
     master_df.drop_duplicates(inplace=True)
@@ -361,11 +679,406 @@ def merge_data(source_directory, data_params=None):
 
     master_df.drop_duplicates(inplace=True)
     write_csv_or_excel(master_df, master_file)
+    if progress is not None:
+        progress(len(load_args) + 1, len(load_args) + 1)
+
+
+def shape_master_for_target(master_df, target_df, target_file, column_map=None, force_single=False):
+    """
+    Converts master rows to the target's column structure, mapping columns by
+    unified name and converting name columns to the target's name format.
+    """
+    # Apply column mapping if specified
+    master_copy = master_df.copy()
+    if column_map and target_file in column_map:
+        invert_map = {v: k for k, v in column_map[target_file].items()}
+        master_copy.rename(columns=invert_map, inplace=True)
+
+    # Check target name columns
+    target_has_full = any(unify_column_name(col) == "full_name" for col in target_df.columns)
+    target_has_first = any(unify_column_name(col) == "first_name" for col in target_df.columns)
+    target_has_last = any(unify_column_name(col) == "last_name" for col in target_df.columns)
+
+    # Handle name columns based on target structure
+    if target_has_full and not (target_has_first or target_has_last):
+        # Target only has full name - combine first/last in master if needed
+        combine_first_last_into_full(master_copy)
+
+        # Map to the exact full name column name used in target
+        full_col_target = next(c for c in target_df.columns if unify_column_name(c) == "full_name")
+        full_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "full_name"), None)
+
+        if full_col_master and full_col_master != full_col_target:
+            master_copy[full_col_target] = master_copy[full_col_master]
+            master_copy.drop(columns=[full_col_master], inplace=True)
+
+        # Remove any first/last name columns if force_single is enabled
+        if force_single:
+            for col in list(master_copy.columns):
+                if unify_column_name(col) in ["first_name", "last_name"]:
+                    master_copy.drop(columns=[col], inplace=True)
+
+    elif (target_has_first or target_has_last) and not target_has_full:
+        # Target only has separate name fields - split full name in master if needed
+        split_full_into_first_last(master_copy)
+
+        # Map to exact column names used in target
+        if target_has_first:
+            first_col_target = next(c for c in target_df.columns if unify_column_name(c) == "first_name")
+            first_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "first_name"), None)
+            if first_col_master and first_col_master != first_col_target:
+                master_copy[first_col_target] = master_copy[first_col_master]
+                if first_col_master != "First Name":  # Don't drop standard column names
+                    master_copy.drop(columns=[first_col_master], inplace=True)
+
+        if target_has_last:
+            last_col_target = next(c for c in target_df.columns if unify_column_name(c) == "last_name")
+            last_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "last_name"), None)
+            if last_col_master and last_col_master != last_col_target:
+                master_copy[last_col_target] = master_copy[last_col_master]
+                if last_col_master != "Last Name":  # Don't drop standard column names
+                    master_copy.drop(columns=[last_col_master], inplace=True)
+
+        # Remove full name column if force_single is not enabled and target doesn't have it
+        if not force_single:
+            for col in list(master_copy.columns):
+                if unify_column_name(col) == "full_name":
+                    master_copy.drop(columns=[col], inplace=True)
+
+    # Find the first master column for each unified name
+    master_positions = {}
+    for position, col in enumerate(master_copy.columns):
+        if col:
+            master_positions.setdefault(unify_column_name(col), position)
+
+    # Build the new rows column by column, matching the target's structure
+    new_columns = {}
+    for tpos, tcol in enumerate(target_df.columns):
+        mpos = master_positions.get(unify_column_name(tcol))
+        new_columns[tpos] = master_copy.iloc[:, mpos].to_numpy() if mpos is not None else ""
+
+    new_df = pd.DataFrame(new_columns, index=range(len(master_copy)))
+    new_df.columns = target_df.columns
+    return new_df
+
+
+def sync_name_columns(df: pd.DataFrame):
+    """
+    Fills missing full names from first/last names, and missing first/last names
+    from full names, in a frame that carries both formats.
+    """
+    full_col = next((c for c in df.columns if unify_column_name(c) == "full_name"), None)
+    first_col = next((c for c in df.columns if unify_column_name(c) == "first_name"), None)
+    last_col = next((c for c in df.columns if unify_column_name(c) == "last_name"), None)
 
+    if not full_col or not (first_col or last_col):
+        return
 
-def mirror_data(source_directory, data_params=None):
+    for idx in df.index:
+        # Get existing values
+        full_val = str(df.at[idx, full_col]).strip() if pd.notna(df.at[idx, full_col]) else ""
+        f_val = str(df.at[idx, first_col]).strip() if first_col and pd.notna(df.at[idx, first_col]) else ""
+        l_val = str(df.at[idx, last_col]).strip() if last_col and pd.notna(df.at[idx, last_col]) else ""
+
+        # If full name is empty but there is first/last, construct it
+        if not full_val and (f_val or l_val):
+            df.at[idx, full_col] = " ".join([p for p in [f_val, l_val] if p])
+
+        # If there is full name but missing first/last, split it
+        elif full_val and not (f_val and l_val):
+            parts = full_val.split(maxsplit=1)
+            if len(parts) == 2 and first_col and last_col:
+                df.at[idx, first_col] = parts[0]
+                df.at[idx, last_col] = parts[1]
+            elif len(parts) == 1:
+                if last_col:  # Single word goes to last name
+                    df.at[idx, last_col] = parts[0]
+                if first_col:
+                    df.at[idx, first_col] = ""
+
+
+def file_signature(path):
+    """Returns [size, mtime_ns] for a file, or None if it doesn't exist."""
+    try:
+        stat_info = os.stat(path)
+    except OSError:
+        return None
+    return [stat_info.st_size, stat_info.st_mtime_ns]
+
+
+def _normalize_cell(value):
+    """Normalizes a value for row comparison, so 3.0 and '3', or NaN and '', compare equal."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip().lower()
+
+
+def row_fingerprints(df: pd.DataFrame) -> pd.Series:
+    """
+    Hashes each row to a 64-bit fingerprint using the same normalized
+    string comparison as `find_duplicates`.
+    """
+    normalized = pd.DataFrame(
+        {pos: df.iloc[:, pos].map(_normalize_cell) for pos in range(df.columns.size)}, index=df.index
+    )
+    return pd.util.hash_pandas_object(normalized, index=False)
+
+
+def _mirror_state_path(target_file):
+    """Returns the hidden file that tracks what has been mirrored into a target."""
+    dir_name = os.path.dirname(target_file)
+    base_name = os.path.basename(target_file)
+    return os.path.join(dir_name, "." + base_name + ".mirror.json")
+
+
+def load_mirror_state(target_file):
+    """Loads the incremental mirror state for a target, or None if there is none."""
+    state_file = _mirror_state_path(target_file)
+    if not os.path.exists(state_file):
+        return None
+    try:
+        with open(state_file, "r") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_mirror_state(target_file, master_file, columns, fingerprints, params_key):
+    """
+    Records the target's fingerprint set together with the master and target
+    signatures, so the next run can skip targets that are already in sync.
+    """
+    state_file = _mirror_state_path(target_file)
+    state = {
+        "master_file": os.path.abspath(master_file),
+        "master": file_signature(master_file),
+        "target": file_signature(target_file),
+        "params": params_key,
+        "columns": [str(col) for col in columns],
+        "fingerprints": sorted(int(fp) for fp in fingerprints),
+    }
+    with open(state_file, "w") as f:
+        json.dump(state, f)
+    make_file_hidden_windows(state_file)
+
+
+def _mirror_params_key(target_file, column_map, force_single):
+    """Identifies the settings that shape master rows for a target."""
+    target_map = column_map.get(target_file) if column_map else None
+    return json.dumps([target_map, bool(force_single)], sort_keys=True, default=str)
+
+
+def target_in_sync(target_file, master_file, params_key):
+    """
+    True if neither the master nor the target changed since the last incremental mirror.
+    """
+    state = load_mirror_state(target_file)
+    return bool(
+        state
+        and state.get("master_file") == os.path.abspath(master_file)
+        and state.get("master") == file_signature(master_file)
+        and state.get("target") == file_signature(target_file)
+        and state.get("params") == params_key
+    )
+
+
+def append_csv_rows(df: pd.DataFrame, path: str):
+    """Appends rows to an existing CSV file without rewriting it."""
+    needs_newline = False
+    with open(path, "rb") as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell():
+            f.seek(-1, os.SEEK_END)
+            needs_newline = f.read(1) not in (b"\n", b"\r")
+
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        if needs_newline:
+            f.write(os.linesep)
+        df.to_csv(f, header=False, index=False)
+
+
+def _mirror_target_incremental(target_file, master_file, master_raw_df, master_df, column_map, force_single):
+    """
+    Appends only the master rows a target doesn't already have. For CSV targets left
+    untouched since the last run, the stored fingerprints replace reading the target.
+    """
+    _, ext = os.path.splitext(target_file.lower())
+    params_key = _mirror_params_key(target_file, column_map, force_single)
+    state = load_mirror_state(target_file)
+
+    if ext == ".csv" and state and state.get("target") == file_signature(target_file):
+        # Only the target's header is needed to shape the master rows
+        target_df = pd.DataFrame(columns=state["columns"])
+        known = set(state["fingerprints"])
+    else:
+        target_df = read_csv_or_excel(target_file)
+
+        # Handle completely empty file (no columns) - make exact copy
+        if target_df.empty and target_df.columns.size == 0:
+            write_csv_or_excel(master_raw_df, target_file)
+            fingerprints = row_fingerprints(master_raw_df).tolist()
+            save_mirror_state(target_file, master_file, master_raw_df.columns, fingerprints, params_key)
+            return
+
+        known = set(row_fingerprints(target_df).tolist())
+
+    # Keep master rows the target hasn't seen yet, once each
+    new_df = shape_master_for_target(master_df, target_df, target_file, column_map, force_single)
+    new_fingerprints = row_fingerprints(new_df)
+    delta_mask = (~new_fingerprints.isin(known) & ~new_fingerprints.duplicated()).to_numpy()
+    delta_df = new_df[delta_mask]
+
+    if not delta_df.empty:
+        if ext == ".csv":
+            append_csv_rows(delta_df, target_file)
+        else:
+            write_csv_or_excel(pd.concat([target_df, delta_df], ignore_index=True), target_file)
+        known.update(new_fingerprints[delta_mask].tolist())
+
+    save_mirror_state(target_file, master_file, target_df.columns, known, params_key)
+
+
+def _mirror_target(target_file, master_raw_df, master_df, column_map=None, force_single=False):
+    """
+    Appends the master rows to a target and removes duplicates, rewriting the target file.
+    """
+    # Read target file (not cached, since every run rewrites it)
+    target_df = read_csv_or_excel(target_file)
+
+    # Handle completely empty file (no columns) - make exact copy
+    if target_df.empty and target_df.columns.size == 0:
+        write_csv_or_excel(master_raw_df, target_file)
+        return
+
+    # Master rows in the target's column structure
+    new_df = shape_master_for_target(master_df, target_df, target_file, column_map, force_single)
+
+    # Create dataframe with new rows and append to target
+    if not new_df.empty:
+        target_df = pd.concat([target_df, new_df], ignore_index=True)
+
+    # Remove duplicates and write back to file
+    dup_mask = find_duplicates(target_df)
+    if dup_mask.all():
+        # If every row is flagged as duplicate keep one instance per duplicate group
+        target_df.drop_duplicates(inplace=True)
+    else:
+        target_df = target_df[~dup_mask]
+        target_df.drop_duplicates(inplace=True)
+    write_csv_or_excel(target_df, target_file)
+
+
+def _share_frame(df: pd.DataFrame, path_base: str) -> str:
+    """
+    Writes a frame for worker processes: Arrow IPC (Feather) when possible, so
+    workers can memory-map it, otherwise a pickle. Returns the written path.
+    """
+    if HAS_PYARROW:
+        path = path_base + ".feather"
+        try:
+            df.reset_index(drop=True).to_feather(path)
+            return path
+        except (pa.ArrowException, ValueError, TypeError):
+            # Mixed-type object columns can't be stored in Arrow
+            pass
+
+    path = path_base + ".pkl"
+    df.to_pickle(path)
+    return path
+
+
+def _load_shared_frame(path: str) -> pd.DataFrame:
+    """Loads a frame written by `_share_frame`."""
+    if path.endswith(".feather"):
+        import pyarrow.feather as pa_feather
+
+        return pa_feather.read_table(path, memory_map=True).to_pandas()
+    return pd.read_pickle(path)
+
+
+def _mirror_target_worker(target_file, master_file, raw_path, prepared_path, column_map, force_single, incremental):
+    """
+    Process pool entry point: mirrors the shared master into one target.
+    Returns the target and the seconds spent on it.
+    """
+    start = time.perf_counter()
+    master_raw_df = _load_shared_frame(raw_path)
+    master_df = _load_shared_frame(prepared_path)
+
+    if incremental:
+        _mirror_target_incremental(target_file, master_file, master_raw_df, master_df, column_map, force_single)
+    else:
+        _mirror_target(target_file, master_raw_df, master_df, column_map, force_single)
+    return target_file, time.perf_counter() - start
+
+
+def _mirror_targets_parallel(target_files, master_file, master_raw_df, master_df, data_params, progress=None):
+    """
+    Mirrors all targets concurrently in a process pool. The prepared master is
+    written once to a temporary file that every worker loads.
+    `progress(done, total)` is called as each target finishes; if it raises, targets
+    that haven't started are cancelled and the exception propagates.
+    Returns a dict of target -> seconds.
+    """
+    column_map = data_params.get("column_map")
+    force_single = data_params.get("force_single_name_col", False)
+    incremental = data_params.get("incremental", False)
+    max_workers = data_params.get("max_workers") or min(len(target_files), os.cpu_count() or 1)
+
+    timings = {}
+    errors = []
+    with tempfile.TemporaryDirectory(prefix="mirror_") as temp_dir:
+        raw_path = _share_frame(master_raw_df, os.path.join(temp_dir, "master_raw"))
+        prepared_path = _share_frame(master_df, os.path.join(temp_dir, "master_prepared"))
+
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(
+                    _mirror_target_worker,
+                    target_file,
+                    master_file,
+                    raw_path,
+                    prepared_path,
+                    column_map,
+                    force_single,
+                    incremental,
+                ): target_file
+                for target_file in target_files
+            }
+
+            try:
+                # Let every target finish before reporting the first failure
+                for done, future in enumerate(as_completed(futures)):
+                    if progress is not None:
+                        progress(done, len(target_files))
+                    try:
+                        target_file, seconds = future.result()
+                        timings[target_file] = seconds
+                    except Exception as e:
+                        logger.error(f"Mirroring to {futures[future]} failed: {e}")
+                        errors.append(e)
+            except BaseException:
+                # Cancelled: don't start targets that are still queued; running ones finish on shutdown
+                for future in futures:
+                    future.cancel()
+                raise
+
+    if errors:
+        raise errors[0]
+    return timings
+
+
+def mirror_data(source_directory, data_params=None, progress=None):
     """
     Mirror master file data to targets, properly handling name columns and edge cases.
+    - `incremental`: Only append rows a target doesn't have yet, skipping targets already in sync.
+    - `parallel`: Mirror targets concurrently in a process pool (`max_workers` sets its size).
+    `progress(done, total)` is called between targets; it cancels the mirror by raising,
+    and targets already mirrored stay backed up for Undo. The final report (done == total)
+    comes after every target was written.
+    Returns a dict mapping each processed target to the seconds spent on it.
     """
     # Remove leftover backups from any previous operation
     clear_previous_log()
@@ -377,172 +1090,68 @@ def mirror_data(source_directory, data_params=None):
     other_files = data_params.get("other_files", [])
     column_map = data_params.get("column_map")
     force_single = data_params.get("force_single_name_col", False)
-    target_files = data_params.get("other_files", [])
+    incremental = data_params.get("incremental", False)
+    parallel = data_params.get("parallel", False)
+    cache = get_frame_cache(data_params)
 
     if not master_file or not os.path.isfile(master_file):
         return
 
+    # Targets that need work; in-sync targets are skipped in incremental mode
+    target_files = [
+        target
+        for target in other_files
+        if os.path.isfile(target)
+        and not (
+            incremental and target_in_sync(target, master_file, _mirror_params_key(target, column_map, force_single))
+        )
+    ]
+
     # Dictionary to store backups for each target file
     backups = {}
 
-    # Backup each target file that exists before overwriting it
+    # Backup each target file before overwriting it
     for target in target_files:
-        if os.path.isfile(target):
-            dir_name = os.path.dirname(target)
-            base_name = os.path.basename(target)
-            backup = os.path.join(dir_name, "." + base_name + ".bak")
-            shutil.copy(target, backup)
-            make_file_hidden_windows(backup)
-            backups[target] = backup
+        dir_name = os.path.dirname(target)
+        base_name = os.path.basename(target)
+        backup = os.path.join(dir_name, "." + base_name + ".bak")
+        shutil.copy(target, backup)
+        make_file_hidden_windows(backup)
+        backups[target] = backup
 
     # Log the mirror operation with backups mapping
     log_operation("mirror_data", master_file, backups)
 
+    if not target_files:
+        return {}
+
     # Use the columns names from master
-    master_raw_df = read_csv_or_excel(master_file)
+    master_raw_df = load_data_file(master_file, cache)
 
     # A working copy for name unification
     master_df = master_raw_df.copy()
 
-    # Check if master has name columns
-    master_has_full = any(unify_column_name(col) == "full_name" for col in master_df.columns)
-    master_has_first = any(unify_column_name(col) == "first_name" for col in master_df.columns)
-    master_has_last = any(unify_column_name(col) == "last_name" for col in master_df.columns)
-
-    # Process each target file
-    for target_file in other_files:
-        if not os.path.isfile(target_file):
-            continue
-
-        # Read target file
-        target_df = read_csv_or_excel(target_file)
+    # Both name formats exist - ensure they're in sync
+    if not force_single:
+        sync_name_columns(master_df)
 
-        # Handle completely empty file (no columns) - make exact copy
-        if target_df.empty and target_df.columns.size == 0:
-            write_csv_or_excel(master_raw_df, target_file)
-            continue
-
-        # Pre-process master data for name columns if needed
-        if master_has_full and (master_has_first or master_has_last) and not force_single:
-            # Both name formats exist - ensure they're in sync
-            for idx in master_df.index:
-                # Find column names
-                full_col = next((c for c in master_df.columns if unify_column_name(c) == "full_name"), None)
-                first_col = next((c for c in master_df.columns if unify_column_name(c) == "first_name"), None)
-                last_col = next((c for c in master_df.columns if unify_column_name(c) == "last_name"), None)
-
-                if full_col and (first_col or last_col):
-                    # Get existing values
-                    full_val = str(master_df.at[idx, full_col]).strip() if pd.notna(master_df.at[idx, full_col]) else ""
-                    f_val = (
-                        str(master_df.at[idx, first_col]).strip()
-                        if first_col and pd.notna(master_df.at[idx, first_col])
-                        else ""
-                    )
-                    l_val = (
-                        str(master_df.at[idx, last_col]).strip()
-                        if last_col and pd.notna(master_df.at[idx, last_col])
-                        else ""
-                    )
-
-                    # If full name is empty but there is first/last, construct it
-                    if not full_val and (f_val or l_val):
-                        master_df.at[idx, full_col] = " ".join([p for p in [f_val, l_val] if p])
-
-                    # If there is full name but missing first/last, split it
-                    elif full_val and not (f_val and l_val):
-                        parts = full_val.split(maxsplit=1)
-                        if len(parts) == 2 and first_col and last_col:
-                            master_df.at[idx, first_col] = parts[0]
-                            master_df.at[idx, last_col] = parts[1]
-                        elif len(parts) == 1:
-                            if last_col:  # Single word goes to last name
-                                master_df.at[idx, last_col] = parts[0]
-                            if first_col:
-                                master_df.at[idx, first_col] = ""
-
-        # Apply column mapping if specified
-        master_copy = master_df.copy()
-        if column_map and target_file in column_map:
-            invert_map = {v: k for k, v in column_map[target_file].items()}
-            master_copy.rename(columns=invert_map, inplace=True)
-
-        # Check target name columns
-        target_has_full = any(unify_column_name(col) == "full_name" for col in target_df.columns)
-        target_has_first = any(unify_column_name(col) == "first_name" for col in target_df.columns)
-        target_has_last = any(unify_column_name(col) == "last_name" for col in target_df.columns)
-
-        # Handle name columns based on target structure
-        if target_has_full and not (target_has_first or target_has_last):
-            # Target only has full name - combine first/last in master if needed
-            combine_first_last_into_full(master_copy)
-
-            # Map to the exact full name column name used in target
-            full_col_target = next(c for c in target_df.columns if unify_column_name(c) == "full_name")
-            full_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "full_name"), None)
-
-            if full_col_master and full_col_master != full_col_target:
-                master_copy[full_col_target] = master_copy[full_col_master]
-                master_copy.drop(columns=[full_col_master], inplace=True)
-
-            # Remove any first/last name columns if force_single is enabled
-            if force_single:
-                for col in list(master_copy.columns):
-                    if unify_column_name(col) in ["first_name", "last_name"]:
-                        master_copy.drop(columns=[col], inplace=True)
-
-        elif (target_has_first or target_has_last) and not target_has_full:
-            # Target only has separate name fields - split full name in master if needed
-            split_full_into_first_last(master_copy)
-
-            # Map to exact column names used in target
-            if target_has_first:
-                first_col_target = next(c for c in target_df.columns if unify_column_name(c) == "first_name")
-                first_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "first_name"), None)
-                if first_col_master and first_col_master != first_col_target:
-                    master_copy[first_col_target] = master_copy[first_col_master]
-                    if first_col_master != "First Name":  # Don't drop standard column names
-                        master_copy.drop(columns=[first_col_master], inplace=True)
-
-            if target_has_last:
-                last_col_target = next(c for c in target_df.columns if unify_column_name(c) == "last_name")
-                last_col_master = next((c for c in master_copy.columns if unify_column_name(c) == "last_name"), None)
-                if last_col_master and last_col_master != last_col_target:
-                    master_copy[last_col_target] = master_copy[last_col_master]
-                    if last_col_master != "Last Name":  # Don't drop standard column names
-                        master_copy.drop(columns=[last_col_master], inplace=True)
-
-            # Remove full name column if force_single is not enabled and target doesn't have it
-            if not force_single:
-                for col in list(master_copy.columns):
-                    if unify_column_name(col) == "full_name":
-                        master_copy.drop(columns=[col], inplace=True)
-
-        # Prepare new rows that match target's column structure
-        new_rows = []
-        for _, row in master_copy.iterrows():
-            new_row = {}
-            for tcol in target_df.columns:
-                # Find corresponding column in master by unified name
-                mcol = next((c for c in master_copy.columns if unify_column_name(c) == unify_column_name(tcol)), None)
-                if mcol:
-                    new_row[tcol] = row[mcol]
-                else:
-                    new_row[tcol] = ""
-            new_rows.append(new_row)
-
-        # Create dataframe with new rows and append to target
-        if new_rows:
-            new_df = pd.DataFrame(new_rows, columns=target_df.columns)
-            target_df = pd.concat([target_df, new_df], ignore_index=True)
-
-        # Remove duplicates and write back to file
-        dup_mask = find_duplicates(target_df)
-        dup_mask = find_duplicates(target_df)
-        if dup_mask.all():
-            # If every row is flagged as duplicate keep one instance per duplicate group
-            target_df.drop_duplicates(inplace=True)
-        else:
-            target_df = target_df[~dup_mask]
-            target_df.drop_duplicates(inplace=True)
-        write_csv_or_excel(target_df, target_file)
+    if parallel and len(target_files) > 1:
+        timings = _mirror_targets_parallel(target_files, master_file, master_raw_df, master_df, data_params, progress)
+    else:
+        # Process each target file
+        timings = {}
+        for done, target_file in enumerate(target_files):
+            if progress is not None:
+                progress(done, len(target_files))
+            start = time.perf_counter()
+            if incremental:
+                _mirror_target_incremental(target_file, master_file, master_raw_df, master_df, column_map, force_single)
+            else:
+                _mirror_target(target_file, master_raw_df, master_df, column_map, force_single)
+            timings[target_file] = time.perf_counter() - start
+
+    if progress is not None:
+        progress(len(target_files), len(target_files))
+    for target_file, seconds in timings.items():
+        logger.info(f"Mirrored {master_file} -> {target_file} in {seconds:.3f}s")
+    return timings
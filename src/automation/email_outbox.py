@@ -0,0 +1,350 @@
+from concurrent.futures import ThreadPoolExecutor
+import json
+import logging
+import os
+import random
+import shutil
+import sqlite3
+import threading
+import time
+import uuid
+
+# email_sender (and with it requests) is imported on first send, so the daemon can
+# start the outbox sender without loading the HTTP stack
+
+logger = logging.getLogger(__name__)
+
+# Default spool locations, relative to the working directory like scheduled_jobs.json
+OUTBOX_DB = "email_outbox.db"
+OUTBOX_ATTACHMENTS_DIR = "outbox_attachments"
+
+# Messages the sender takes from the outbox at a time, and sends concurrently
+BATCH_SIZE = 20
+
+# Seconds the sender sleeps when the outbox has nothing due
+POLL_INTERVAL = 5
+
+# Attempts before a message is dead-lettered, and the backoff between them
+MAX_ATTEMPTS = 8
+RETRY_BASE_DELAY = 60
+RETRY_MAX_DELAY = 3600
+
+# A message claimed for longer than this is assumed lost with its sender and is retried
+SENDING_LEASE = 600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id TEXT PRIMARY KEY,
+    payload TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    attempts INTEGER NOT NULL DEFAULT 0,
+    next_attempt_at REAL NOT NULL,
+    claimed_at REAL,
+    last_error TEXT,
+    mailgun_id TEXT,
+    created_at REAL NOT NULL,
+    sent_at REAL
+);
+CREATE INDEX IF NOT EXISTS messages_due ON messages (status, next_attempt_at);
+"""
+
+
+def is_permanent_failure(error):
+    """
+    True for errors that retrying can't fix: malformed addresses, oversized attachments,
+    requests Mailgun rejects outright (4xx other than bad credentials or rate limiting)
+    and messages an SMTP server rejects permanently (5xx other than bad credentials).
+    Refused recipients are only permanent when every one was refused with a 5xx code;
+    4xx refusals (mailbox busy, greylisting) clear up on a later attempt.
+    """
+    import smtplib
+
+    from src.automation.email_sender import AttachmentTooLargeError, InvalidAddressError, MailgunError
+
+    if isinstance(error, (InvalidAddressError, AttachmentTooLargeError)):
+        return True
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in error.recipients.values()]
+        return bool(codes) and all(500 <= code < 600 for code in codes)
+    if isinstance(error, MailgunError) and error.status_code is not None:
+        return 400 <= error.status_code < 500 and error.status_code not in (401, 429)
+    if isinstance(error, smtplib.SMTPResponseException) and not isinstance(error, smtplib.SMTPAuthenticationError):
+        return 500 <= error.smtp_code < 600
+    return False
+
+
+class EmailOutbox:
+    """
+    Persistent spool of outgoing emails in SQLite.
+
+    Messages move from 'pending' to 'sending' when a sender claims them, then to 'sent',
+    back to 'pending' with a later attempt time after a transient failure, or to 'dead'
+    once they fail permanently or run out of attempts. Attachments are copied into the
+    spool at enqueue time, so the originals can be removed right away.
+    """
+
+    def __init__(self, path: str = OUTBOX_DB, attachments_dir: str = OUTBOX_ATTACHMENTS_DIR):
+        self.path = path
+        self.attachments_dir = attachments_dir
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        with self._lock:
+            self._connection.executescript(SCHEMA)
+
+    def enqueue(self, message: dict) -> str:
+        """
+        Adds a message (the keyword arguments of send_email_via_mailgun) to the outbox.
+        Returns its id.
+        """
+        message_id = uuid.uuid4().hex
+        payload = dict(message)
+        payload["attachments"] = self._spool_attachments(message_id, message.get("attachments") or [])
+
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO messages (id, payload, next_attempt_at, created_at) VALUES (?, ?, ?, ?)",
+                (message_id, json.dumps(payload), now, now),
+            )
+        return message_id
+
+    def _spool_attachments(self, message_id, attachments):
+        spooled = []
+        for path in attachments:
+            if not os.path.isfile(path):
+                logger.warning(f"Attachment {path} does not exist; queuing the email without it.")
+                continue
+            os.makedirs(self.attachments_dir, exist_ok=True)
+            spooled_path = os.path.join(self.attachments_dir, f"{message_id}_{os.path.basename(path)}")
+            shutil.copyfile(path, spooled_path)
+            spooled.append(spooled_path)
+        return spooled
+
+    def _release_attachments(self, payload):
+        for path in payload.get("attachments") or []:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+    def claim_batch(self, limit: int = BATCH_SIZE):
+        """
+        Marks up to `limit` due messages as being sent and returns them as (id, payload, attempts).
+        Messages left 'sending' by a sender that died are due again after SENDING_LEASE.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._connection.execute(
+                    "SELECT id, payload, attempts FROM messages "
+                    "WHERE (status = 'pending' AND next_attempt_at <= ?) OR (status = 'sending' AND claimed_at < ?) "
+                    "ORDER BY next_attempt_at LIMIT ?",
+                    (now, now - SENDING_LEASE, limit),
+                ).fetchall()
+                self._connection.executemany(
+                    "UPDATE messages SET status = 'sending', claimed_at = ? WHERE id = ?",
+                    [(now, row[0]) for row in rows],
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        return [(message_id, json.loads(payload), attempts) for message_id, payload, attempts in rows]
+
+    def mark_sent(self, message_id, payload, mailgun_id=None):
+        with self._lock:
+            self._connection.execute(
+                "UPDATE messages SET status = 'sent', attempts = attempts + 1, sent_at = ?, mailgun_id = ?, "
+                "last_error = NULL WHERE id = ?",
+                (time.time(), mailgun_id, message_id),
+            )
+        self._release_attachments(payload)
+
+    def mark_failed(self, message_id, payload, attempts, error, permanent=False):
+        """
+        Records a failed attempt: schedules a retry with backoff, or dead-letters the message.
+        """
+        attempts += 1
+        if permanent or attempts >= MAX_ATTEMPTS:
+            status, next_attempt_at = "dead", time.time()
+        else:
+            delay = min(RETRY_MAX_DELAY, RETRY_BASE_DELAY * 2 ** (attempts - 1))
+            status, next_attempt_at = "pending", time.time() + random.uniform(delay / 2, delay)
+
+        with self._lock:
+            self._connection.execute(
+                "UPDATE messages SET status = ?, attempts = ?, next_attempt_at = ?, last_error = ? WHERE id = ?",
+                (status, attempts, next_attempt_at, str(error), message_id),
+            )
+
+        if status == "dead":
+            # Attachments stay spooled so the message can be requeued
+            logger.error(f"Email {message_id} dead-lettered after {attempts} attempt(s): {error}")
+        else:
+            logger.warning(f"Email {message_id} failed (attempt {attempts}), will retry: {error}")
+        return status
+
+    def get(self, message_id):
+        """Returns a message's record as a dict, or None."""
+        with self._lock:
+            cursor = self._connection.execute("SELECT * FROM messages WHERE id = ?", (message_id,))
+            row = cursor.fetchone()
+            columns = [description[0] for description in cursor.description]
+        return dict(zip(columns, row)) if row else None
+
+    def counts(self):
+        """Returns the number of messages in each status."""
+        with self._lock:
+            return dict(self._connection.execute("SELECT status, COUNT(*) FROM messages GROUP BY status").fetchall())
+
+    def dead_letters(self, limit: int = 100):
+        """Returns dead-lettered messages, most recent first."""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT id, payload, attempts, last_error FROM messages WHERE status = 'dead' "
+                "ORDER BY next_attempt_at DESC LIMIT ?",
+                (limit,),
+            ).fetchall()
+        return [
+            {"id": message_id, "message": json.loads(payload), "attempts": attempts, "error": error}
+            for message_id, payload, attempts, error in rows
+        ]
+
+    def requeue(self, message_id):
+        """Puts a dead-lettered message back in the queue. Returns True if it was dead."""
+        with self._lock:
+            cursor = self._connection.execute(
+                "UPDATE messages SET status = 'pending', attempts = 0, next_attempt_at = ? "
+                "WHERE id = ? AND status = 'dead'",
+                (time.time(), message_id),
+            )
+        return cursor.rowcount == 1
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class OutboxSender:
+    """
+    Background thread that drains an EmailOutbox: claims due messages in batches,
+    sends each batch concurrently and records the outcome of every message.
+    `send` defaults to the configured transport's send_email (see email_transport).
+    """
+
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        send=None,
+        batch_size: int = BATCH_SIZE,
+        poll_interval: float = POLL_INTERVAL,
+    ):
+        self.outbox = outbox
+        self.send = send
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="outbox-sender", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 10):
+        self._stop_event.set()
+        self._wake_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wake(self):
+        """Checks the outbox right away, e.g. after enqueueing from the same process."""
+        self._wake_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                sent_any = self.drain_once() > 0
+            except Exception as e:
+                logger.error(f"Outbox sender error: {e}")
+                sent_any = False
+            # Keep draining while there's a backlog
+            if not sent_any:
+                self._wake_event.wait(self.poll_interval)
+                self._wake_event.clear()
+
+    def _deliver(self, item):
+        message_id, payload, attempts = item
+        try:
+            return item, self.send(**payload), None
+        except Exception as e:
+            return item, None, e
+
+    def drain_once(self):
+        """
+        Sends one batch of due messages. Returns the number of messages attempted.
+        """
+        batch = self.outbox.claim_batch(self.batch_size)
+        if not batch:
+            return 0
+
+        if self.send is None:
+            from src.automation.email_transport import get_transport
+
+            self.send = get_transport().send_email
+
+        with ThreadPoolExecutor(max_workers=min(len(batch), self.batch_size)) as pool:
+            for (message_id, payload, attempts), response, error in pool.map(self._deliver, batch):
+                if error is None:
+                    mailgun_id = response.get("id") if isinstance(response, dict) else None
+                    self.outbox.mark_sent(message_id, payload, mailgun_id)
+                else:
+                    self.outbox.mark_failed(message_id, payload, attempts, error, is_permanent_failure(error))
+        return len(batch)
+
+
+_outbox = None
+_outbox_lock = threading.Lock()
+
+
+def get_outbox():
+    """Returns the default outbox, opening it on first use."""
+    global _outbox
+    with _outbox_lock:
+        if _outbox is None:
+            _outbox = EmailOutbox()
+        return _outbox
+
+
+def queue_email(
+    from_address: str,
+    to_addresses: list,
+    subject: str,
+    body_text: str,
+    cc_addresses: list = None,
+    attachments: list = None,
+):
+    """
+    Queues an email in the outbox for the background sender instead of sending it now.
+    Takes the same arguments as send_email_via_mailgun; the sender delivers it through the configured
+    transport. Malformed addresses and oversized attachments are rejected immediately; everything else
+    (outages, rate limits) is retried by the sender.
+    Returns the outbox message id.
+    """
+    from src.automation.email_sender import validate_addresses, validate_attachments
+
+    validate_addresses(from_address, to_addresses, cc_addresses)
+    validate_attachments(attachments)
+    message_id = get_outbox().enqueue(
+        {
+            "from_address": from_address,
+            "to_addresses": to_addresses,
+            "subject": subject,
+            "body_text": body_text,
+            "cc_addresses": cc_addresses,
+            "attachments": attachments,
+        }
+    )
+    logger.info(f"Email to {', '.join(to_addresses)} queued as {message_id}.")
+    return message_id
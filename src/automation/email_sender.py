@@ -1,38 +1,283 @@
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+import functools
+import json
+import logging
 import os
+import random
 import re
+import threading
+import time
 
 from dotenv import load_dotenv
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import NewConnectionError
+
+from src.utils.multipart import MultipartEncoder
 
 # Load environment variables from a .env file
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
 # Regular expression for validating email addresses
 EMAIL_REGEX = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
 
+# Length limits of an address and of the part before the @ (RFC 5321)
+MAX_ADDRESS_LENGTH = 254
+MAX_LOCAL_PART_LENGTH = 64
+
+# Separators between addresses typed into one field
+ADDRESS_SEPARATORS = re.compile(r"[,;\n]")
+
+# Addresses whose validity is remembered by the batch validator
+ADDRESS_CACHE_SIZE = 100000
+
+# Mailgun API base URL; set MAILGUN_API_URL for the EU region (https://api.eu.mailgun.net/v3)
+DEFAULT_MAILGUN_API_URL = "https://api.mailgun.net/v3"
+
+# Connections kept open per host, matching the scheduler's network thread pool
+POOL_MAXSIZE = 10
+
+# (connect, read) timeouts in seconds for each API request
+REQUEST_TIMEOUT = (5, 60)
+
+# Retries for requests the API didn't act on: rate limited, unavailable, or never sent.
+# Other failures (500, 502, 504, read timeouts, dropped connections) may come after the
+# message was queued, and Mailgun has no idempotency key, so retrying them could send it twice.
+MAX_RETRIES = 4
+RETRY_STATUS_CODES = {429, 503}
+RETRY_BACKOFF_BASE = 0.5  # Seconds before the first retry, doubling each time
+RETRY_BACKOFF_MAX = 30
+MAX_RETRY_AFTER = 120  # Longest Retry-After the sender will wait for
+
+# Mailgun's limit on the total size of a message's attachments
+MAX_ATTACHMENT_BYTES = 25 * 1024 * 1024
+
+# Mailgun's cap on recipients of a single (batch) message
+MAX_RECIPIENTS_PER_REQUEST = 1000
+
+# Messages a bulk send has in flight at once, and its default rate limit (messages per second, None for unlimited)
+BULK_CONCURRENCY = POOL_MAXSIZE
+BULK_RATE_LIMIT = None
+
+# Placeholders like {first_name} in bulk subjects and bodies
+TEMPLATE_FIELD = re.compile(r"\{(\w+)\}")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+class InvalidAddressError(ValueError):
+    """Raised when a sender or recipient address is malformed."""
+
+
+class AttachmentTooLargeError(ValueError):
+    """Raised when attachments exceed MAX_ATTACHMENT_BYTES."""
+
+
+class MailgunError(Exception):
+    """Raised when the Mailgun API rejects a message; `status_code` is the HTTP status."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def get_http_session():
+    """
+    Returns the shared HTTP session. Connections to the API are kept alive and reused,
+    so consecutive sends skip the TCP and TLS handshakes.
+    """
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=POOL_MAXSIZE, max_retries=0)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _session = session
+        return _session
+
+
+def retry_delay(attempt, response=None):
+    """
+    Returns the seconds to wait before retry number `attempt` (starting at 1).
+    Honors the server's Retry-After header, otherwise backs off exponentially with full jitter.
+    """
+    retry_after = response.headers.get("Retry-After") if response is not None else None
+    if retry_after:
+        try:
+            delay = float(retry_after)
+        except ValueError:
+            try:
+                delay = parsedate_to_datetime(retry_after).timestamp() - time.time()
+            except (TypeError, ValueError):
+                delay = None
+        if delay is not None:
+            return min(max(delay, 0.0), MAX_RETRY_AFTER)
+
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1)))
+
+
+def validate_attachments(attachments, max_bytes=None):
+    """
+    Checks the attachments' total size before anything is uploaded.
+    Returns the paths that exist; missing files are skipped.
+    """
+    if max_bytes is None:
+        max_bytes = MAX_ATTACHMENT_BYTES
+
+    paths = [path for path in attachments or [] if os.path.isfile(path)]
+    total = sum(os.path.getsize(path) for path in paths)
+    if total > max_bytes:
+        raise AttachmentTooLargeError(
+            f"Attachments total {total / 2**20:.1f} MB;\nthe limit is {max_bytes / 2**20:.0f} MB."
+        )
+    return paths
+
+
+def failed_before_sending(error):
+    """
+    True if a request error happened before any of the request reached the server
+    (connection refused, DNS failure or connect timeout), so it's safe to send again.
+    """
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = error.args[0] if error.args else None
+    return isinstance(getattr(reason, "reason", reason), NewConnectionError)
+
+
+def post_with_retries(url, auth, data, attachments=None, max_retries=None, timeout=REQUEST_TIMEOUT):
+    """
+    POSTs through the shared session, retrying rate-limited (429) and unavailable (503) responses
+    and connections that couldn't be opened, up to `max_retries` times (default MAX_RETRIES).
+    With attachments (file paths), the body is streamed from disk as multipart form data.
+    Returns the last response once retries run out.
+    """
+    if max_retries is None:
+        max_retries = MAX_RETRIES
+    session = get_http_session()
+    attempt = 0
+    while True:
+        try:
+            if attachments:
+                # A streamed body is consumed by sending it, so each attempt gets a fresh one
+                body = MultipartEncoder(data, [("attachment", path) for path in attachments])
+                response = session.post(
+                    url, auth=auth, data=body, headers={"Content-Type": body.content_type}, timeout=timeout
+                )
+            else:
+                response = session.post(url, auth=auth, data=data, files=None, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            if attempt >= max_retries or not failed_before_sending(e):
+                raise
+            attempt += 1
+            delay = retry_delay(attempt)
+            logger.warning(f"Request to {url} failed ({e}); retry {attempt}/{max_retries} in {delay:.1f}s.")
+            time.sleep(delay)
+            continue
+
+        if response.status_code not in RETRY_STATUS_CODES or attempt >= max_retries:
+            return response
+
+        attempt += 1
+        delay = retry_delay(attempt, response)
+        logger.warning(f"{url} returned {response.status_code}; retry {attempt}/{max_retries} in {delay:.1f}s.")
+        time.sleep(delay)
+
+
+def address_problem(address: str):
+    """
+    Returns why an address is malformed, or None if it's valid.
+    Only the syntax is checked; the domain isn't looked up.
+    """
+    if not address:
+        return "empty address"
+    if len(address) > MAX_ADDRESS_LENGTH:
+        return f"longer than {MAX_ADDRESS_LENGTH} characters"
+    if any(char.isspace() for char in address):
+        return "contains spaces"
+    if "@" not in address:
+        return "missing @"
+    if address.count("@") > 1:
+        return "more than one @"
+
+    local_part, domain = address.split("@")
+    if not local_part:
+        return "nothing before @"
+    if len(local_part) > MAX_LOCAL_PART_LENGTH:
+        return f"name before @ longer than {MAX_LOCAL_PART_LENGTH} characters"
+    if not EMAIL_REGEX.match(address) or ".." in domain:
+        return f"invalid domain '{domain}'"
+    return None
+
+
+# address_problem with results remembered, for checking long recipient lists that repeat addresses
+cached_address_problem = functools.lru_cache(maxsize=ADDRESS_CACHE_SIZE)(address_problem)
+
 
 def is_valid_email(email: str) -> bool:
     """
     Validates an email address using a regex pattern.
     """
-    return bool(EMAIL_REGEX.match(email.strip()))
+    return address_problem(email.strip()) is None
 
 
-def validate_addresses(from_address, to_addresses, cc_addresses=None):
+def split_addresses(addresses):
     """
-    Validates sender and recipient email addresses before sending.
+    Splits addresses typed as one string (comma, semicolon or newline separated), or a list of
+    such strings, into stripped addresses. Empty entries are dropped.
     """
-    if not is_valid_email(from_address):
-        raise ValueError(f"Invalid email: {from_address}")
+    if isinstance(addresses, str):
+        addresses = [addresses]
+    stripped = (part.strip() for entry in addresses or [] for part in ADDRESS_SEPARATORS.split(entry or ""))
+    return [address for address in stripped if address]
 
-    for addr in to_addresses:
-        if not is_valid_email(addr):
-            raise ValueError(f"Invalid email: {addr}")
 
-    if cc_addresses:
-        for addr in cc_addresses:
-            if not is_valid_email(addr):
-                raise ValueError(f"Invalid email: {addr}")
+def normalize_addresses(addresses, cache: bool = True):
+    """
+    Cleans up a recipient list in one pass: splits and strips entries, drops case-insensitive
+    duplicates (keeping the first spelling) and sets aside malformed addresses.
+    With `cache`, the validity of each address is remembered across calls.
+
+    Returns (valid addresses, [(invalid address, reason), ...]).
+    """
+    check = cached_address_problem if cache else address_problem
+    valid, invalid = [], []
+    seen = set()
+    for address in split_addresses(addresses):
+        key = address.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+
+        problem = check(address)
+        if problem is None:
+            valid.append(address)
+        else:
+            invalid.append((address, problem))
+    return valid, invalid
+
+
+def chunk_recipients(recipients, size: int = None):
+    """
+    Splits a recipient list into chunks of at most `size` (default MAX_RECIPIENTS_PER_REQUEST),
+    so each chunk fits in a single request to the provider.
+    """
+    size = size or MAX_RECIPIENTS_PER_REQUEST
+    return [recipients[i : i + size] for i in range(0, len(recipients), size)]
+
+
+def validate_addresses(from_address, to_addresses, cc_addresses=None):
+    """
+    Validates sender and recipient email addresses before sending.
+    """
+    for addr in [from_address, *to_addresses, *(cc_addresses or [])]:
+        problem = cached_address_problem((addr or "").strip())
+        if problem is not None:
+            raise InvalidAddressError(f"Invalid email: {addr} ({problem})")
 
 
 def parse_mailgun_error(response):
@@ -60,6 +305,20 @@ def parse_mailgun_error(response):
     return f"Mailgun error (status {response.status_code}). Check your email fields."
 
 
+def get_mailgun_credentials():
+    """
+    Returns (api_key, domain_name) from the environment.
+    Raises ValueError if either is missing.
+    """
+    api_key = os.environ.get("MAILGUN_API_KEY", "").strip()
+    domain_name = os.environ.get("MAILGUN_DOMAIN", "").strip()
+
+    if not api_key or not domain_name:
+        # Raise an error if credentials are missing
+        raise ValueError("Mailgun credentials not set\nin environment variables.")
+    return api_key, domain_name
+
+
 def send_email_via_mailgun(
     from_address: str,
     to_addresses: list,
@@ -80,20 +339,17 @@ def send_email_via_mailgun(
     - attachments: (Optional) List of file paths to attach
     """
 
-    # Retrieve Mailgun credentials from environment variables
-    api_key = os.environ.get("MAILGUN_API_KEY", "").strip()
-    domain_name = os.environ.get("MAILGUN_DOMAIN", "").strip()
-
-    if not api_key.strip() or not domain_name.strip():
-        # Raise an error if credentials are missing
-        raise ValueError("Mailgun credentials not set\nin environment variables.")
-
     # Validate email addresses before sending
     validate_addresses(from_address, to_addresses, cc_addresses)
 
-    # Construct the Mailgun API endpoint URL
-    url = f"https://api.mailgun.net/v3/{domain_name}/messages"
+    data = build_mailgun_payload(from_address, to_addresses, subject, body_text, cc_addresses)
+    return post_to_mailgun(data, attachments)
+
 
+def build_mailgun_payload(from_address, to_addresses, subject, body_text, cc_addresses=None):
+    """
+    Builds the form fields of a Mailgun message.
+    """
     # Format the body text to preserve newlines
     formatted_body = body_text.replace('\n', '<br>')
 
@@ -109,35 +365,296 @@ def send_email_via_mailgun(
     if cc_addresses:
         # Include Cc recipients if provided
         data["cc"] = cc_addresses
+    return data
 
-    # Prepare files if there are attachments
-    files = []
-    if attachments:
-        for path in attachments:
-            if os.path.isfile(path):
-                files.append(("attachment", open(path, "rb")))
 
-    # Make the POST request to Mailgun API
-    try:
-        response = requests.post(url, auth=("api", api_key), data=data, files=files)
-
-        # Close all opened files
-        for _, file in files:
-            file.close()
-
-        # Handle non-200 status codes with a short message
-        if response.status_code == 401:
-            # Means invalid credentials
-            raise Exception("Invalid or missing Mailgun credentials.")
-        elif response.status_code != 200:
-            # Parse a short error from the Mailgun response
-            error_msg = parse_mailgun_error(response)
-            raise Exception(error_msg)
-
-        return response.json()
-
-    except Exception as e:
-        # Make sure files are closed even if an error occurs
-        for _, file in files:
-            file.close()
-        raise e
+def post_to_mailgun(data, attachments=None):
+    """
+    Sends a message built by build_mailgun_payload, with its attachments.
+    Returns Mailgun's response, or raises MailgunError.
+    """
+    # Retrieve Mailgun credentials from environment variables
+    api_key, domain_name = get_mailgun_credentials()
+
+    # Construct the Mailgun API endpoint URL
+    api_url = os.environ.get("MAILGUN_API_URL", "").strip() or DEFAULT_MAILGUN_API_URL
+    url = f"{api_url.rstrip('/')}/{domain_name}/messages"
+
+    # Check attachment sizes before uploading; files are only opened while they're streamed
+    attachment_paths = validate_attachments(attachments)
+
+    # Make the POST request to Mailgun API over the shared session
+    response = post_with_retries(url, auth=("api", api_key), data=data, attachments=attachment_paths)
+
+    # Handle non-200 status codes with a short message
+    if response.status_code == 401:
+        # Means invalid credentials
+        raise MailgunError("Invalid or missing Mailgun credentials.", response.status_code)
+    elif response.status_code != 200:
+        # Parse a short error from the Mailgun response
+        error_msg = parse_mailgun_error(response)
+        raise MailgunError(error_msg, response.status_code)
+
+    return response.json()
+
+
+def send_batch_via_mailgun(
+    from_address: str,
+    recipients: list,
+    subject: str,
+    body_text: str,
+    cc_addresses: list = None,
+    attachments: list = None,
+):
+    """
+    Sends a personalized copy of an email to each recipient in a single Mailgun request
+    (batch sending), filling in the {field} placeholders per recipient on Mailgun's side.
+    `recipients` are dicts with an "email" key plus the fields, at most MAX_RECIPIENTS_PER_REQUEST.
+    """
+    addresses = [recipient["email"] for recipient in recipients]
+    validate_addresses(from_address, addresses, cc_addresses)
+
+    # Placeholders become recipient variables; a recipient without the field keeps the placeholder,
+    # as render_template does
+    template_fields = set(TEMPLATE_FIELD.findall(subject or "")) | set(TEMPLATE_FIELD.findall(body_text or ""))
+    used_fields = {field for field in template_fields if any(field in recipient for recipient in recipients)}
+
+    def to_recipient_variables(template):
+        if not template:
+            return template
+        return TEMPLATE_FIELD.sub(
+            lambda m: f"%recipient.{m.group(1)}%" if m.group(1) in used_fields else m.group(0), template
+        )
+
+    # Recipient variables also keep each recipient from seeing the others' addresses
+    recipient_variables = {
+        recipient["email"]: {
+            field: str(recipient[field]) if field in recipient else f"{{{field}}}" for field in used_fields
+        }
+        for recipient in recipients
+    }
+
+    data = build_mailgun_payload(
+        from_address, addresses, to_recipient_variables(subject), to_recipient_variables(body_text), cc_addresses
+    )
+    data["recipient-variables"] = json.dumps(recipient_variables)
+    return post_to_mailgun(data, attachments)
+
+
+class RateLimiter:
+    """
+    Thread-safe limiter that spaces calls to at most `rate` per second.
+    """
+
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def acquire(self):
+        """Blocks until the caller may proceed."""
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def render_template(template: str, fields: dict) -> str:
+    """
+    Replaces {field} placeholders with values from `fields`.
+    Unknown placeholders and other braces are left as they are.
+    """
+    if not template:
+        return template
+    return TEMPLATE_FIELD.sub(lambda m: str(fields[m.group(1)]) if m.group(1) in fields else m.group(0), template)
+
+
+def build_bulk_messages(from_address, recipients, subject, body_text, cc_addresses=None, attachments=None):
+    """
+    Builds one message per recipient. A recipient is an address, or a dict with an "email"
+    key plus fields for the subject and body placeholders, e.g. {"email": ..., "first_name": "Ann"}.
+    """
+    messages = []
+    for recipient in recipients:
+        fields = dict(recipient) if isinstance(recipient, dict) else {"email": recipient}
+        messages.append(
+            {
+                "from_address": from_address,
+                "to_addresses": [fields.get("email", "")],
+                "subject": render_template(subject, fields),
+                "body_text": render_template(body_text, fields),
+                "cc_addresses": cc_addresses,
+                "attachments": attachments,
+            }
+        )
+    return messages
+
+
+def prepare_recipients(recipients, cache: bool = True):
+    """
+    Normalizes bulk recipients (see build_bulk_messages) in one pass: each becomes a field dict
+    with a stripped "email", and malformed addresses and case-insensitive duplicates are set aside.
+
+    Returns (recipients to send to, results of the ones set aside), both as (position, item)
+    pairs so results can be reported in the original order.
+    """
+    check = cached_address_problem if cache else address_problem
+    accepted, set_aside = [], []
+    seen = set()
+    for position, recipient in enumerate(recipients):
+        fields = dict(recipient) if isinstance(recipient, dict) else {"email": recipient}
+        email = str(fields.get("email") or "").strip()
+        fields["email"] = email
+
+        problem = check(email)
+        if problem is not None:
+            set_aside.append(
+                (position, {"to": [email], "status": "failed", "error": f"Invalid email: {email} ({problem})"})
+            )
+        elif email.lower() in seen:
+            set_aside.append((position, {"to": [email], "status": "skipped", "error": "Duplicate recipient"}))
+        else:
+            seen.add(email.lower())
+            accepted.append((position, fields))
+    return accepted, set_aside
+
+
+def run_concurrently(calls, max_concurrency=None, rate_limit=None):
+    """
+    Runs zero-argument callables on a thread pool, at most `max_concurrency` at once and
+    starting at most `rate_limit` per second (None for no limit).
+    Returns (result, None) or (None, exception) for each call, in order.
+    """
+    limiter = RateLimiter(rate_limit) if rate_limit else None
+
+    def run_one(call):
+        if limiter is not None:
+            limiter.acquire()
+        try:
+            return call(), None
+        except Exception as e:
+            return None, e
+
+    with ThreadPoolExecutor(max_workers=max_concurrency or BULK_CONCURRENCY) as pool:
+        return list(pool.map(run_one, calls))
+
+
+def send_messages(messages, max_concurrency=None, rate_limit=None, transport=None):
+    """
+    Sends many emails concurrently through `transport` (default: the configured transport, see email_transport).
+    Each message is a dict of send_email_via_mailgun's keyword arguments. At most `max_concurrency` sends are
+    in flight, and at most `rate_limit` messages start per second (None for no limit).
+
+    Returns one result per message, in order:
+    {"to": [...], "status": "sent", "id": <message id>} or {"to": [...], "status": "failed", "error": <text>}.
+    """
+    # Imported here, as email_transport builds on this module
+    from src.automation.email_transport import get_transport
+
+    transport = transport or get_transport()
+    calls = [functools.partial(transport.send_email, **message) for message in messages]
+
+    results = []
+    for message, (response, error) in zip(messages, run_concurrently(calls, max_concurrency, rate_limit)):
+        if error is None:
+            results.append({"to": message.get("to_addresses"), "status": "sent", "id": response.get("id")})
+        else:
+            results.append({"to": message.get("to_addresses"), "status": "failed", "error": str(error)})
+    return results
+
+
+def send_batches(
+    batches,
+    from_address,
+    subject,
+    body_text,
+    cc_addresses=None,
+    attachments=None,
+    max_concurrency=None,
+    rate_limit=None,
+    transport=None,
+):
+    """
+    Sends each batch of recipient field dicts as one personalized request through a transport
+    that supports batch sending. `max_concurrency` and `rate_limit` apply to requests.
+    Returns one result per recipient, in order, in the send_messages format.
+    """
+    from src.automation.email_transport import get_transport
+
+    transport = transport or get_transport()
+    calls = [
+        functools.partial(transport.send_batch, from_address, batch, subject, body_text, cc_addresses, attachments)
+        for batch in batches
+    ]
+
+    results = []
+    for batch, (response, error) in zip(batches, run_concurrently(calls, max_concurrency, rate_limit)):
+        for recipient in batch:
+            if error is None:
+                results.append({"to": [recipient["email"]], "status": "sent", "id": response.get("id")})
+            else:
+                results.append({"to": [recipient["email"]], "status": "failed", "error": str(error)})
+    return results
+
+
+def send_bulk_emails(
+    from_address: str,
+    recipients: list,
+    subject: str,
+    body_text: str,
+    cc_addresses: list = None,
+    attachments: list = None,
+    max_concurrency: int = None,
+    rate_limit: float = BULK_RATE_LIMIT,
+    transport=None,
+):
+    """
+    Sends a personalized copy of an email to each recipient, concurrently.
+    See build_bulk_messages for the recipient format and send_messages for the results.
+
+    Recipients are normalized first: malformed addresses fail without a request and repeated
+    addresses are skipped. Transports that support batch sending (Mailgun) get the recipients in
+    chunks of their batch size, one request per chunk; others get one message per recipient.
+    Raises if no message could be sent at all.
+    """
+    from src.automation.email_transport import get_transport
+
+    # Fail fast rather than once per recipient
+    transport = transport or get_transport()
+    transport.check()
+
+    accepted, set_aside = prepare_recipients(recipients)
+    fields = [recipient for _, recipient in accepted]
+    started = time.monotonic()
+
+    if transport.batch_size > 1:
+        sent = send_batches(
+            chunk_recipients(fields, transport.batch_size),
+            from_address,
+            subject,
+            body_text,
+            cc_addresses,
+            attachments,
+            transport=transport,
+            max_concurrency=max_concurrency,
+            rate_limit=rate_limit,
+        )
+    else:
+        messages = build_bulk_messages(from_address, fields, subject, body_text, cc_addresses, attachments)
+        sent = send_messages(messages, max_concurrency=max_concurrency, rate_limit=rate_limit, transport=transport)
+
+    # Back in the order the recipients were given
+    positioned = set_aside + [(position, result) for (position, _), result in zip(accepted, sent)]
+    results = [result for _, result in sorted(positioned, key=lambda pair: pair[0])]
+
+    failed = [r for r in results if r["status"] == "failed"]
+    sent_count = sum(r["status"] == "sent" for r in results)
+    logger.info(
+        f"Bulk send finished in {time.monotonic() - started:.1f}s: "
+        f"{sent_count} sent, {len(failed)} failed, {len(results) - sent_count - len(failed)} skipped."
+    )
+    if failed and not sent_count:
+        raise Exception(f"No emails could be sent: {failed[0]['error']}")
+    return results
@@ -0,0 +1,350 @@
+from email.message import EmailMessage
+from email.utils import formatdate, make_msgid
+import logging
+import mimetypes
+import os
+import smtplib
+import threading
+import time
+import uuid
+
+from src.automation import email_sender
+from src.automation.email_sender import (
+    POOL_MAXSIZE,
+    get_mailgun_credentials,
+    send_batch_via_mailgun,
+    send_email_via_mailgun,
+    validate_addresses,
+    validate_attachments,
+)
+
+logger = logging.getLogger(__name__)
+
+# Transport used when EMAIL_TRANSPORT isn't set
+DEFAULT_TRANSPORT = "mailgun"
+
+# Seconds to wait on an SMTP server before giving up
+SMTP_TIMEOUT = 30
+
+_transport = None
+_transport_lock = threading.Lock()
+
+
+def build_mime_message(from_address, to_addresses, subject, body_text, cc_addresses=None, attachments=None):
+    """
+    Builds the email send_email_via_mailgun would send, as a MIME message:
+    a plain text body with an HTML alternative, plus attachments.
+    """
+    message = EmailMessage()
+    message["From"] = from_address
+    message["To"] = ", ".join(to_addresses)
+    if cc_addresses:
+        message["Cc"] = ", ".join(cc_addresses)
+    message["Subject"] = subject or ""
+    message["Date"] = formatdate(localtime=True)
+    message["Message-ID"] = make_msgid()
+
+    body_text = body_text or ""
+    message.set_content(body_text)
+    formatted_body = body_text.replace('\n', '<br>')
+    message.add_alternative(f"<div style='white-space: pre-line;'>{formatted_body}</div>", subtype="html")
+
+    for path in attachments or []:
+        content_type = mimetypes.guess_type(path)[0] or "application/octet-stream"
+        maintype, subtype = content_type.split("/", 1)
+        with open(path, "rb") as f:
+            message.add_attachment(f.read(), maintype=maintype, subtype=subtype, filename=os.path.basename(path))
+    return message
+
+
+class EmailTransport:
+    """
+    Delivers emails. `send_email` takes the arguments of send_email_via_mailgun and returns
+    a dict with the message "id"; it raises when the message can't be sent.
+    Transports with a `batch_size` above 1 can also personalize one email for that many
+    recipients in a single request, with `send_batch` (see send_batch_via_mailgun).
+    Transports are shared by the threads sending concurrently.
+    """
+
+    name = None
+    batch_size = 1
+
+    def check(self):
+        """Raises ValueError if the transport isn't configured, before anything is sent."""
+
+    def send_email(
+        self,
+        from_address: str,
+        to_addresses: list,
+        subject: str,
+        body_text: str,
+        cc_addresses: list = None,
+        attachments: list = None,
+    ) -> dict:
+        raise NotImplementedError
+
+    def send_batch(self, from_address, recipients, subject, body_text, cc_addresses=None, attachments=None) -> dict:
+        raise NotImplementedError(f"The {self.name} transport doesn't support batch sending.")
+
+    def close(self):
+        """Releases connections held by the transport."""
+
+
+class MailgunTransport(EmailTransport):
+    """
+    Sends through the Mailgun HTTP API over the shared session (see send_email_via_mailgun).
+    """
+
+    name = "mailgun"
+
+    @property
+    def batch_size(self):
+        return email_sender.MAX_RECIPIENTS_PER_REQUEST
+
+    def check(self):
+        get_mailgun_credentials()
+
+    def send_email(self, *args, **kwargs):
+        return send_email_via_mailgun(*args, **kwargs)
+
+    def send_batch(self, *args, **kwargs):
+        return send_batch_via_mailgun(*args, **kwargs)
+
+
+class SMTPTransport(EmailTransport):
+    """
+    Sends through an SMTP server with smtplib. Connections are kept open and reused
+    across messages; each concurrent sender takes its own from the pool, and up to
+    `max_idle_connections` stay open between sends. A connection the server closed
+    while idle is replaced once before the send fails.
+    """
+
+    name = "smtp"
+
+    def __init__(
+        self,
+        host: str,
+        port: int = 587,
+        username: str = None,
+        password: str = None,
+        starttls: bool = True,
+        use_ssl: bool = False,
+        timeout: float = SMTP_TIMEOUT,
+        max_idle_connections: int = POOL_MAXSIZE,
+    ):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.starttls = starttls
+        self.use_ssl = use_ssl
+        self.timeout = timeout
+        self.max_idle_connections = max_idle_connections
+        self.connections_opened = 0
+        self._idle = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls):
+        """
+        Configures the transport from SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD,
+        SMTP_STARTTLS and SMTP_SSL.
+        """
+        host = os.environ.get("SMTP_HOST", "").strip()
+        if not host:
+            raise ValueError("SMTP_HOST not set\nin environment variables.")
+        use_ssl = os.environ.get("SMTP_SSL", "").strip().lower() in ("1", "true", "yes")
+        return cls(
+            host=host,
+            port=int(os.environ.get("SMTP_PORT", "").strip() or (465 if use_ssl else 587)),
+            username=os.environ.get("SMTP_USERNAME", "").strip() or None,
+            password=os.environ.get("SMTP_PASSWORD", "").strip() or None,
+            starttls=os.environ.get("SMTP_STARTTLS", "true").strip().lower() in ("1", "true", "yes"),
+            use_ssl=use_ssl,
+        )
+
+    def _connect(self):
+        if self.use_ssl:
+            connection = smtplib.SMTP_SSL(self.host, self.port, timeout=self.timeout)
+        else:
+            connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+            connection.ehlo()
+            if self.starttls and connection.has_extn("starttls"):
+                connection.starttls()
+                connection.ehlo()
+        if self.username:
+            connection.login(self.username, self.password or "")
+        with self._lock:
+            self.connections_opened += 1
+        return connection
+
+    def _acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return self._connect()
+
+    def _release(self, connection):
+        with self._lock:
+            if len(self._idle) < self.max_idle_connections:
+                self._idle.append(connection)
+                return
+        self._quit(connection)
+
+    @staticmethod
+    def _quit(connection):
+        try:
+            connection.quit()
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+
+    def send_email(
+        self,
+        from_address: str,
+        to_addresses: list,
+        subject: str,
+        body_text: str,
+        cc_addresses: list = None,
+        attachments: list = None,
+    ):
+        validate_addresses(from_address, to_addresses, cc_addresses)
+        message = build_mime_message(
+            from_address, to_addresses, subject, body_text, cc_addresses, validate_attachments(attachments)
+        )
+
+        connection = self._acquire()
+        try:
+            try:
+                refused = connection.send_message(message)
+            except smtplib.SMTPServerDisconnected:
+                # The server dropped the connection while it sat in the pool
+                connection.close()
+                connection = self._connect()
+                refused = connection.send_message(message)
+        except (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused):
+            # The server refused this message; the connection itself is still usable
+            self._release(connection)
+            raise
+        except (smtplib.SMTPException, OSError):
+            connection.close()
+            raise
+
+        self._release(connection)
+        if refused:
+            logger.warning(f"SMTP server refused some recipients: {', '.join(refused)}")
+        return {"id": message["Message-ID"], "message": "Queued."}
+
+    def close(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for connection in idle:
+            self._quit(connection)
+
+
+class StubTransport(EmailTransport):
+    """
+    Accepts emails without delivering them, for load tests and trying out jobs offline.
+    Messages are kept in `sent` and, when `directory` is set, also written there as .eml files.
+    `latency` adds a delay per message, to stand in for a provider's response time.
+    """
+
+    name = "stub"
+
+    def __init__(self, directory: str = None, latency: float = 0.0, keep_messages: bool = True):
+        self.directory = directory
+        self.latency = latency
+        self.keep_messages = keep_messages
+        self.sent = []
+        self.count = 0
+        self._lock = threading.Lock()
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @classmethod
+    def from_env(cls):
+        """Configures the transport from EMAIL_DROP_DIR and EMAIL_STUB_LATENCY."""
+        return cls(
+            directory=os.environ.get("EMAIL_DROP_DIR", "").strip() or None,
+            latency=float(os.environ.get("EMAIL_STUB_LATENCY", "").strip() or 0),
+        )
+
+    def send_email(
+        self,
+        from_address: str,
+        to_addresses: list,
+        subject: str,
+        body_text: str,
+        cc_addresses: list = None,
+        attachments: list = None,
+    ):
+        validate_addresses(from_address, to_addresses, cc_addresses)
+        attachments = validate_attachments(attachments)
+        message_id = f"<{uuid.uuid4().hex}@stub>"
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if self.directory:
+            message = build_mime_message(from_address, to_addresses, subject, body_text, cc_addresses, attachments)
+            message.replace_header("Message-ID", message_id)
+            path = os.path.join(self.directory, f"{time.time_ns()}-{message_id[1:33]}.eml")
+            # Write under a temporary name so readers never see a partial message
+            with open(f"{path}.tmp", "wb") as f:
+                f.write(message.as_bytes())
+            os.replace(f"{path}.tmp", path)
+
+        with self._lock:
+            self.count += 1
+            if self.keep_messages:
+                self.sent.append(
+                    {
+                        "id": message_id,
+                        "from_address": from_address,
+                        "to_addresses": to_addresses,
+                        "subject": subject,
+                        "body_text": body_text,
+                        "cc_addresses": cc_addresses,
+                        "attachments": attachments,
+                    }
+                )
+        return {"id": message_id, "message": "Queued."}
+
+
+# Transport classes by EMAIL_TRANSPORT value, with how to build each from the environment
+TRANSPORTS = {
+    "mailgun": MailgunTransport,
+    "smtp": SMTPTransport.from_env,
+    "stub": StubTransport.from_env,
+}
+
+
+def transport_from_env():
+    """Builds the transport named by EMAIL_TRANSPORT (mailgun, smtp or stub)."""
+    name = os.environ.get("EMAIL_TRANSPORT", "").strip().lower() or DEFAULT_TRANSPORT
+    if name not in TRANSPORTS:
+        raise ValueError(f"Unknown email transport '{name}'. Expected one of {', '.join(TRANSPORTS)}.")
+    return TRANSPORTS[name]()
+
+
+def get_transport():
+    """
+    Returns the transport emails are sent through, built from the environment on first use
+    and shared from then on, so SMTP connections are reused across sends.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is None:
+            _transport = transport_from_env()
+            logger.info(f"Sending email through the {_transport.name} transport.")
+        return _transport
+
+
+def set_transport(transport):
+    """
+    Replaces the shared transport, e.g. with a StubTransport for a load test.
+    Passing None goes back to the one configured in the environment. Returns the previous transport.
+    """
+    global _transport
+    with _transport_lock:
+        previous, _transport = _transport, transport
+    return previous
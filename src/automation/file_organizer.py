@@ -1,11 +1,34 @@
 from datetime import datetime
 import hashlib
-import json
 import os
 import shutil
 import zipfile
 
-LOG_FILE = "operation_log.json"
+from src.utils.undo_manager import write_operation_log
+
+
+def _list_files(source_directory, skip_hidden_dirs=False):
+    """
+    Returns the paths of the non-hidden files under a directory, listed before any of them is touched,
+    so an operation knows its total up front and never revisits files it has already moved.
+    """
+    file_paths = []
+    for root, dirs, files in os.walk(source_directory, topdown=True):
+        if skip_hidden_dirs:
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
+        file_paths.extend(os.path.join(root, file) for file in files if not file.startswith('.'))
+    return file_paths
+
+
+def _report_progress(kwargs, done, total):
+    """
+    Calls the `progress(done, total)` callback passed to an operation, if any.
+    The callback cancels the operation by raising; what was done until then stays logged for Undo.
+    The final report (done == total) comes once the operation's changes are complete.
+    """
+    progress = kwargs.get('progress')
+    if progress is not None:
+        progress(done, total)
 
 
 def sort_by_type(source_directory, **kwargs):
@@ -29,13 +52,12 @@ def sort_by_type(source_directory, **kwargs):
     operation_log = []  # Log file movements
     folders_created = set()  # Track folders to be created
 
-    # Traverse the directory to locate and categorize files
-    for root, _, files in os.walk(source_directory, topdown=True):
-        for file in files:
-            if file.startswith("."):  # Skip hidden files
-                continue
-
-            file_path = os.path.join(root, file)
+    # Locate and categorize files
+    file_paths = _list_files(source_directory)
+    try:
+        for done, file_path in enumerate(file_paths):
+            _report_progress(kwargs, done, len(file_paths))
+            file = os.path.basename(file_path)
             file_ext = os.path.splitext(file)[1].lower()
 
             for dir_name, extensions in type_directories.items():
@@ -51,12 +73,13 @@ def sort_by_type(source_directory, **kwargs):
                     # Log the operation for undo functionality
                     operation_log.append({"original": file_path, "new": new_path})
                     break
+        _report_progress(kwargs, len(file_paths), len(file_paths))
+    finally:
+        # Save the operation log to a JSON file, even if the operation was cancelled
+        if operation_log:
+            write_operation_log({"operations": operation_log, "folders": list(folders_created)})
 
-    # Save the operation log to a JSON file
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log, "folders": list(folders_created)}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
 
 
@@ -73,15 +96,12 @@ def sort_by_date(source_directory, **kwargs):
     operation_log = []  # Log file movements
     folders_to_create = set()  # Track folders to be created
 
-    for root, dirs, files in os.walk(source_directory, topdown=True):
-        # Exclude hidden directories from traversal
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-        for file in files:
-            if file.startswith('.'):
-                continue  # Skip hidden files
-
-            file_path = os.path.join(root, file)
+    # Exclude hidden directories and files
+    file_paths = _list_files(source_directory, skip_hidden_dirs=True)
+    try:
+        for done, file_path in enumerate(file_paths):
+            _report_progress(kwargs, done, len(file_paths))
+            file = os.path.basename(file_path)
 
             # Get the modification date of the file
             mod_time = os.path.getmtime(file_path)
@@ -105,12 +125,13 @@ def sort_by_date(source_directory, **kwargs):
 
                 # Log the operation
                 operation_log.append({"original": file_path, "new": new_path})
+        _report_progress(kwargs, len(file_paths), len(file_paths))
+    finally:
+        # Write the operation log to a JSON file, even if the operation was cancelled
+        if operation_log:
+            write_operation_log({"operations": operation_log, "folders": list(folders_to_create)})
 
-    # Write the operation log to a JSON file
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log, "folders": list(folders_to_create)}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
 
 
@@ -134,13 +155,12 @@ def sort_by_size(source_directory, **kwargs):
     operation_log = []  # Log file movements
     folders_to_create = set()  # Track folders to be created
 
-    # Traverse the directory to locate and categorize files
-    for root, _, files in os.walk(source_directory, topdown=True):
-        for file in files:
-            if file.startswith("."):  # Skip hidden files
-                continue
-
-            file_path = os.path.join(root, file)
+    # Locate and categorize files
+    file_paths = _list_files(source_directory)
+    try:
+        for done, file_path in enumerate(file_paths):
+            _report_progress(kwargs, done, len(file_paths))
+            file = os.path.basename(file_path)
             file_size = os.path.getsize(file_path)  # Get file size in bytes
 
             # Determine the target category based on size
@@ -168,12 +188,13 @@ def sort_by_size(source_directory, **kwargs):
 
                 # Log the operation for Undo functionality
                 operation_log.append({"original": file_path, "new": new_path})
+        _report_progress(kwargs, len(file_paths), len(file_paths))
+    finally:
+        # Write the operation log to a JSON file, even if the operation was cancelled
+        if operation_log:
+            write_operation_log({"operations": operation_log, "folders": list(folders_to_create)})
 
-    # Write the operation log to a JSON file
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log, "folders": list(folders_to_create)}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
 
 
@@ -192,12 +213,10 @@ def detect_duplicates(source_directory, **kwargs):
     operation_log = []  # Log of moved files
     duplicates_folder = os.path.join(source_directory, "duplicates")
 
-    for root, _, files in os.walk(source_directory, topdown=True):
-        for file in files:
-            if file.startswith("."):  # Skip hidden files
-                continue
-
-            file_path = os.path.join(root, file)
+    file_paths = _list_files(source_directory)
+    try:
+        for done, file_path in enumerate(file_paths):
+            _report_progress(kwargs, done, len(file_paths))
 
             # Compute the hash of the file
             file_hash = hash_file(file_path)
@@ -206,7 +225,7 @@ def detect_duplicates(source_directory, **kwargs):
                 # If duplicate is found, move it to the duplicates folder
                 if not os.path.exists(duplicates_folder):
                     os.makedirs(duplicates_folder)
-                new_path = os.path.join(duplicates_folder, file)
+                new_path = os.path.join(duplicates_folder, os.path.basename(file_path))
                 shutil.move(file_path, new_path)
 
                 # Log the operation for Undo functionality
@@ -214,12 +233,13 @@ def detect_duplicates(source_directory, **kwargs):
             else:
                 # Add the file to the hash dictionary
                 file_hashes[file_hash] = file_path
+        _report_progress(kwargs, len(file_paths), len(file_paths))
+    finally:
+        # Write the operation log to a JSON file, even if the operation was cancelled
+        if operation_log:
+            write_operation_log({"operations": operation_log, "folders": [duplicates_folder]})
 
-    # Write the operation log to a JSON file
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log, "folders": [duplicates_folder]}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
 
 
@@ -253,15 +273,12 @@ def rename_files(source_directory, **kwargs):
 
     operation_log = []  # List to store renaming operations
 
-    for root, dirs, files in os.walk(source_directory, topdown=True):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-
-        for file in files:
-            if file.startswith('.'):
-                continue  # Skip hidden files
-
-            file_path = os.path.join(root, file)
+    # Skip hidden directories and files
+    file_paths = _list_files(source_directory, skip_hidden_dirs=True)
+    try:
+        for done, file_path in enumerate(file_paths):
+            _report_progress(kwargs, done, len(file_paths))
+            root, file = os.path.split(file_path)
             file_name, file_ext = os.path.splitext(file)
             timestamp = datetime.now().strftime("%Y-%m-%d_%H.%M")
             new_name = f"{file_name}_{timestamp}{file_ext}"
@@ -271,12 +288,13 @@ def rename_files(source_directory, **kwargs):
 
             # Log the operation for Undo
             operation_log.append({"original": file_path, "new": new_path})
+        _report_progress(kwargs, len(file_paths), len(file_paths))
+    finally:
+        # Write the operation log to a JSON file, even if the operation was cancelled
+        if operation_log:
+            write_operation_log({"operations": operation_log})
 
-    # Write the operation log to a JSON file
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
 
 
@@ -304,10 +322,17 @@ def compress_files(source_directory, **kwargs):
                 stat_info = os.stat(file_path)
                 file_timestamps[file_path] = (stat_info.st_atime, stat_info.st_mtime)
 
-    with zipfile.ZipFile(archive_name, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
-        for file_path in file_timestamps.keys():
-            arcname = os.path.relpath(file_path, source_directory)  # Relative path for archive
-            zipf.write(file_path, arcname)
+    try:
+        with zipfile.ZipFile(archive_name, 'w', compression=zipfile.ZIP_DEFLATED, compresslevel=1) as zipf:
+            for done, file_path in enumerate(file_timestamps.keys()):
+                _report_progress(kwargs, done, len(file_timestamps))
+                arcname = os.path.relpath(file_path, source_directory)  # Relative path for archive
+                zipf.write(file_path, arcname)
+    except BaseException:
+        # Originals are only deleted once the archive is complete; drop the partial one
+        if os.path.exists(archive_name):
+            os.remove(archive_name)
+        raise
 
     # Delete original files after compression
     for file_path in file_timestamps.keys():
@@ -318,8 +343,8 @@ def compress_files(source_directory, **kwargs):
         "compressed_archive": archive_name,
         "file_timestamps": file_timestamps,  # Log timestamps for restoration
     }
-    with open(LOG_FILE, "w") as log_file:
-        json.dump(log_data, log_file)
+    write_operation_log(log_data)
+    _report_progress(kwargs, len(file_timestamps), len(file_timestamps))
 
 
 def backup_files(source_directory, **kwargs):
@@ -351,16 +376,17 @@ def backup_files(source_directory, **kwargs):
 
     operation_log = []  # Log individual file backups
 
-    # Traverse and copy files to the backup folder
+    # Gather the files to copy, skipping the backup folder itself
+    source_files = []
     for root, dirs, files in os.walk(source_directory):
-        # Skip the backup folder itself during traversal
         dirs[:] = [d for d in dirs if os.path.abspath(os.path.join(root, d)) != os.path.abspath(backup_folder)]
+        source_files.extend(os.path.join(root, file) for file in files if not file.startswith("."))  # Skip hidden
 
-        for file in files:
-            if file.startswith("."):  # Skip hidden files
-                continue
-
-            source_file = os.path.join(root, file)
+    # Copy files to the backup folder
+    try:
+        for done, source_file in enumerate(source_files):
+            _report_progress(kwargs, done, len(source_files))
+            root, file = os.path.split(source_file)
             relative_path = os.path.relpath(root, source_directory)
             target_dir = os.path.join(backup_folder, relative_path)
             os.makedirs(target_dir, exist_ok=True)
@@ -370,10 +396,11 @@ def backup_files(source_directory, **kwargs):
 
             # Log the backup operation
             operation_log.append({"original": source_file, "new": target_file})
+        _report_progress(kwargs, len(source_files), len(source_files))
+    finally:
+        # Save the operation log, even if the backup was cancelled, so Undo removes the partial folder
+        if operation_log:
+            write_operation_log({"operations": operation_log, "created_folder": backup_folder})
 
-    # Save the operation log
-    if operation_log:
-        with open(LOG_FILE, "w") as log_file:
-            json.dump({"operations": operation_log, "created_folder": backup_folder}, log_file)
-    else:
+    if not operation_log:
         raise ValueError("Nothing to undo")
@@ -0,0 +1,200 @@
+import logging
+import os
+import time
+
+import pandas as pd
+
+from src.automation.data_entry import read_csv_or_excel, read_header, resolve_usecols
+from src.automation.email_sender import (
+    TEMPLATE_FIELD,
+    cached_address_problem,
+    chunk_recipients,
+    send_batches,
+    send_messages,
+)
+
+logger = logging.getLogger(__name__)
+
+# Rows rendered and sent at a time, so memory stays flat however long the spreadsheet is
+MERGE_CHUNK_ROWS = 5000
+
+# Failed recipients written to the log of a merge
+MAX_LOGGED_FAILURES = 20
+
+
+def resolve_field(field, columns):
+    """
+    Returns the column a template field refers to, by exact, case-insensitive or unified name
+    (e.g. {first_name} matches a 'First Name' column). Raises ValueError if there's none.
+    """
+    if field in columns:
+        return field
+    matches = [column for column in columns if str(column).strip().lower() == field.lower()]
+    matches = matches or resolve_usecols(columns, [field])
+    if not matches:
+        raise ValueError(f"No column for '{{{field}}}'. Available columns: {', '.join(map(str, columns))}.")
+    return matches[0]
+
+
+class MergeTemplate:
+    """
+    A subject or body template compiled once for a spreadsheet: split into literal text and
+    {field} placeholders, each bound to a column. Rendering concatenates whole columns at once
+    instead of formatting the template row by row.
+    """
+
+    def __init__(self, template: str, columns):
+        parts = TEMPLATE_FIELD.split(template or "")
+        self.literals = parts[0::2]
+        self.columns = [resolve_field(field, columns) for field in parts[1::2]]
+
+    def render(self, frame: pd.DataFrame) -> pd.Series:
+        """Renders the template for every row of `frame`, whose columns must be text."""
+        rendered = pd.Series(self.literals[0], index=frame.index)
+        for column, literal in zip(self.columns, self.literals[1:]):
+            rendered = rendered + frame[column] + literal
+        return rendered
+
+
+def recipient_status(emails: pd.Series) -> pd.Series:
+    """
+    Checks a column of stripped addresses: "" for addresses to send to, "invalid: <reason>"
+    for malformed ones and "duplicate" for repeats of an earlier address (ignoring case).
+    """
+    problems = emails.map(cached_address_problem)
+    valid = problems.isna()
+    duplicate = valid & emails.str.lower().where(valid).duplicated()
+
+    status = pd.Series("", index=emails.index)
+    status[~valid] = "invalid: " + problems[~valid]
+    status[duplicate] = "duplicate"
+    return status
+
+
+def mail_merge(
+    data_file: str,
+    from_address: str,
+    subject: str,
+    body_text: str,
+    email_column: str = None,
+    cc_addresses: list = None,
+    attachments: list = None,
+    dry_run_path: str = None,
+    max_concurrency: int = None,
+    rate_limit: float = None,
+    transport=None,
+):
+    """
+    Sends a personalized email to every row of a spreadsheet (CSV, Excel, Parquet or Feather).
+    {field} placeholders in the subject and body are filled from the row's columns; addresses come
+    from `email_column`, by default the column recognized as email. Malformed and repeated addresses
+    are skipped. Rows are rendered and sent in chunks through the transport, in batch requests where
+    it supports them (see send_bulk_emails).
+
+    With `dry_run_path`, nothing is sent: every row is written to that CSV file instead,
+    with its address, rendered subject and body, and whether it would be sent.
+
+    Returns {"rows": ..., "sent": ..., "failed": ..., "skipped": ...}.
+    Raises if there were recipients but none could be sent to.
+    """
+    header = read_header(data_file)
+    subject_template = MergeTemplate(subject, header)
+    body_template = MergeTemplate(body_text, header)
+    email_column = resolve_field(email_column or "email", header)
+
+    # Only the columns the email uses are read, all as text
+    columns = list(dict.fromkeys([email_column, *subject_template.columns, *body_template.columns]))
+    frame = read_csv_or_excel(data_file, usecols=columns, dtype={column: str for column in columns})
+    frame = frame[columns].fillna("").astype(str)
+
+    emails = frame[email_column].str.strip()
+    status = recipient_status(emails)
+
+    if dry_run_path is None:
+        # Imported here, so a dry run works without a configured transport
+        from src.automation.email_transport import get_transport
+
+        transport = transport or get_transport()
+        transport.check()
+
+    summary = {"rows": len(frame), "sent": 0, "failed": int(status.str.startswith("invalid").sum())}
+    summary["skipped"] = int((status == "duplicate").sum())
+    failures = []
+    started = time.monotonic()
+
+    for start in range(0, len(frame), MERGE_CHUNK_ROWS):
+        chunk = frame.iloc[start : start + MERGE_CHUNK_ROWS]
+        rendered = pd.DataFrame(
+            {
+                "to": emails.iloc[start : start + MERGE_CHUNK_ROWS],
+                "subject": subject_template.render(chunk),
+                "body": body_template.render(chunk),
+                "status": status.iloc[start : start + MERGE_CHUNK_ROWS],
+            }
+        )
+
+        if dry_run_path is not None:
+            rendered["status"] = rendered["status"].where(rendered["status"] != "", "send")
+            rendered.to_csv(dry_run_path, mode="w" if start == 0 else "a", header=start == 0, index=False)
+            continue
+
+        to_send = rendered[rendered["status"] == ""]
+        if to_send.empty:
+            continue
+        if transport.batch_size > 1:
+            recipients = [
+                {"email": to, "subject": subject, "body": body}
+                for to, subject, body in zip(to_send["to"], to_send["subject"], to_send["body"])
+            ]
+            results = send_batches(
+                chunk_recipients(recipients, transport.batch_size),
+                from_address,
+                "{subject}",
+                "{body}",
+                cc_addresses,
+                attachments,
+                max_concurrency=max_concurrency,
+                rate_limit=rate_limit,
+                transport=transport,
+            )
+        else:
+            messages = [
+                {
+                    "from_address": from_address,
+                    "to_addresses": [to],
+                    "subject": subject,
+                    "body_text": body,
+                    "cc_addresses": cc_addresses,
+                    "attachments": attachments,
+                }
+                for to, subject, body in zip(to_send["to"], to_send["subject"], to_send["body"])
+            ]
+            results = send_messages(
+                messages, max_concurrency=max_concurrency, rate_limit=rate_limit, transport=transport
+            )
+
+        for result in results:
+            if result["status"] == "sent":
+                summary["sent"] += 1
+            else:
+                summary["failed"] += 1
+                failures.append(result)
+
+    if dry_run_path is not None:
+        if frame.empty:
+            pd.DataFrame(columns=["to", "subject", "body", "status"]).to_csv(dry_run_path, index=False)
+        logger.info(
+            f"Mail merge dry run of {os.path.basename(data_file)}: {len(frame)} row(s) written to {dry_run_path}."
+        )
+        return summary
+
+    for failure in failures[:MAX_LOGGED_FAILURES]:
+        logger.warning(f"Mail merge to {', '.join(failure['to'])} failed: {failure['error']}")
+    logger.info(
+        f"Mail merge of {os.path.basename(data_file)} finished in {time.monotonic() - started:.1f}s: "
+        f"{summary['sent']} sent, {summary['failed']} failed, {summary['skipped']} skipped."
+    )
+    if summary["failed"] and not summary["sent"]:
+        error = failures[0]["error"] if failures else "no valid addresses"
+        raise Exception(f"No emails could be sent: {error}")
+    return summary
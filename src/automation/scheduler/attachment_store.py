@@ -0,0 +1,224 @@
+import hashlib
+import logging
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Index of references and file hashes, kept inside the store's folder
+INDEX_FILENAME = "index.db"
+
+# Bytes hashed at a time
+HASH_CHUNK_SIZE = 1024 * 1024
+
+# Names of stored content folders (sha256 hex digests)
+DIGEST_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS refs (
+    digest TEXT NOT NULL,
+    job_id TEXT NOT NULL,
+    PRIMARY KEY (digest, job_id)
+);
+CREATE INDEX IF NOT EXISTS refs_job_id ON refs (job_id);
+CREATE TABLE IF NOT EXISTS sources (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    digest TEXT NOT NULL
+);
+"""
+
+
+def hash_file(path):
+    """Returns the sha256 hex digest of a file's content."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class AttachmentStore:
+    """
+    Content-addressed store of scheduled email attachments.
+
+    Each distinct file content is stored once, as `<root>/<digest>/<filename>`, however many
+    jobs attach it; the same content under another name is hard-linked next to it. Every job
+    holds a reference to the content it attaches, and content no job references any more is
+    deleted by collect_garbage. File hashes are cached by path, size and modification time,
+    so attaching an unchanged file again doesn't read it.
+
+    The index is a SQLite database, so the UI and daemon processes can share the store.
+    """
+
+    def __init__(self, root: str = "scheduled_attachments"):
+        self.root = os.path.abspath(root)
+        os.makedirs(self.root, exist_ok=True)
+        self._lock = threading.Lock()
+        # Autocommit mode; reference changes and garbage collection take explicit write locks
+        self._connection = sqlite3.connect(
+            os.path.join(self.root, INDEX_FILENAME), check_same_thread=False, timeout=10, isolation_level=None
+        )
+        with self._lock:
+            self._connection.executescript(SCHEMA)
+
+    def contains(self, path):
+        """True if `path` is a file inside the store."""
+        return self._stored_digest(os.path.abspath(path)) is not None
+
+    def _stored_digest(self, path):
+        """Returns the digest of a path inside the store, or None for any other path."""
+        parent = os.path.dirname(path)
+        if os.path.dirname(parent) != self.root:
+            return None
+        name = os.path.basename(parent)
+        return name if DIGEST_PATTERN.match(name) else None
+
+    def digest(self, path):
+        """
+        Returns the content digest of a file, from the cache when the file hasn't changed since it was hashed.
+        """
+        path = os.path.abspath(path)
+        stored_digest = self._stored_digest(path)
+        if stored_digest is not None:
+            return stored_digest
+
+        stat = os.stat(path)
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT digest FROM sources WHERE path = ? AND size = ? AND mtime_ns = ?",
+                (path, stat.st_size, stat.st_mtime_ns),
+            ).fetchone()
+        if row:
+            return row[0]
+
+        digest = hash_file(path)
+        with self._lock:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO sources (path, size, mtime_ns, digest) VALUES (?, ?, ?, ?)",
+                (path, stat.st_size, stat.st_mtime_ns, digest),
+            )
+        return digest
+
+    def store(self, job_id, paths):
+        """
+        Makes `paths` the attachments of a job: stores any content not in the store yet,
+        moves the job's references to it and collects content the job no longer uses.
+        Missing files are skipped. Returns the stored paths, in order.
+        """
+        entries = []
+        for path in paths or []:
+            if not os.path.isfile(path):
+                logger.warning(f"Attachment {path} does not exist or is not accessible.")
+                continue
+            entries.append((path, self.digest(path)))
+
+        # References are in place before any file is written, so a concurrent collection keeps them
+        digests = {digest for _, digest in entries}
+        with self._lock:
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                previous = {
+                    row[0] for row in self._connection.execute("SELECT digest FROM refs WHERE job_id = ?", (job_id,))
+                }
+                self._connection.executemany(
+                    "DELETE FROM refs WHERE digest = ? AND job_id = ?", [(d, job_id) for d in previous - digests]
+                )
+                self._connection.executemany(
+                    "INSERT OR IGNORE INTO refs (digest, job_id) VALUES (?, ?)", [(d, job_id) for d in digests]
+                )
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+
+        stored_paths = []
+        for path, digest in entries:
+            try:
+                stored_paths.append(self._materialize(path, digest))
+            except OSError as e:
+                logger.error(f"Failed to store attachment '{path}': {e}")
+
+        if previous - digests:
+            self.collect_garbage()
+        return stored_paths
+
+    def _materialize(self, path, digest):
+        """Returns the stored copy of a file's content under its own name, creating it if needed."""
+        content_dir = os.path.join(self.root, digest)
+        stored_path = os.path.join(content_dir, os.path.basename(path))
+        if os.path.isfile(stored_path):
+            return stored_path
+
+        os.makedirs(content_dir, exist_ok=True)
+        existing = [os.path.join(content_dir, name) for name in os.listdir(content_dir) if not name.startswith(".tmp-")]
+        if existing:
+            # Same content saved under another name
+            try:
+                os.link(existing[0], stored_path)
+                return stored_path
+            except OSError:
+                pass
+            path = existing[0]
+
+        # Copy under a temporary name first, so a half-written file is never picked up
+        temp_path = os.path.join(content_dir, f".tmp-{uuid.uuid4().hex}")
+        try:
+            shutil.copyfile(path, temp_path)
+            os.replace(temp_path, stored_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        logger.info(f"Stored attachment '{path}' as '{stored_path}'.")
+        return stored_path
+
+    def release(self, job_id):
+        """
+        Drops a job's references, e.g. once the job is removed or has run for the last time,
+        and deletes content no other job uses.
+        """
+        with self._lock:
+            cursor = self._connection.execute("DELETE FROM refs WHERE job_id = ?", (job_id,))
+        if cursor.rowcount:
+            self.collect_garbage()
+
+    def references(self, digest):
+        """Returns the ids of the jobs referencing some content."""
+        with self._lock:
+            rows = self._connection.execute("SELECT job_id FROM refs WHERE digest = ?", (digest,)).fetchall()
+        return {row[0] for row in rows}
+
+    def collect_garbage(self):
+        """
+        Deletes stored content that no job references. Returns the number of bytes freed.
+        """
+        freed = 0
+        with self._lock:
+            # Holding the write lock keeps other processes from adding references mid-collection
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                referenced = {row[0] for row in self._connection.execute("SELECT DISTINCT digest FROM refs")}
+                for name in os.listdir(self.root):
+                    content_dir = os.path.join(self.root, name)
+                    if name in referenced or not DIGEST_PATTERN.match(name) or not os.path.isdir(content_dir):
+                        continue
+                    freed += sum(entry.stat().st_size for entry in os.scandir(content_dir) if entry.is_file())
+                    shutil.rmtree(content_dir, ignore_errors=True)
+                    logger.info(f"Removed unreferenced attachment content {name}.")
+
+                # Cached hashes are only useful for content that's still stored
+                self._connection.execute("DELETE FROM sources WHERE digest NOT IN (SELECT digest FROM refs)")
+                self._connection.execute("COMMIT")
+            except Exception:
+                self._connection.execute("ROLLBACK")
+                raise
+        return freed
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,198 @@
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Seconds a worker or leader lease stays valid without a heartbeat
+LEASE_SECONDS = 30
+
+# Seconds between heartbeats; well inside the lease so one slow beat doesn't lose it
+HEARTBEAT_INTERVAL = 10
+
+# Extra wait per running job before a busy worker tries to claim a run,
+# so less loaded workers get there first
+CLAIM_BACKOFF_SECONDS = 0.25
+
+# Claims older than this are purged by the leader
+CLAIM_RETENTION_SECONDS = 30 * 24 * 3600
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS claims (
+    run_key TEXT PRIMARY KEY,
+    job_id TEXT NOT NULL,
+    worker_id TEXT NOT NULL,
+    claimed_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS workers (
+    worker_id TEXT PRIMARY KEY,
+    host TEXT,
+    pid INTEGER,
+    active_jobs INTEGER NOT NULL DEFAULT 0,
+    last_seen REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS leases (
+    name TEXT PRIMARY KEY,
+    holder TEXT NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS slots (
+    resource TEXT NOT NULL,
+    holder TEXT NOT NULL,
+    worker_id TEXT NOT NULL,
+    expires_at REAL NOT NULL,
+    PRIMARY KEY (resource, holder)
+);
+"""
+
+
+class WorkerCoordinator:
+    """
+    Coordinates several daemon workers that share a jobs file, through a SQLite database
+    next to it. Every worker schedules every job; when a job fires, each worker tries to
+    claim that run and only the one whose claim lands executes it, so each run happens
+    exactly once. Busy workers wait a little before claiming, which hands runs to the
+    least loaded worker. One worker at a time holds the leader lease and does housekeeping.
+    Counted slots (acquire_slots) cap how many jobs use a resource, such as a disk,
+    across all workers; they're renewed by heartbeats and expire with a dead worker's lease.
+
+    Workers on different hosts need a filesystem with working SQLite locking
+    (a local disk or SMB share; NFS locking is often unreliable).
+    """
+
+    def __init__(self, path: str, worker_id: str = None, lease_seconds: int = LEASE_SECONDS):
+        self.path = path
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}-{uuid.uuid4().hex[:6]}"
+        self.lease_seconds = lease_seconds
+        self._lock = threading.Lock()
+        # Autocommit mode, so each write below takes its own short lock on the database
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=10, isolation_level=None)
+        with self._lock:
+            self._connection.executescript(SCHEMA)
+
+    def heartbeat(self, active_jobs: int = 0):
+        """
+        Registers this worker as alive along with how many jobs it's running.
+        """
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO workers (worker_id, host, pid, active_jobs, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (worker_id) DO UPDATE SET active_jobs = excluded.active_jobs, "
+                "last_seen = excluded.last_seen",
+                (self.worker_id, socket.gethostname(), os.getpid(), active_jobs, time.time()),
+            )
+            self._connection.execute(
+                "UPDATE slots SET expires_at = ? WHERE worker_id = ?",
+                (time.time() + self.lease_seconds, self.worker_id),
+            )
+
+    def live_workers(self):
+        """
+        Returns {worker_id: active_jobs} for workers that sent a heartbeat within the lease.
+        """
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT worker_id, active_jobs FROM workers WHERE last_seen >= ?",
+                (time.time() - self.lease_seconds,),
+            ).fetchall()
+        return dict(rows)
+
+    def claim_delay(self, active_jobs: int):
+        """
+        Returns how long this worker should wait before claiming a run,
+        given the load reported by the other live workers.
+        """
+        others = [jobs for worker_id, jobs in self.live_workers().items() if worker_id != self.worker_id]
+        if not others:
+            return 0.0
+        return max(0, active_jobs - min(others)) * CLAIM_BACKOFF_SECONDS
+
+    def claim_run(self, run_key: str, job_id: str):
+        """
+        Claims a job run for this worker. Returns True if no other worker claimed it first.
+        """
+        with self._lock:
+            cursor = self._connection.execute(
+                "INSERT OR IGNORE INTO claims (run_key, job_id, worker_id, claimed_at) VALUES (?, ?, ?, ?)",
+                (run_key, job_id, self.worker_id, time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def claimed_by(self, run_key: str):
+        """Returns the worker that claimed a run, or None."""
+        with self._lock:
+            row = self._connection.execute("SELECT worker_id FROM claims WHERE run_key = ?", (run_key,)).fetchone()
+        return row[0] if row else None
+
+    def acquire_leadership(self, name: str = "leader"):
+        """
+        Takes or renews the named lease. Returns True if this worker holds it.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute(
+                "INSERT INTO leases (name, holder, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+                "WHERE leases.holder = excluded.holder OR leases.expires_at < ?",
+                (name, self.worker_id, now + self.lease_seconds, now),
+            )
+            row = self._connection.execute("SELECT holder FROM leases WHERE name = ?", (name,)).fetchone()
+        return row is not None and row[0] == self.worker_id
+
+    def acquire_slots(self, holder: str, resources, limit: int):
+        """
+        Takes one of `limit` slots on each resource for `holder`, all or none.
+        Returns True if every resource had a free slot.
+        """
+        now = time.time()
+        with self._lock:
+            # An immediate transaction keeps other workers from taking slots between the count and the insert
+            self._connection.execute("BEGIN IMMEDIATE")
+            try:
+                for resource in resources:
+                    (used,) = self._connection.execute(
+                        "SELECT COUNT(*) FROM slots WHERE resource = ? AND holder != ? AND expires_at >= ?",
+                        (resource, holder, now),
+                    ).fetchone()
+                    if used >= limit:
+                        self._connection.execute("ROLLBACK")
+                        return False
+                self._connection.executemany(
+                    "INSERT OR REPLACE INTO slots (resource, holder, worker_id, expires_at) VALUES (?, ?, ?, ?)",
+                    [(resource, holder, self.worker_id, now + self.lease_seconds) for resource in resources],
+                )
+                self._connection.execute("COMMIT")
+            except BaseException:
+                self._connection.execute("ROLLBACK")
+                raise
+        return True
+
+    def release_slots(self, holder: str):
+        """Gives back the slots taken for `holder`."""
+        with self._lock:
+            self._connection.execute("DELETE FROM slots WHERE holder = ?", (holder,))
+
+    def release(self, name: str = "leader"):
+        """Gives up the named lease and unregisters the worker, e.g. on shutdown."""
+        with self._lock:
+            self._connection.execute("DELETE FROM leases WHERE name = ? AND holder = ?", (name, self.worker_id))
+            self._connection.execute("DELETE FROM workers WHERE worker_id = ?", (self.worker_id,))
+            self._connection.execute("DELETE FROM slots WHERE worker_id = ?", (self.worker_id,))
+
+    def housekeeping(self):
+        """
+        Removes old claims, expired slots and workers that stopped sending heartbeats. Run by the leader.
+        """
+        now = time.time()
+        with self._lock:
+            self._connection.execute("DELETE FROM claims WHERE claimed_at < ?", (now - CLAIM_RETENTION_SECONDS,))
+            self._connection.execute("DELETE FROM workers WHERE last_seen < ?", (now - 10 * self.lease_seconds,))
+            self._connection.execute("DELETE FROM slots WHERE expires_at < ?", (now,))
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -1,33 +1,66 @@
+import importlib
 import logging
+import os
+import threading
 
 from watchdog.events import FileSystemEventHandler
 
-from src.automation.data_entry import merge_data, mirror_data
-from src.automation.email_sender import send_email_via_mailgun
-from src.automation.file_organizer import (
-    backup_files,
-    compress_files,
-    detect_duplicates,
-    rename_files,
-    sort_by_date,
-    sort_by_size,
-    sort_by_type,
-)
-
 logger = logging.getLogger(__name__)
 
-# Maps task identifiers to their respective functions
+# Maps task identifiers to the dotted path of their functions. Modules are imported
+# on first execution (see resolve_task), so the daemon doesn't load pandas or
+# requests until a data or email job actually runs.
 TASK_FUNCTIONS = {
-    "sort_by_type": sort_by_type,
-    "sort_by_date": sort_by_date,
-    "sort_by_size": sort_by_size,
-    "detect_duplicates": detect_duplicates,
-    "rename_files": rename_files,
-    "compress_files": compress_files,
-    "backup_files": backup_files,
-    "send_email": send_email_via_mailgun,
-    "merge_data": merge_data,
-    "mirror_data": mirror_data,
+    "sort_by_type": "src.automation.file_organizer.sort_by_type",
+    "sort_by_date": "src.automation.file_organizer.sort_by_date",
+    "sort_by_size": "src.automation.file_organizer.sort_by_size",
+    "detect_duplicates": "src.automation.file_organizer.detect_duplicates",
+    "rename_files": "src.automation.file_organizer.rename_files",
+    "compress_files": "src.automation.file_organizer.compress_files",
+    "backup_files": "src.automation.file_organizer.backup_files",
+    "send_email": "src.automation.email_outbox.queue_email",
+    "send_bulk_email": "src.automation.email_sender.send_bulk_emails",
+    "mail_merge": "src.automation.mail_merge.mail_merge",
+    "merge_data": "src.automation.data_entry.merge_data",
+    "mirror_data": "src.automation.data_entry.mirror_data",
+}
+
+
+def import_callable(dotted_path):
+    """
+    Imports and returns the function at `dotted_path`, e.g. 'package.module.function'.
+    """
+    module_path, _, name = dotted_path.rpartition(".")
+    return getattr(importlib.import_module(module_path), name)
+
+
+def resolve_task(task_type):
+    """
+    Returns the function for a task type, importing its module on first use.
+    Raises KeyError for unknown task types.
+    """
+    target = TASK_FUNCTIONS[task_type]
+    if isinstance(target, str):
+        target = import_callable(target)
+        TASK_FUNCTIONS[task_type] = target
+    return target
+
+
+# Executor class of each task: "cpu" tasks run in the process pool so they scale
+# across cores, "io" and "network" tasks run in separate thread pools
+TASK_EXECUTORS = {
+    "sort_by_type": "io",
+    "sort_by_date": "io",
+    "sort_by_size": "io",
+    "detect_duplicates": "cpu",
+    "rename_files": "io",
+    "compress_files": "cpu",
+    "backup_files": "io",
+    "send_email": "network",
+    "send_bulk_email": "network",
+    "mail_merge": "network",
+    "merge_data": "cpu",
+    "mirror_data": "cpu",
 }
 
 # User-friendly task labels
@@ -40,6 +73,8 @@ TASK_LABELS = {
     "compress_files": "Compress Files",
     "backup_files": "Backup Files",
     "send_email": "Send Email",
+    "send_bulk_email": "Send Bulk Email",
+    "mail_merge": "Mail Merge",
     "merge_data": "Merge Data",
     "mirror_data": "Mirror Data",
 }
@@ -47,15 +82,60 @@ TASK_LABELS = {
 
 class JSONFileChangeHandler(FileSystemEventHandler):
     """
-    Watchdog handler that reloads scheduled
-    jobs whenever the JSON file is modified.
+    Watchdog handler that reloads scheduled jobs whenever the JSON file changes.
+    Bursts of events are coalesced into a single reload once the file has been
+    quiet for `debounce_seconds`, and changes written by the manager's own job
+    store (e.g. cleanup of executed one-time jobs) don't trigger a reload.
     """
 
-    def __init__(self, manager):
+    def __init__(self, manager, debounce_seconds: float = 0.5):
         super().__init__()
         self.manager = manager
+        self.debounce_seconds = debounce_seconds
+        self._timer = None
+        self._lock = threading.Lock()
+
+    def _is_jobs_file(self, path):
+        # Changes to large job lists are appended to the journal next to the file
+        name = os.path.basename(path)
+        return name in (os.path.basename(self.manager.jobs_file), os.path.basename(self.manager.job_store.journal_path))
 
     def on_modified(self, event):
-        if event.src_path.endswith("scheduled_jobs.json"):
-            logger.info("Detected changes in scheduled_jobs.json; reloading jobs.")
-            self.manager.load_jobs_from_file()
+        if self._is_jobs_file(event.src_path):
+            self._schedule_reload()
+
+    def on_created(self, event):
+        if self._is_jobs_file(event.src_path):
+            self._schedule_reload()
+
+    def on_moved(self, event):
+        # Atomic writers replace the file via rename
+        if self._is_jobs_file(event.dest_path):
+            self._schedule_reload()
+
+    def _schedule_reload(self):
+        """Restarts the debounce timer, so only the last event of a burst reloads."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(self.debounce_seconds, self._reload)
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _reload(self):
+        with self._lock:
+            self._timer = None
+
+        if self.manager.job_store.is_own_write():
+            logger.debug("Ignoring change to scheduled_jobs.json written by this process.")
+            return
+
+        logger.info("Detected changes in scheduled_jobs.json; reloading jobs.")
+        self.manager.load_jobs_from_file()
+
+    def stop(self):
+        """Cancels any pending reload."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
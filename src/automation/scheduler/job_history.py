@@ -0,0 +1,231 @@
+import logging
+import math
+import os
+import sqlite3
+import sys
+import threading
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+logger = logging.getLogger(__name__)
+
+# Runs kept in the history; older ones are dropped as new runs are recorded
+MAX_HISTORY_ROWS = 50000
+
+# Metrics that can be summarized with JobHistory.percentiles
+METRICS = ("queue_delay", "duration", "files", "bytes", "peak_rss")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id TEXT NOT NULL,
+    task_type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    scheduled_at REAL,
+    started_at REAL,
+    finished_at REAL,
+    queue_delay REAL,
+    duration REAL,
+    files INTEGER,
+    bytes INTEGER,
+    peak_rss INTEGER
+);
+CREATE INDEX IF NOT EXISTS runs_task_type ON runs (task_type, id);
+CREATE INDEX IF NOT EXISTS runs_job_id ON runs (job_id, id);
+"""
+
+
+def peak_rss():
+    """
+    Returns the peak resident set size of the current process in bytes,
+    or None where the platform doesn't report it.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def measure_inputs(paths):
+    """
+    Counts the files and bytes a job works on.
+    Folders count the files directly inside them, as the file tasks do.
+    """
+    files = 0
+    total_bytes = 0
+    for path in paths:
+        if not path:
+            continue
+        try:
+            if os.path.isdir(path):
+                with os.scandir(path) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            files += 1
+                            total_bytes += entry.stat().st_size
+            elif os.path.isfile(path):
+                files += 1
+                total_bytes += os.path.getsize(path)
+        except OSError as e:
+            logger.debug(f"Could not measure {path}: {e}")
+    return files, total_bytes
+
+
+def percentile(sorted_values, percent):
+    """
+    Returns the `percent` percentile of an ascending list, interpolating between
+    the closest ranks. Returns None for an empty list.
+    """
+    if not sorted_values:
+        return None
+    rank = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(rank)
+    upper = math.ceil(rank)
+    if lower == upper:
+        return sorted_values[lower]
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (rank - lower)
+
+
+class JobHistory:
+    """
+    SQLite store of job executions, one row per run, used to track how long
+    each task type takes and how much it processes. The database can be read
+    by the UI process while the daemon records runs.
+    """
+
+    def __init__(self, path: str = "job_history.db", max_rows: int = MAX_HISTORY_ROWS):
+        self.path = path
+        self.max_rows = max_rows
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        with self._lock, self._connection:
+            self._connection.executescript(SCHEMA)
+
+    def record(
+        self,
+        job_id,
+        task_type,
+        status,
+        scheduled_at=None,
+        started_at=None,
+        finished_at=None,
+        files=None,
+        bytes_processed=None,
+        peak_rss=None,
+    ):
+        """
+        Stores one run. Times are Unix timestamps; the queue delay and duration are derived from them.
+        """
+        queue_delay = started_at - scheduled_at if started_at is not None and scheduled_at is not None else None
+        duration = finished_at - started_at if finished_at is not None and started_at is not None else None
+
+        try:
+            with self._lock, self._connection:
+                self._connection.execute(
+                    "INSERT INTO runs (job_id, task_type, status, scheduled_at, started_at, finished_at, "
+                    "queue_delay, duration, files, bytes, peak_rss) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        job_id,
+                        task_type,
+                        status,
+                        scheduled_at,
+                        started_at,
+                        finished_at,
+                        queue_delay,
+                        duration,
+                        files,
+                        bytes_processed,
+                        peak_rss,
+                    ),
+                )
+                # Keep the history rolling
+                self._connection.execute(
+                    "DELETE FROM runs WHERE id <= (SELECT MAX(id) FROM runs) - ?", (self.max_rows,)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Failed to record run of job {job_id}: {e}")
+
+    def runs(self, task_type=None, job_id=None, since=None, limit=100):
+        """
+        Returns the most recent runs as dicts, newest first.
+        """
+        clauses, params = [], []
+        if task_type is not None:
+            clauses.append("task_type = ?")
+            params.append(task_type)
+        if job_id is not None:
+            clauses.append("job_id = ?")
+            params.append(job_id)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        with self._lock:
+            cursor = self._connection.execute(f"SELECT * FROM runs {where} ORDER BY id DESC LIMIT ?", (*params, limit))
+            columns = [description[0] for description in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def percentiles(self, task_type=None, metric="duration", percents=(50, 90, 99), since=None):
+        """
+        Summarizes a metric of successful runs per task type.
+        Returns {task_type: {"count": n, "last": value, "p50": value, ...}}.
+        """
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric '{metric}'. Expected one of {', '.join(METRICS)}.")
+
+        clauses, params = ["status = 'success'", f"{metric} IS NOT NULL"], []
+        if task_type is not None:
+            clauses.append("task_type = ?")
+            params.append(task_type)
+        if since is not None:
+            clauses.append("started_at >= ?")
+            params.append(since)
+
+        with self._lock:
+            rows = self._connection.execute(
+                f"SELECT task_type, {metric} FROM runs WHERE {' AND '.join(clauses)} ORDER BY id", params
+            ).fetchall()
+
+        values = {}
+        for row_task_type, value in rows:
+            values.setdefault(row_task_type, []).append(value)
+
+        summary = {}
+        for row_task_type, task_values in values.items():
+            stats = {"count": len(task_values), "last": task_values[-1]}
+            ordered = sorted(task_values)
+            for percent in percents:
+                stats[f"p{percent:g}"] = percentile(ordered, percent)
+            summary[row_task_type] = stats
+        return summary
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+class RunTimer:
+    """
+    Collects the measurements of a single run while it executes.
+    """
+
+    def __init__(self):
+        self.started_at = None
+        self.finished_at = None
+        self.files = None
+        self.bytes_processed = None
+        self.peak_rss = None
+
+    def start(self, paths=()):
+        self.files, self.bytes_processed = measure_inputs(paths)
+        self.started_at = time.time()
+
+    def finish(self, worker_peak_rss=None):
+        self.finished_at = time.time()
+        self.peak_rss = worker_peak_rss if worker_peak_rss is not None else peak_rss()
@@ -0,0 +1,360 @@
+from contextlib import contextmanager
+import copy
+import hashlib
+import json
+import logging
+import os
+import textwrap
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Below this size the jobs file is rewritten on every change; above it changes go to the journal
+JOURNAL_THRESHOLD_BYTES = 64 * 1024
+
+
+class JobStore:
+    """
+    Indexed store for scheduled job records, persisted to the JSON jobs file.
+
+    Jobs are kept in memory by job_id, so lookups never touch the disk beyond a
+    stat that detects changes made by another process (e.g. the daemon removing an
+    executed one-time job). The file keeps the same indented JSON list format as before.
+
+    While the file is under JOURNAL_THRESHOLD_BYTES, each change atomically replaces it.
+    Past that, a put or remove appends one line to a journal next to it
+    (`<jobs file>.journal`) instead, so a write costs O(1) however many jobs there are,
+    and other stores replay only the lines they haven't seen. Once the journal outgrows
+    the file it's folded into it, which keeps writes amortized O(1); until then the file
+    lags the journal, so large stores should be read through a JobStore. The journal's
+    first line holds the hash of the file it applies to, so a file replaced by anything
+    else, e.g. edited by hand, makes an existing journal obsolete.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        self._lock = threading.RLock()
+        self._jobs = {}  # job_id -> job record, in file order
+        self._encoded = {}  # job_id -> cached JSON fragment for the record
+        self._signature = (None, None)  # (file, journal) signatures as last read or written
+        self._written_signature = None  # Signatures after this store's last write; reads don't change it
+        self._file_hash = None  # SHA-256 of the file content, which a valid journal names
+        self._file_size = 0
+        self._journal_valid = False  # Whether the journal on disk applies to the file as loaded
+        self._journal_offset = 0  # Bytes of the journal already applied
+        self._batch_depth = 0
+        self._dirty = False
+        self.version = 0  # Incremented whenever the records change, so callers can cache views of them
+        self.reload()
+
+    @staticmethod
+    def _file_signature(path):
+        """Returns (inode, size, mtime_ns) of a file, or None if it doesn't exist."""
+        try:
+            stat_info = os.stat(path)
+        except OSError:
+            return None
+        return (stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns)
+
+    def _current_signature(self):
+        return (self._file_signature(self.path), self._file_signature(self.journal_path))
+
+    def reload(self):
+        """
+        Rebuilds the index from the JSON file and its journal.
+        Returns False if the file exists but can't be parsed, keeping the previous index.
+        """
+        with self._lock:
+            signature = self._current_signature()
+            if signature[0] is None:
+                content = None
+                job_list = []
+            else:
+                try:
+                    with open(self.path, "rb") as f:
+                        content = f.read()
+                    job_list = json.loads(content)
+                except Exception as e:
+                    logger.error(f"Error reading {self.path}: {e}")
+                    return False
+
+            jobs = {}
+            for job in job_list:
+                if "job_id" in job:
+                    # Keep the last record of a duplicated job_id, as scheduling them in order would
+                    jobs.pop(job["job_id"], None)
+                    jobs[job["job_id"]] = job
+
+            self._jobs = jobs
+            self._encoded = {}
+            self._file_hash = hashlib.sha256(content).hexdigest() if content is not None else None
+            self._file_size = len(content) if content is not None else 0
+            self._journal_valid = False
+            self._journal_offset = 0
+            self._replay_journal()
+            self._signature = signature
+            self.version += 1
+            return True
+
+    def _replay_journal(self):
+        """
+        Applies the journal lines appended since the last replay, if the journal applies to the file.
+        A line still being written is left for a later replay.
+        """
+        try:
+            with open(self.journal_path, "rb") as f:
+                f.seek(self._journal_offset)
+                data = f.read()
+        except OSError:
+            return
+
+        end = data.rfind(b"\n") + 1
+        lines = data[:end].splitlines()
+        if self._journal_offset == 0:
+            if not lines:
+                return
+            try:
+                base = json.loads(lines.pop(0)).get("base")
+            except (ValueError, AttributeError):
+                base = None
+            if base != self._file_hash:
+                return  # Written for an earlier version of the file
+            self._journal_valid = True
+
+        for line in lines:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                logger.error(f"Skipping unreadable line in {self.journal_path}.")
+                continue
+            self._apply(entry)
+            self.version += 1
+        self._journal_offset += end
+
+    def is_own_write(self):
+        """
+        True if the file and journal are still the ones this store last wrote, i.e. a change
+        notification was caused by this store's own write. Reading doesn't count, so a write by
+        another process stays detectable after the store has picked it up. Files are compared
+        by inode, size and mtime rather than content, since another process can write content
+        identical to ours (e.g. adding a job and cancelling it again) that must still be reloaded.
+        """
+        with self._lock:
+            return self._written_signature is not None and self._current_signature() == self._written_signature
+
+    def refresh(self):
+        """
+        Catches up with changes another process made since the files were last seen:
+        new journal lines are replayed, anything else reloads the index.
+        """
+        with self._lock:
+            if self._batch_depth:
+                return
+            signature = self._current_signature()
+            if signature == self._signature:
+                return
+
+            file_signature, journal_signature = signature
+            previous_journal = self._signature[1]
+            appended = (
+                file_signature == self._signature[0]
+                and journal_signature is not None
+                and journal_signature[1] >= self._journal_offset
+                and (previous_journal is None or journal_signature[0] == previous_journal[0])
+            )
+            if appended:
+                self._replay_journal()
+                self._signature = signature
+            else:
+                self.reload()
+
+    def get(self, job_id):
+        """Returns a copy of the job record, or None if it doesn't exist."""
+        with self._lock:
+            self.refresh()
+            job = self._jobs.get(job_id)
+            return copy.deepcopy(job) if job is not None else None
+
+    def __contains__(self, job_id):
+        with self._lock:
+            self.refresh()
+            return job_id in self._jobs
+
+    def __len__(self):
+        with self._lock:
+            self.refresh()
+            return len(self._jobs)
+
+    def job_ids(self):
+        """Returns the ids of all jobs, checking the file for changes once."""
+        with self._lock:
+            self.refresh()
+            return set(self._jobs)
+
+    def all(self):
+        """Returns copies of all job records, in file order."""
+        with self._lock:
+            self.refresh()
+            return [copy.deepcopy(job) for job in self._jobs.values()]
+
+    def put(self, job_data):
+        """
+        Saves or replaces a job record. A replaced job moves to the end of the list.
+        """
+        with self._lock:
+            self.refresh()
+            entry = {"put": copy.deepcopy(job_data)}
+            self._apply(entry)
+            self.version += 1
+            self._write(entry)
+
+    def remove(self, job_id):
+        """Removes a job record. Returns True if it existed."""
+        with self._lock:
+            self.refresh()
+            if job_id not in self._jobs:
+                return False
+            entry = {"remove": job_id}
+            self._apply(entry)
+            self.version += 1
+            self._write(entry)
+            return True
+
+    def _apply(self, entry):
+        """Applies a change, {"put": record} or {"remove": job_id}, to the index."""
+        if "put" in entry:
+            job = entry["put"]
+            self._jobs.pop(job["job_id"], None)
+            self._encoded.pop(job["job_id"], None)
+            self._jobs[job["job_id"]] = job
+        elif "remove" in entry:
+            self._jobs.pop(entry["remove"], None)
+            self._encoded.pop(entry["remove"], None)
+
+    @contextmanager
+    def batch(self):
+        """
+        Defers writing the file until the outermost batch exits,
+        so bulk changes rewrite it once instead of once per job.
+        """
+        with self._lock:
+            self.refresh()
+            self._batch_depth += 1
+            try:
+                yield self
+            finally:
+                self._batch_depth -= 1
+                if self._batch_depth == 0 and self._dirty:
+                    self._flush()
+
+    def _write(self, entry):
+        """Persists one change: appended to the journal for large files, otherwise by rewriting the file."""
+        self._dirty = True
+        if self._batch_depth:
+            return
+        if self._file_size < JOURNAL_THRESHOLD_BYTES or not self._append(entry):
+            self._flush()
+        elif self._journal_offset > self._file_size:
+            # The journal outgrew the file; fold it in
+            self._flush()
+
+    def _append(self, entry):
+        """
+        Appends a change to the journal, starting a new journal if none applies to the file.
+        Returns False if the journal was replaced meanwhile, after reloading and reapplying the change.
+        """
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+        if not self._journal_valid:
+            header = (json.dumps({"base": self._file_hash}) + "\n").encode("utf-8")
+            temp_path = f"{self.journal_path}.{os.getpid()}.tmp"
+            with open(temp_path, "wb") as f:
+                f.write(header + line)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.journal_path)
+            self._journal_valid = True
+            self._journal_offset = len(header) + len(line)
+            self._signature = self._written_signature = self._current_signature()
+            self._dirty = False
+            return True
+
+        try:
+            fd = os.open(self.journal_path, os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0))
+        except FileNotFoundError:
+            fd = None
+        if fd is not None:
+            try:
+                stat_info = os.fstat(fd)
+                if self._signature[1] is not None and stat_info.st_ino == self._signature[1][0]:
+                    os.write(fd, line)
+                    os.fsync(fd)
+                    stat_info = os.fstat(fd)
+                else:
+                    stat_info = None
+            finally:
+                os.close(fd)
+        else:
+            stat_info = None
+
+        if stat_info is None:
+            # Another process folded the journal into the file; catch up and write the change again
+            self.reload()
+            self._apply(entry)
+            self.version += 1
+            return False
+
+        if stat_info.st_size == self._journal_offset + len(line):
+            self._journal_offset = stat_info.st_size
+            journal_signature = (stat_info.st_ino, stat_info.st_size, stat_info.st_mtime_ns)
+            self._signature = self._written_signature = (self._signature[0], journal_signature)
+        else:
+            # Another process appended too; its lines and ours are picked up from the journal
+            self.reload()
+        self._dirty = False
+        return True
+
+    def _encode(self, job_id):
+        """Returns the record's JSON as it appears inside the indented list."""
+        fragment = self._encoded.get(job_id)
+        if fragment is None:
+            fragment = textwrap.indent(json.dumps(self._jobs[job_id], indent=2), "  ")
+            self._encoded[job_id] = fragment
+        return fragment
+
+    def _flush(self):
+        """
+        Atomically replaces the JSON file with the current records, folding in the journal.
+        Only changed records are re-encoded, but the whole file is written.
+        """
+        # Keep lines another process appended since the last refresh
+        journal_signature = self._file_signature(self.journal_path)
+        if self._journal_valid and journal_signature != self._signature[1]:
+            self._replay_journal()
+
+        if self._jobs:
+            content = "[\n" + ",\n".join(self._encode(job_id) for job_id in self._jobs) + "\n]"
+        else:
+            content = "[]"
+        data = content.encode("utf-8")
+
+        temp_path = f"{self.path}.{os.getpid()}.tmp"
+        with open(temp_path, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, self.path)
+
+        # The journal applied to the previous file; remove it unless it changed meanwhile
+        if journal_signature is not None and self._file_signature(self.journal_path) == journal_signature:
+            try:
+                os.remove(self.journal_path)
+            except OSError:
+                pass
+
+        self._file_hash = hashlib.sha256(data).hexdigest()
+        self._file_size = len(data)
+        self._journal_valid = False
+        self._journal_offset = 0
+        self._signature = self._written_signature = self._current_signature()
+        self._dirty = False
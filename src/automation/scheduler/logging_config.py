@@ -11,7 +11,7 @@ def setup_temporary_logging():
     """
 
     timestamp_str = str(int(time.time()))
-    log_filename = f"daemon_temp_{timestamp_str}.log"
+    log_filename = f"daemon_temp_{timestamp_str}_{os.getpid()}.log"
 
     # Create a file handler
     file_handler = logging.FileHandler(log_filename, mode='w')
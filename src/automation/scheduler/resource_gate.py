@@ -0,0 +1,182 @@
+from contextlib import contextmanager
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Jobs allowed to do file I/O on the same disk at once
+DEFAULT_IO_SLOTS_PER_DEVICE = 2
+
+# Seconds between attempts to take a disk slot held by another daemon worker
+SHARED_SLOT_POLL_INTERVAL = 0.5
+
+
+def normalize_target(path):
+    """Returns the absolute, symlink-resolved form of a target path."""
+    return os.path.normcase(os.path.realpath(os.path.abspath(path)))
+
+
+def targets_overlap(first, second):
+    """True if two normalized targets are the same path or one contains the other."""
+    try:
+        return os.path.commonpath([first, second]) in (first, second)
+    except ValueError:
+        # Different drives on Windows
+        return False
+
+
+def device_of(path):
+    """
+    Returns the device id of the disk holding `path`,
+    using the nearest existing parent for paths that don't exist yet.
+    """
+    current = path
+    while True:
+        try:
+            return os.stat(current).st_dev
+        except OSError:
+            parent = os.path.dirname(current)
+            if parent == current:
+                return None
+            current = parent
+
+
+class ResourceGate:
+    """
+    Admission control for running jobs.
+
+    A job holds its targets (folders or files) while it runs. Jobs whose targets
+    overlap are serialized, and at most `io_slots_per_device` jobs touch the same
+    disk at once, so jobs on different disks still run in parallel. Waiting jobs
+    are admitted by priority (higher first), then in arrival order; a job is never
+    started ahead of a higher-ranked waiter that needs the same folder, or that is
+    only waiting for a slot on the same disk.
+
+    With a `coordinator` (a WorkerCoordinator shared by several daemon workers), the disk
+    slots are also counted in its database, so the limit holds across all workers rather
+    than per process. Folder serialization stays within a process: each run already fires
+    on a single worker.
+    """
+
+    def __init__(self, io_slots_per_device: int = DEFAULT_IO_SLOTS_PER_DEVICE, coordinator=None):
+        self.io_slots_per_device = io_slots_per_device
+        self.coordinator = coordinator
+        self._condition = threading.Condition()
+        self._held = {}  # ticket -> (targets, devices)
+        self._waiting = {}  # ticket -> (targets, devices)
+        self._device_usage = {}  # device -> number of running jobs using it
+        self._sequence = itertools.count()
+
+    def _blocked_by_held(self, targets):
+        """True if a running job holds a target overlapping one of `targets`."""
+        return any(
+            targets_overlap(a, b) for held_targets, _ in self._held.values() for a in targets for b in held_targets
+        )
+
+    def _can_start(self, ticket, claim):
+        targets, devices = claim
+        if self._blocked_by_held(targets):
+            return False
+
+        ahead = [other for other_ticket, other in self._waiting.items() if other_ticket < ticket]
+
+        # Waiters ranked ahead get the folders they need first
+        for other_targets, _ in ahead:
+            if any(targets_overlap(a, b) for a in targets for b in other_targets):
+                return False
+
+        # ...and the disk slots they could use right away
+        for device in devices:
+            ready_ahead = sum(
+                1
+                for other_targets, other_devices in ahead
+                if device in other_devices and not self._blocked_by_held(other_targets)
+            )
+            if self._device_usage.get(device, 0) + ready_ahead >= self.io_slots_per_device:
+                return False
+        return True
+
+    @contextmanager
+    def hold(self, targets, priority: int = 0, label: str = None):
+        """
+        Blocks until the targets can be used, then holds them until the block exits.
+        Jobs without targets (e.g. sending email) pass straight through.
+        """
+        targets = frozenset(normalize_target(t) for t in targets if t)
+        if not targets:
+            yield
+            return
+
+        devices = frozenset(d for d in (device_of(t) for t in targets) if d is not None)
+        claim = (targets, devices)
+        # Tickets sort by priority (higher first), then arrival
+        ticket = (-priority, next(self._sequence))
+
+        with self._condition:
+            self._waiting[ticket] = claim
+            try:
+                if not self._can_start(ticket, claim):
+                    logger.info(f"Job {label or ticket} is waiting for {', '.join(sorted(targets))}.")
+                    self._condition.wait_for(lambda: self._can_start(ticket, claim))
+            finally:
+                del self._waiting[ticket]
+                # A waiter leaving can unblock the ones ranked behind it
+                self._condition.notify_all()
+
+            self._held[ticket] = claim
+            for device in devices:
+                self._device_usage[device] = self._device_usage.get(device, 0) + 1
+
+        holder = None
+        try:
+            if self.coordinator is not None and devices:
+                holder = f"{self.coordinator.worker_id}:{ticket[1]}"
+                self._acquire_shared_slots(holder, devices, label or ticket)
+            yield
+        finally:
+            if holder is not None:
+                try:
+                    self.coordinator.release_slots(holder)
+                except Exception as e:
+                    logger.warning(f"Could not release disk slots of job {label or ticket}: {e}")
+            with self._condition:
+                del self._held[ticket]
+                for device in devices:
+                    self._device_usage[device] -= 1
+                    if not self._device_usage[device]:
+                        del self._device_usage[device]
+                self._condition.notify_all()
+
+    def _acquire_shared_slots(self, holder, devices, label):
+        """
+        Waits for a slot on each disk among all daemon workers.
+        If the coordination database can't be reached, the job runs under the per-process limit only.
+        """
+        # Device ids are only meaningful on the host that reported them
+        resources = [f"{socket.gethostname()}:{device}" for device in sorted(devices)]
+        logged = False
+        while True:
+            try:
+                if self.coordinator.acquire_slots(holder, resources, self.io_slots_per_device):
+                    return
+            except Exception as e:
+                logger.warning(f"Could not take shared disk slots for job {label}: {e}")
+                return
+            if not logged:
+                logger.info(f"Job {label} is waiting for a disk slot held by another worker.")
+                logged = True
+            time.sleep(SHARED_SLOT_POLL_INTERVAL)
+
+    def running(self):
+        """Returns the number of jobs currently holding targets."""
+        with self._condition:
+            return len(self._held)
+
+    def waiting(self):
+        """Returns the number of jobs waiting for their targets."""
+        with self._condition:
+            return len(self._waiting)
@@ -1,21 +1,83 @@
+import concurrent.futures
 from datetime import datetime, timedelta
+import hashlib
 import json
 import logging
 import os
-import shutil
 import threading
 import time
 
 from apscheduler.events import EVENT_JOB_ERROR, EVENT_JOB_EXECUTED, EVENT_JOB_MISSED
-from apscheduler.executors.pool import ProcessPoolExecutor, ThreadPoolExecutor
+from apscheduler.executors.pool import ThreadPoolExecutor
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.date import DateTrigger
 
-from src.automation.scheduler.job_handler import TASK_FUNCTIONS, TASK_LABELS
+from src.automation.scheduler.attachment_store import AttachmentStore
+from src.automation.scheduler.coordination import HEARTBEAT_INTERVAL
+from src.automation.scheduler.job_handler import (
+    TASK_EXECUTORS,
+    TASK_FUNCTIONS,
+    TASK_LABELS,
+    import_callable,
+    resolve_task,
+)
+from src.automation.scheduler.job_history import JobHistory, RunTimer, peak_rss
+from src.automation.scheduler.job_store import JobStore
+from src.automation.scheduler.resource_gate import DEFAULT_IO_SLOTS_PER_DEVICE, ResourceGate
 
 logger = logging.getLogger(__name__)
 
+# Default worker count of each executor class
+DEFAULT_POOL_SIZES = {
+    "io": 10,
+    "cpu": os.cpu_count() or 3,
+    "network": 10,
+}
+
+# APScheduler executor alias serving each executor class.
+# "cpu" threads only wait for their folders, then hand the work to the process pool.
+EXECUTOR_ALIASES = {
+    "io": "default",
+    "cpu": "cpu",
+    "network": "network",
+}
+
+# Day names in the order of the week, with their cron abbreviations
+DAY_MAP = {
+    "Monday": "mon",
+    "Tuesday": "tue",
+    "Wednesday": "wed",
+    "Thursday": "thu",
+    "Friday": "fri",
+    "Saturday": "sat",
+    "Sunday": "sun",
+}
+WEEK_DAYS = list(DAY_MAP)
+
+# Ways of spreading recurring jobs saved for the same time:
+# "pack" staggers them across the window in proportion to their typical durations,
+# "jitter" delays each one by a fixed per-job amount derived from its id
+SPREAD_MODES = ("pack", "jitter")
+
+# Seconds between wake-up checks, and the sleep gap that counts as a wake-up
+WAKE_CHECK_INTERVAL = 15
+WAKE_GAP_THRESHOLD = 10
+
+
+# Returned by a job run that another daemon worker claimed first
+NOT_CLAIMED = object()
+
+
+def _run_in_worker(task_function, task_kwargs):
+    """
+    Runs a task in a pool worker process and reports the worker's peak memory with the result.
+    `task_function` may be a dotted path, so only the worker imports the task's module.
+    """
+    task_callable = import_callable(task_function) if isinstance(task_function, str) else task_function
+    result = task_callable(**task_kwargs)
+    return result, peak_rss()
+
 
 class SchedulerManager:
     """
@@ -23,14 +85,69 @@ class SchedulerManager:
     storing jobs persistently in a JSON file.
     """
 
-    def __init__(self, jobs_file: str = "scheduled_jobs.json", start_scheduler: bool = True):
+    def __init__(
+        self,
+        jobs_file: str = "scheduled_jobs.json",
+        start_scheduler: bool = True,
+        pool_sizes: dict = None,
+        io_slots_per_device: int = DEFAULT_IO_SLOTS_PER_DEVICE,
+        history_file: str = None,
+        spread_window: int = 0,
+        spread_mode: str = "pack",
+        coordinator=None,
+        attachments_dir: str = None,
+    ):
         self.jobs_file = jobs_file
         self.job_metadata = {}
-
-        # Configure executors and job defaults
+        self.pool_sizes = {**DEFAULT_POOL_SIZES, **(pool_sizes or {})}
+
+        # Serializes jobs on the same folder and caps concurrent jobs per disk, across workers with a coordinator
+        self.resource_gate = ResourceGate(io_slots_per_device, coordinator=coordinator)
+
+        # Load levelling: recurring jobs at the same time start within `spread_window` seconds of it
+        if spread_mode not in SPREAD_MODES:
+            raise ValueError(f"Unknown spread mode '{spread_mode}'. Expected one of {', '.join(SPREAD_MODES)}.")
+        self.spread_window = spread_window
+        self.spread_mode = spread_mode
+        self.job_offsets = {}  # job_id -> seconds after its run time the job starts
+
+        # Execution metrics of past runs, kept next to the jobs file by default
+        if history_file is None:
+            history_file = os.path.join(os.path.dirname(os.path.abspath(jobs_file)), "job_history.db")
+        self.history = JobHistory(history_file)
+        self._active_runs = {}  # job_id -> RunTimer of the run in progress
+
+        # Attachments of scheduled emails, stored once per distinct content
+        if attachments_dir is None:
+            attachments_dir = os.path.join(os.path.dirname(os.path.abspath(jobs_file)), "scheduled_attachments")
+        self.attachment_store = AttachmentStore(attachments_dir)
+
+        # Shared with other daemon workers (a WorkerCoordinator) so each run fires exactly once
+        self.coordinator = coordinator
+        self._active_jobs = 0
+        self._active_lock = threading.Lock()
+
+        # Worker processes for CPU-heavy tasks, started on first use
+        self._process_pool = None
+        self._process_pool_lock = threading.Lock()
+
+        # Indexed view of the jobs file
+        self.job_store = JobStore(jobs_file)
+
+        # Digest of each job definition currently scheduled, used to skip unchanged jobs on reload
+        self.job_digests = {}
+
+        # Sorted summaries of the scheduled jobs (see job_snapshot), rebuilt only when jobs change
+        self._jobs_version = 0  # Incremented whenever jobs are scheduled or re-timed
+        self._snapshot = None
+        self._snapshot_key = None
+        self._snapshot_lock = threading.Lock()
+
+        # Configure one executor per executor class (see TASK_EXECUTORS) and job defaults
         executors = {
-            'default': ThreadPoolExecutor(10),
-            'processpool': ProcessPoolExecutor(3),
+            EXECUTOR_ALIASES["io"]: ThreadPoolExecutor(self.pool_sizes["io"]),
+            EXECUTOR_ALIASES["cpu"]: ThreadPoolExecutor(self.pool_sizes["cpu"]),
+            EXECUTOR_ALIASES["network"]: ThreadPoolExecutor(self.pool_sizes["network"]),
         }
 
         job_defaults = {
@@ -53,41 +170,190 @@ class SchedulerManager:
         # Load existing jobs
         self.load_jobs_from_file()
 
-        # Start a background thread to detect wake-ups
+        # Start a background thread to detect wake-ups, and one to keep in touch with other workers
+        self._stop_event = threading.Event()
         if start_scheduler:
             wake_thread = threading.Thread(target=self._detect_wake_up, daemon=True)
             wake_thread.start()
+            if self.coordinator is not None:
+                coordination_thread = threading.Thread(target=self._coordinate, daemon=True)
+                coordination_thread.start()
+
+    def _coordinate(self):
+        """
+        Sends heartbeats with this worker's load; the worker holding the leader lease also does housekeeping.
+        """
+        while True:
+            try:
+                self.coordinator.heartbeat(self._active_jobs)
+                if self.coordinator.acquire_leadership():
+                    self.coordinator.housekeeping()
+            except Exception as e:
+                logger.error(f"Worker coordination failed: {e}")
+            if self._stop_event.wait(HEARTBEAT_INTERVAL):
+                return
+
+    def _run_key(self, job_id):
+        """
+        Identifies one run of a job, the same on every worker: the job definition plus the
+        date and time it was saved for. Offsets, late starts and wake-up catch-up runs of
+        that occurrence all map to the same key.
+        """
+        metadata = self.job_metadata.get(job_id, {})
+        now = datetime.now()
+        hour, minute = map(int, metadata.get("run_time", "00:00").split(":"))
+        occurrence = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+        if occurrence > now:
+            occurrence -= timedelta(days=1)
+        return f"{job_id}:{self.job_digests.get(job_id, '')}:{occurrence.isoformat()}"
+
+    def _claim_run(self, job_id):
+        """
+        Claims the current run of a job among the daemon workers.
+        Busy workers wait briefly first, so idle ones pick up the work.
+        """
+        delay = self.coordinator.claim_delay(self._active_jobs)
+        if delay:
+            time.sleep(delay)
+        return self.coordinator.claim_run(self._run_key(job_id), job_id)
+
+    @staticmethod
+    def _reference_clock():
+        """
+        Returns a clock that keeps counting while the system is suspended:
+        CLOCK_BOOTTIME on Linux, wall-clock time elsewhere.
+        """
+        if hasattr(time, "CLOCK_BOOTTIME"):
+            return time.clock_gettime(time.CLOCK_BOOTTIME)
+        return time.time()
 
     def _detect_wake_up(self):
         """
-        Detects if the system has resumed from sleep and forces APScheduler to refresh.
+        Detects if the system has resumed from sleep and reconciles jobs that were due meanwhile.
+        time.monotonic() stops while the system is suspended, so the difference between it
+        and the reference clock over one check interval is the time spent asleep.
         """
-        last_time = time.time()
+        last_reference = self._reference_clock()
+        last_monotonic = time.monotonic()
 
-        while True:
-            time.sleep(1)
-            current_time = time.time()
+        while not self._stop_event.wait(WAKE_CHECK_INTERVAL):
+            current_reference = self._reference_clock()
+            current_monotonic = time.monotonic()
+            elapsed = current_monotonic - last_monotonic
 
-            # If the time jumped forward significantly, assume wake-up
-            if current_time - last_time > 10:  # If the system was "frozen" for 10+ sec
-                logger.warning("System wake-up detected! Refreshing APScheduler without shutdown.")
+            # Time asleep, or an overlong wait on platforms whose monotonic clock counts sleep
+            gap = max(current_reference - last_reference - elapsed, elapsed - WAKE_CHECK_INTERVAL)
+            if gap > WAKE_GAP_THRESHOLD:
+                logger.warning(f"System wake-up detected after {gap:.0f}s asleep. Reconciling missed jobs.")
+                self._reconcile_after_wake()
 
-                # Pause scheduling temporarily
-                self.scheduler.pause()
+            last_reference = current_reference
+            last_monotonic = current_monotonic
 
-                # Reload jobs to make sure they are still scheduled
-                self.load_jobs_from_file()
+    def _reconcile_after_wake(self):
+        """
+        Runs jobs whose next run time fell inside the sleep gap once, now.
+        Jobs due later keep their triggers untouched.
+        """
+        now = datetime.now(self.scheduler.timezone)
+        reconciled = 0
+        for job in self.scheduler.get_jobs():
+            next_run = getattr(job, "next_run_time", None)
+            if next_run is not None and next_run <= now:
+                try:
+                    job.modify(next_run_time=now)
+                    reconciled += 1
+                except Exception as e:
+                    logger.error(f"Failed to reconcile job {job.id} after wake-up: {e}")
+
+        # Make the scheduler re-evaluate due jobs instead of finishing its pre-sleep wait
+        self.scheduler.wakeup()
+        logger.info(f"Wake-up reconciliation complete. {reconciled} job(s) were due during sleep.")
+        return reconciled
+
+    @staticmethod
+    def _job_targets(task_kwargs):
+        """
+        Returns the folders and files a task reads or writes: its source directory
+        plus the data files of merge, mirror and mail merge jobs.
+        """
+        targets = [task_kwargs.get("source_directory"), task_kwargs.get("data_file")]
+        data_params = task_kwargs.get("data_params") or {}
+        targets.append(data_params.get("master_file"))
+        targets.extend(data_params.get("other_files") or [])
+        return [t for t in targets if t]
+
+    def _get_process_pool(self):
+        with self._process_pool_lock:
+            if self._process_pool is None:
+                self._process_pool = concurrent.futures.ProcessPoolExecutor(self.pool_sizes["cpu"])
+            return self._process_pool
+
+    def _run_task(self, job_id, task_type, priority, **task_kwargs):
+        """
+        Runs a scheduled task once its targets are free.
+        Jobs on overlapping folders run one after another, in priority order.
+        """
+        if self.coordinator is not None:
+            try:
+                claimed = self._claim_run(job_id)
+            except Exception as e:
+                logger.error(f"Could not claim job {job_id}: {e}")
+                raise
+            if not claimed:
+                logger.info(f"Job {job_id} was claimed by another worker; skipping this run.")
+                return NOT_CLAIMED
+
+        with self._active_lock:
+            self._active_jobs += 1
+        try:
+            return self._run_claimed_task(job_id, task_type, priority, task_kwargs)
+        finally:
+            with self._active_lock:
+                self._active_jobs -= 1
+
+    def _run_claimed_task(self, job_id, task_type, priority, task_kwargs):
+        targets = self._job_targets(task_kwargs)
+        timer = RunTimer()
+        self._active_runs[job_id] = timer
+
+        with self.resource_gate.hold(targets, priority=priority, label=job_id):
+            timer.start(targets + list(task_kwargs.get("attachments") or []))
+            if TASK_EXECUTORS.get(task_type) == "cpu":
+                try:
+                    result, worker_peak_rss = (
+                        self._get_process_pool().submit(_run_in_worker, TASK_FUNCTIONS[task_type], task_kwargs).result()
+                    )
+                except BaseException:
+                    timer.finish()
+                    raise
+                timer.finish(worker_peak_rss)
+                return result
 
-                # Resume scheduling
-                self.scheduler.resume()
+            try:
+                return resolve_task(task_type)(**task_kwargs)
+            finally:
+                timer.finish()
 
-            last_time = current_time
+    @staticmethod
+    def _job_digest(job_data):
+        """
+        Returns a content hash of a job definition.
+        """
+        encoded = json.dumps(job_data, sort_keys=True, default=str).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()
 
     def _job_listener(self, event):
         """
         Handle job execution events and cleanup for
         one-time jobs from JSON after execution.
         """
+        # Another worker ran it; the outcome and cleanup are that worker's to record
+        if event.code == EVENT_JOB_EXECUTED and event.retval is NOT_CLAIMED:
+            return
+
+        self._record_run(event)
+
         if event.code == EVENT_JOB_ERROR:
             logger.error(f"Job {event.job_id} raised an error during execution.")
 
@@ -107,78 +373,91 @@ class SchedulerManager:
         else:
             logger.debug(f"Unhandled event code: {event.code} for job {event.job_id}")
 
+    def _record_run(self, event):
+        """
+        Stores the outcome and measurements of a job run in the history.
+        """
+        status = {EVENT_JOB_EXECUTED: "success", EVENT_JOB_ERROR: "error", EVENT_JOB_MISSED: "missed"}.get(event.code)
+        if status is None:
+            return
+
+        timer = self._active_runs.pop(event.job_id, None) or RunTimer()
+        task_type = self.job_metadata.get(event.job_id, {}).get("task_type", "unknown")
+        scheduled_at = event.scheduled_run_time.timestamp() if event.scheduled_run_time else None
+        self.history.record(
+            job_id=event.job_id,
+            task_type=task_type,
+            status=status,
+            scheduled_at=scheduled_at,
+            started_at=timer.started_at,
+            finished_at=timer.finished_at,
+            files=timer.files,
+            bytes_processed=timer.bytes_processed,
+            peak_rss=timer.peak_rss,
+        )
+
+    def get_task_statistics(self, task_type=None, metric="duration", percents=(50, 90, 99), since=None):
+        """
+        Returns percentiles of a run metric per task type, e.g.
+        {"compress_files": {"count": 12, "last": 41.2, "p50": 38.0, "p90": 52.5, "p99": 60.1}}.
+        Metrics: queue_delay and duration (seconds), files, bytes, peak_rss (bytes).
+        """
+        return self.history.percentiles(task_type=task_type, metric=metric, percents=percents, since=since)
+
+    def get_job_history(self, job_id=None, task_type=None, since=None, limit=100):
+        """
+        Returns the most recent recorded runs, newest first.
+        """
+        return self.history.runs(task_type=task_type, job_id=job_id, since=since, limit=limit)
+
     def _get_job_from_file(self, job_id):
         """
-        Retrieve job details from the JSON file by job ID.
+        Retrieve job details from the job store by job ID.
         """
         try:
-            if os.path.exists(self.jobs_file):
-                with open(self.jobs_file, "r") as f:
-                    job_list = json.load(f)
-                    for job in job_list:
-                        if job["job_id"] == job_id:
-                            return job
+            return self.job_store.get(job_id)
         except Exception as e:
             logger.warning(f"Failed to read job {job_id} from file: {e}")
         return None
 
     def _cleanup_json_file(self, job_id):
         """
-        Remove a job's data from the JSON file.
+        Remove a job's data from the JSON file. Returns True if it was there.
         """
         try:
-            if os.path.exists(self.jobs_file):
-                with open(self.jobs_file, "r") as f:
-                    job_list = json.load(f)
-
-                # Keep all jobs except the one to be removed
-                updated_jobs = [j for j in job_list if j["job_id"] != job_id]
-
-                # Only rewrite if something changed
-                if len(updated_jobs) != len(job_list):
-                    with open(self.jobs_file, "w") as f:
-                        json.dump(updated_jobs, f, indent=2)
-                    logger.info(f"Job {job_id} removed from scheduled_jobs.json.")
+            # Only rewrites the file if the job was there
+            if self.job_store.remove(job_id):
+                logger.info(f"Job {job_id} removed from scheduled_jobs.json.")
+                return True
         except Exception as e:
             logger.error(f"Error removing job {job_id} from JSON: {e}")
+        return False
 
     def _persist_attachments(self, job_id, attachments):
         """
-        Copies each attachment into a dedicated folder to ensure they remain available
-        when APScheduler runs the job in the future.
+        Keeps the attachments available for when APScheduler runs the job in the future,
+        in the attachment store. Content already stored for another job isn't copied again.
         """
         if not attachments:
+            self.attachment_store.release(job_id)
             return []
-
-        base_dir = "scheduled_attachments"
-        os.makedirs(base_dir, exist_ok=True)
-
-        new_paths = []
-        for original_path in attachments:
-            if not os.path.isfile(original_path):
-                logger.warning(f"Attachment {original_path} does not exist or is not accessible.")
-                continue
-
-            # Prevent filename collisions by prefixing with job_id
-            filename = os.path.basename(original_path)
-            new_filename = f"{job_id}_{filename}"
-            new_path = os.path.join(base_dir, new_filename)
-
-            try:
-                shutil.copyfile(original_path, new_path)
-                new_paths.append(new_path)
-                logger.info(f"Copied attachment '{original_path}' -> '{new_path}'")
-            except Exception as e:
-                logger.error(f"Failed to copy attachment '{original_path}': {e}")
-
-        return new_paths
+        return self.attachment_store.store(job_id, attachments)
 
     def _cleanup_attachments(self, job_data):
         """
-        Removes attachments from storage after a one-time email job has been executed.
+        Releases a job's attachments once it's removed or a one-time email job has been executed;
+        stored content no other job uses is deleted.
         """
+        try:
+            self.attachment_store.release(job_data.get("job_id"))
+        except Exception as e:
+            logger.warning(f"Could not release attachments of job {job_data.get('job_id')}: {e}")
+
+        # Attachments saved before the store were per-job copies
         attachments = job_data.get("email_params", {}).get("attachments", [])
         for path in attachments:
+            if self.attachment_store.contains(path):
+                continue
             try:
                 os.remove(path)
                 logger.info(f"Removed attachment file: {path}")
@@ -186,11 +465,20 @@ class SchedulerManager:
                 logger.warning(f"Could not remove {path}: {e}")
 
     def add_scheduled_job(
-        self, task_type, folder_target, run_time, recurring_days=None, job_id=None, email_params=None, data_params=None
+        self,
+        task_type,
+        folder_target,
+        run_time,
+        recurring_days=None,
+        job_id=None,
+        email_params=None,
+        data_params=None,
+        priority=0,
     ):
         """
         Schedule a new job in APScheduler.
         Supports both recurring and one-time jobs.
+        When several jobs wait for the same folder, higher priority jobs run first.
         """
         if not job_id:
             job_id = f"{task_type}_{datetime.now().timestamp()}"
@@ -206,9 +494,11 @@ class SchedulerManager:
             "recurring_days": recurring_days or [],
             "email_params": email_params or {},
             "data_params": data_params or {},
+            "priority": priority,
         }
 
         self._schedule_job(job_data, persist=True)
+        self._level_load()
         return job_id
 
     def _schedule_job(self, job_data, persist=True):
@@ -222,6 +512,7 @@ class SchedulerManager:
         recurring_days = job_data.get("recurring_days", [])
         email_params = job_data.get("email_params", {})
         data_params = job_data.get("data_params", {})
+        priority = job_data.get("priority", 0)
 
         hour, minute = map(int, run_time.split(":"))
         now = datetime.now()
@@ -234,21 +525,13 @@ class SchedulerManager:
             "recurring_days": recurring_days,
             "task_type": task_type,
             "folder_target": folder_target,
+            "run_time": run_time,
         }
+        self._jobs_version += 1
 
         # Determine the appropriate trigger for the job
         if recurring_days:
-            day_map = {
-                "Monday": "mon",
-                "Tuesday": "tue",
-                "Wednesday": "wed",
-                "Thursday": "thu",
-                "Friday": "fri",
-                "Saturday": "sat",
-                "Sunday": "sun",
-            }
-            day_of_week = ",".join(day_map[d] for d in recurring_days)
-            trigger = CronTrigger(day_of_week=day_of_week, hour=hour, minute=minute)
+            trigger = self._recurring_trigger(recurring_days, run_time, self.job_offsets.get(job_id, 0))
             logger.info(f"Job {job_id} is recurring on {recurring_days} at {run_time}.")
         else:
             # One-time job => schedule for today or tomorrow if time is past
@@ -258,25 +541,29 @@ class SchedulerManager:
             trigger = DateTrigger(run_date=schedule_today)
             logger.info(f"One-time job {job_id} scheduled for {schedule_today}.")
 
-        # Get the function for the task
-        task_callable = TASK_FUNCTIONS.get(task_type)
-        if not task_callable:
+        # The task's function is only imported when the job first runs
+        if task_type not in TASK_FUNCTIONS:
             logger.error(f"Task function '{task_type}' not found. Job {job_id} not scheduled.")
             return
 
+        # Route the job to the executor for its class
+        executor = EXECUTOR_ALIASES[TASK_EXECUTORS.get(task_type, "io")]
+
+        # Copy attachments in temp folder
+        if task_type in ("send_email", "send_bulk_email", "mail_merge") and persist:
+            attachments = email_params.get("attachments", [])
+            persisted_paths = self._persist_attachments(job_id, attachments)
+            # Update the email_params with the new permanent paths
+            email_params["attachments"] = persisted_paths
+
         # Decide how to add the job
         if task_type == "send_email":
-            # Copy attachments in temp folder
-            if persist:
-                attachments = email_params.get("attachments", [])
-                persisted_paths = self._persist_attachments(job_id, attachments)
-                # Update the email_params with the new permanent paths
-                email_params["attachments"] = persisted_paths
-
             self.scheduler.add_job(
-                func=task_callable,
+                func=self._run_task,
+                args=(job_id, task_type, priority),
                 trigger=trigger,
                 id=job_id,
+                executor=executor,
                 kwargs={
                     "from_address": email_params.get("from_address"),
                     "to_addresses": email_params.get("to_addresses"),
@@ -288,11 +575,55 @@ class SchedulerManager:
                 replace_existing=True,
             )
 
+        elif task_type == "send_bulk_email":
+            self.scheduler.add_job(
+                func=self._run_task,
+                args=(job_id, task_type, priority),
+                trigger=trigger,
+                id=job_id,
+                executor=executor,
+                kwargs={
+                    "from_address": email_params.get("from_address"),
+                    "recipients": email_params.get("recipients"),
+                    "subject": email_params.get("subject"),
+                    "body_text": email_params.get("body_text"),
+                    "cc_addresses": email_params.get("cc_addresses"),
+                    "attachments": email_params.get("attachments"),
+                    "max_concurrency": email_params.get("max_concurrency"),
+                    "rate_limit": email_params.get("rate_limit"),
+                },
+                replace_existing=True,
+            )
+
+        elif task_type == "mail_merge":
+            self.scheduler.add_job(
+                func=self._run_task,
+                args=(job_id, task_type, priority),
+                trigger=trigger,
+                id=job_id,
+                executor=executor,
+                kwargs={
+                    "data_file": data_params.get("data_file"),
+                    "email_column": data_params.get("email_column"),
+                    "dry_run_path": data_params.get("dry_run_path"),
+                    "from_address": email_params.get("from_address"),
+                    "subject": email_params.get("subject"),
+                    "body_text": email_params.get("body_text"),
+                    "cc_addresses": email_params.get("cc_addresses"),
+                    "attachments": email_params.get("attachments"),
+                    "max_concurrency": email_params.get("max_concurrency"),
+                    "rate_limit": email_params.get("rate_limit"),
+                },
+                replace_existing=True,
+            )
+
         elif task_type in ("merge_data", "mirror_data"):
             self.scheduler.add_job(
-                func=TASK_FUNCTIONS[task_type],
+                func=self._run_task,
+                args=(job_id, task_type, priority),
                 trigger=trigger,
                 id=job_id,
+                executor=executor,
                 kwargs={
                     "source_directory": folder_target,
                     "data_params": data_params,
@@ -302,90 +633,204 @@ class SchedulerManager:
         else:
             # File or other tasks
             self.scheduler.add_job(
-                func=task_callable,
+                func=self._run_task,
+                args=(job_id, task_type, priority),
                 trigger=trigger,
                 id=job_id,
+                executor=executor,
                 kwargs={"source_directory": folder_target},
                 replace_existing=True,
             )
 
+        # Remember which definition is scheduled
+        self.job_digests[job_id] = self._job_digest(job_data)
+
         # Persist job_data if requested
         if persist:
             self._write_job_to_file(job_data)
 
+    @staticmethod
+    def _recurring_trigger(recurring_days, run_time, offset=0):
+        """
+        Returns the cron trigger for a recurring job, `offset` seconds after `run_time`.
+        An offset past midnight moves the job to the following days.
+        """
+        hour, minute = map(int, run_time.split(":"))
+        day_shift, seconds = divmod(hour * 3600 + minute * 60 + int(offset), 24 * 3600)
+        days = [WEEK_DAYS[(WEEK_DAYS.index(d) + day_shift) % 7] for d in recurring_days]
+        hour, seconds = divmod(seconds, 3600)
+        minute, second = divmod(seconds, 60)
+        return CronTrigger(day_of_week=",".join(DAY_MAP[d] for d in days), hour=hour, minute=minute, second=second)
+
+    @staticmethod
+    def _spread_key(job_id):
+        """Stable pseudo-random number for a job, so spreading doesn't depend on insertion order."""
+        return int(hashlib.sha256(job_id.encode("utf-8")).hexdigest()[:12], 16)
+
+    def _slot_offsets(self, job_ids, typical_durations):
+        """
+        Returns the start offset of each job sharing a run time.
+        """
+        if self.spread_mode == "jitter":
+            return {job_id: self._spread_key(job_id) % self.spread_window for job_id in job_ids}
+
+        # Jobs without history count as long as a typical known job
+        known = sorted(d for d in typical_durations.values() if d)
+        fallback = known[len(known) // 2] if known else 1.0
+
+        ordered = sorted(job_ids, key=self._spread_key)
+        durations = [typical_durations.get(self.job_metadata[j]["task_type"]) or fallback for j in ordered]
+        total = sum(durations)
+
+        offsets = {}
+        elapsed = 0.0
+        for job_id, duration in zip(ordered, durations):
+            offsets[job_id] = int(self.spread_window * elapsed / total)
+            elapsed += duration
+        return offsets
+
+    def _level_load(self):
+        """
+        Spreads recurring jobs saved for the same time across the spread window,
+        re-timing any job whose offset changed.
+        """
+        if not self.spread_window:
+            return
+
+        slots = {}
+        for job in self.scheduler.get_jobs():
+            metadata = self.job_metadata.get(job.id)
+            if metadata and metadata.get("recurring_days"):
+                slots.setdefault(metadata["run_time"], []).append(job.id)
+
+        typical_durations = {}
+        if self.spread_mode == "pack":
+            stats = self.history.percentiles(metric="duration", percents=(50,))
+            typical_durations = {task_type: task_stats["p50"] for task_type, task_stats in stats.items()}
+
+        # Forget offsets of jobs that were removed or are no longer recurring
+        spread_ids = {job_id for job_ids in slots.values() for job_id in job_ids}
+        for job_id in list(self.job_offsets):
+            if job_id not in spread_ids:
+                del self.job_offsets[job_id]
+
+        for run_time, job_ids in slots.items():
+            for job_id, offset in self._slot_offsets(job_ids, typical_durations).items():
+                previous = self.job_offsets.get(job_id, 0)
+                self.job_offsets[job_id] = offset
+                if previous == offset:
+                    continue
+                metadata = self.job_metadata[job_id]
+                try:
+                    self.scheduler.reschedule_job(
+                        job_id, trigger=self._recurring_trigger(metadata["recurring_days"], run_time, offset)
+                    )
+                    self._jobs_version += 1
+                    logger.info(f"Job {job_id} staggered to start {offset}s after {run_time}.")
+                except Exception as e:
+                    logger.error(f"Failed to stagger job {job_id}: {e}")
+
     def _write_job_to_file(self, job_data):
         """
         Save or update job details in the JSON file.
         """
         try:
-            if os.path.exists(self.jobs_file):
-                with open(self.jobs_file, "r") as f:
-                    job_list = json.load(f)
-            else:
-                job_list = []
-
-            # Remove old entry for the same job_id and add the new one
-            job_list = [j for j in job_list if j["job_id"] != job_data["job_id"]]
-            job_list.append(job_data)
-
-            with open(self.jobs_file, "w") as f:
-                json.dump(job_list, f, indent=2)
+            self.job_store.put(job_data)
             logger.info(f"Job {job_data['job_id']} saved to JSON.")
         except Exception as e:
             logger.error(f"Error writing job {job_data['job_id']} to JSON: {e}")
 
-    def list_scheduled_jobs(self):
+    @staticmethod
+    def _display_target(job, metadata):
+        """Describes what a job works on: recipients for email jobs, the folder or file for the others."""
+        task_type = metadata.get("task_type")
+        if task_type == "send_email":
+            # For email jobs, get recipients from the job kwargs
+            to_addresses = job.kwargs.get("to_addresses", [])
+            return ", ".join(to_addresses) if to_addresses else "-"
+        if task_type == "send_bulk_email":
+            recipients = job.kwargs.get("recipients") or []
+            return f"{len(recipients)} recipients"
+        if task_type == "mail_merge":
+            return os.path.basename(job.kwargs.get("data_file") or "") or "-"
+        # For file jobs, get the source directory
+        return metadata.get("folder_target") or job.kwargs.get("source_directory", "-")
+
+    @staticmethod
+    def _next_run_time(job, now):
         """
-        Return a list of currently scheduled jobs with their details.
+        Returns when a job runs next, or None. Jobs of a running scheduler keep it up to date;
+        pending ones (the UI doesn't start its scheduler) work it out from their trigger.
         """
-        jobs_data = []
-        for job in self.scheduler.get_jobs():
-            # Get metadata for the job
-            metadata = self.job_metadata.get(job.id, {})
-            task_type = metadata.get("task_type")
-            recurring_days = metadata.get("recurring_days", [])
-
-            # For one-time jobs, check if they are still in the JSON file. If not, skip them
-            if not recurring_days:
-                if self._get_job_from_file(job.id) is None:
-                    continue
+        if hasattr(job, "next_run_time"):
+            return job.next_run_time
+        try:
+            return job.trigger.get_next_fire_time(None, now)
+        except Exception:
+            return None
 
-            # Determine the target based on job type
-            if task_type == "send_email":
-                # For email jobs, get recipients from the job kwargs
-                to_addresses = job.kwargs.get("to_addresses", [])
-                target = ", ".join(to_addresses) if to_addresses else "-"
-            else:
-                # For file jobs, get the source directory
-                target = metadata.get("folder_target") or job.kwargs.get("source_directory", "-")
+    def _current_snapshot_key(self):
+        self.job_store.refresh()
+        return (self._jobs_version, self.job_store.version)
 
-            # Get the next run time
-            next_run = None
-            try:
-                job_info = self.scheduler._job_stores['default'].get_job(job.id)
-                if job_info and hasattr(job_info, 'next_run_time'):
-                    next_run = str(job_info.next_run_time) if job_info.next_run_time else None
-            except Exception:
-                try:
-                    now = datetime.now()
-                    # Get next fire time from trigger
-                    next_time = job.trigger.get_next_fire_time(None, now)
-                    if next_time:
-                        next_run = str(next_time)
-                except Exception:
-                    # If all else fails, use trigger string to indicate schedule
-                    next_run = f"According to: {str(job.trigger)}"
-
-            jobs_data.append(
-                {
-                    "job_id": job.id,
-                    "task_type": task_type,
-                    "folder_target": target,
-                    "trigger": str(job.trigger),
-                    "next_run_time": next_run,
-                    "recurring_days": metadata.get("recurring_days", []),
-                }
-            )
+    def job_snapshot(self):
+        """
+        Returns summaries of the scheduled jobs, earliest next run first: a tuple of dicts with
+        job_id, task_type, folder_target (what the job works on), recurring_days, next_run
+        (a datetime, or None) and trigger.
+
+        The snapshot is cached and shared, so callers must not modify it. It's rebuilt only after
+        jobs were scheduled, re-timed or removed, or once its earliest run is due, since a run
+        moves its job down the list; cancelling a job removes it from the cached snapshot.
+        """
+        with self._snapshot_lock:
+            key = self._current_snapshot_key()
+            now = datetime.now().astimezone()
+            if self._snapshot is not None and self._snapshot_key == key:
+                first_run = self._snapshot[0]["next_run"] if self._snapshot else None
+                if first_run is None or first_run > now:
+                    return self._snapshot
+
+            # One-time jobs the daemon already ran are gone from the file
+            file_job_ids = self.job_store.job_ids()
+            rows = []
+            for job in self.scheduler.get_jobs():
+                metadata = self.job_metadata.get(job.id, {})
+                recurring_days = metadata.get("recurring_days", [])
+                if not recurring_days and job.id not in file_job_ids:
+                    continue
+                rows.append(
+                    {
+                        "job_id": job.id,
+                        "task_type": metadata.get("task_type"),
+                        "folder_target": self._display_target(job, metadata),
+                        "recurring_days": recurring_days,
+                        "next_run": self._next_run_time(job, now),
+                        "trigger": job.trigger,
+                    }
+                )
+
+            # Jobs without a next run go last
+            rows.sort(key=lambda row: (row["next_run"] is None, row["next_run"] or 0))
+            self._snapshot = tuple(rows)
+            self._snapshot_key = key
+            return self._snapshot
+
+    def list_scheduled_jobs(self):
+        """
+        Return a list of currently scheduled jobs with their details, earliest next run first.
+        """
+        jobs_data = [
+            {
+                "job_id": row["job_id"],
+                "task_type": row["task_type"],
+                "folder_target": row["folder_target"],
+                "trigger": str(row["trigger"]),
+                "next_run_time": str(row["next_run"]) if row["next_run"] else None,
+                "recurring_days": row["recurring_days"],
+            }
+            for row in self.job_snapshot()
+        ]
 
         logger.info(f"Listing {len(jobs_data)} active jobs.")
         return jobs_data
@@ -393,38 +838,54 @@ class SchedulerManager:
     def load_jobs_from_file(self):
         """
         Load (or reload) scheduled jobs from a JSON file into APScheduler.
+        Only jobs whose definition changed since they were scheduled are re-added.
+        Returns False if the file couldn't be parsed.
         """
         if not os.path.exists(self.jobs_file):
             return
 
         logger.info("Loading jobs from scheduled_jobs.json...")
-        try:
-            with open(self.jobs_file, "r") as f:
-                file_jobs = json.load(f)
-        except Exception as e:
-            file_jobs = []
-            logger.error(f"Error reading scheduled_jobs.json: {e}")
+        if not self.job_store.reload():
+            # Keep the current schedule rather than dropping every job over a half-written file
+            logger.warning("Jobs file could not be parsed; keeping the current schedule.")
+            return False
+        file_jobs = self.job_store.all()
 
         # Convert file job list to a dict for quick lookup
         file_jobs_dict = {j["job_id"]: j for j in file_jobs if "job_id" in j}
 
         # Remove any APScheduler jobs that aren't in the file
         all_current_jobs = self.scheduler.get_jobs()
+        scheduled_ids = set()
         removed_jobs_count = 0
         for job in all_current_jobs:
             if job.id not in file_jobs_dict:
                 try:
                     self.scheduler.remove_job(job.id)
+                    self.job_digests.pop(job.id, None)
+                    self._jobs_version += 1
                     removed_jobs_count += 1
                     logger.info(f"Removed job {job.id} from scheduler (not found in JSON).")
                 except Exception:
                     logger.exception(f"Failed to remove job {job.id}.")
+            else:
+                scheduled_ids.add(job.id)
 
-        # Re-schedule or add each job from file
-        for job_data in file_jobs:
+        # Add new jobs and replace changed ones; unchanged jobs keep their triggers
+        changed_jobs_count = 0
+        for job_id, job_data in file_jobs_dict.items():
+            if job_id in scheduled_ids and self.job_digests.get(job_id) == self._job_digest(job_data):
+                continue
             self._schedule_job(job_data, persist=False)
+            changed_jobs_count += 1
 
-        logger.info(f"File load complete. {removed_jobs_count} job(s) removed, {len(file_jobs)} job(s) processed.")
+        self._level_load()
+
+        logger.info(
+            f"File load complete. {removed_jobs_count} job(s) removed, {changed_jobs_count} job(s) added or updated, "
+            f"{len(file_jobs_dict) - changed_jobs_count} unchanged."
+        )
+        return True
 
     def remove_scheduled_job(self, job_id):
         """
@@ -433,27 +894,57 @@ class SchedulerManager:
         """
         logger.info(f"Removing scheduled job {job_id}.")
 
+        # A cached snapshot that's current only loses this job, rather than being rebuilt
+        with self._snapshot_lock:
+            snapshot_current = self._snapshot is not None and self._snapshot_key == self._current_snapshot_key()
+        store_version = self.job_store.version
+
         # Get job data before removing it from JSON
         job_data = self._get_job_from_file(job_id)
-        self._cleanup_json_file(job_id)
+        removed_from_file = self._cleanup_json_file(job_id)
 
         # Clean up any attachments if this was an email job
         if job_data and "email_params" in job_data:
             self._cleanup_attachments(job_data)
 
         # Remove from scheduler
+        self.job_digests.pop(job_id, None)
+        self.job_offsets.pop(job_id, None)
         try:
             self.scheduler.remove_job(job_id)
             logger.info(f"Job {job_id} removed from scheduler.")
         except Exception as e:
             logger.error(f"Failed to remove job {job_id} from scheduler: {e}")
 
+        with self._snapshot_lock:
+            # Unless another process changed the file in the meantime
+            if snapshot_current and self.job_store.version == store_version + removed_from_file:
+                self._snapshot = tuple(row for row in self._snapshot if row["job_id"] != job_id)
+                self._snapshot_key = self._current_snapshot_key()
+
+        # The jobs left at that time can move up
+        self._level_load()
+
     def shutdown(self):
         """
         Shut down the APScheduler instance.
         """
+        self._stop_event.set()
         if self.scheduler is not None and self.scheduler.running:
             logger.info("Shutting down scheduler.")
             self.scheduler.shutdown(wait=False)
         else:
             logger.info("Scheduler is not running, skipping shutdown.")
+
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+
+        self.history.close()
+        self.attachment_store.close()
+
+        if self.coordinator is not None:
+            try:
+                self.coordinator.release()
+            except Exception as e:
+                logger.warning(f"Could not release worker leases: {e}")
+            self.coordinator.close()
@@ -0,0 +1,61 @@
+from PyQt5.QtWidgets import QHBoxLayout, QProgressBar, QWidget
+
+from src.ui.components.components import create_button
+from src.ui.style import GRAY_BUTTON_STYLE, PROGRESS_BAR_STYLE
+
+
+class TaskProgress(QWidget):
+    """
+    Progress bar with a Cancel button for a BackgroundTask, hidden while no task runs.
+    The bar shows a busy animation until the task reports its first progress.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.task = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(10)
+
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.setFixedHeight(6)
+        self.progress_bar.setStyleSheet(PROGRESS_BAR_STYLE)
+        layout.addWidget(self.progress_bar, 1)
+
+        self.cancel_btn = create_button("Cancel", GRAY_BUTTON_STYLE)
+        self.cancel_btn.clicked.connect(self.on_cancel_clicked)
+        layout.addWidget(self.cancel_btn)
+
+        self.hide()
+
+    def track(self, task, cancellable=True):
+        """Shows the progress of `task` until it finishes, fails or is cancelled."""
+        self.task = task
+        self.progress_bar.setRange(0, 0)
+        self.cancel_btn.setText("Cancel")
+        self.cancel_btn.setEnabled(True)
+        self.cancel_btn.setVisible(cancellable)
+
+        task.signals.progress.connect(self.on_progress)
+        task.signals.finished.connect(self.on_done)
+        task.signals.failed.connect(self.on_done)
+        task.signals.cancelled.connect(self.on_done)
+        self.show()
+
+    def on_progress(self, done, total):
+        if total > 0:
+            self.progress_bar.setRange(0, total)
+            self.progress_bar.setValue(done)
+
+    def on_cancel_clicked(self):
+        """Asks the task to stop; it does so at its next progress report."""
+        if self.task is not None:
+            self.task.cancel()
+            self.cancel_btn.setText("Stopping")
+            self.cancel_btn.setEnabled(False)
+
+    def on_done(self, *_):
+        self.task = None
+        self.hide()
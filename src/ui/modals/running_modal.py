@@ -1,14 +1,14 @@
 from datetime import datetime
 import sys
 
-from PyQt5.QtCore import Qt
-from PyQt5.QtWidgets import QHBoxLayout, QLabel, QScrollArea, QVBoxLayout, QWidget
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtGui import QIcon
+from PyQt5.QtWidgets import QAbstractItemView, QHBoxLayout, QHeaderView, QLabel, QTableView, QWidget
 
 from src.automation.scheduler.job_handler import TASK_LABELS
-from src.ui.components.components import create_button, create_icon_button, create_separator
-from src.ui.components.elided_label import ElidedLabel
+from src.ui.components.components import create_button, create_separator
 from src.ui.modals.base_modal import BaseModalWindow
-from src.ui.style import BLUE_BUTTON_STYLE, INFO_WINDOW_STYLE
+from src.ui.style import BLUE_BUTTON_STYLE, INFO_WINDOW_STYLE, JOB_TABLE_STYLE
 
 # Abbreviations for day names
 DAY_ABBREVIATIONS = {
@@ -22,6 +22,103 @@ DAY_ABBREVIATIONS = {
 }
 
 
+class JobTableModel(QAbstractTableModel):
+    """
+    Table model over the scheduler's job snapshot (see SchedulerManager.job_snapshot).
+    A row's cells are formatted the first time it's displayed and cached, so opening
+    the list only formats the rows on screen. Cancelling removes just that row.
+    """
+
+    COLUMNS = ("Type", "Target", "Time", "Days", "")
+    TARGET_COLUMN = 1
+    CANCEL_COLUMN = 4
+
+    def __init__(self, format_row, run_stats_for, parent=None):
+        super().__init__(parent)
+        self.format_row = format_row  # job summary -> texts of the Type, Target, Time and Days cells
+        self.run_stats_for = run_stats_for  # job summary -> tooltip describing its task's past runs
+        self.jobs = []
+        self._cells = {}  # job_id -> formatted cells, filled as rows are displayed
+        self.cancel_icon = QIcon("assets/icons/cancel.png")
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job = self.jobs[index.row()]
+        column = index.column()
+
+        if column == self.CANCEL_COLUMN:
+            if role == Qt.DecorationRole:
+                return self.cancel_icon
+            if role == Qt.ToolTipRole:
+                return "Cancel job"
+            return None
+
+        if role == Qt.DisplayRole:
+            return self.cells(job)[column]
+        if role == Qt.ToolTipRole:
+            # The target is elided in its cell, so its tooltip shows it in full
+            run_stats = self.run_stats_for(job)
+            return f"{self.cells(job)[column]}\n\n{run_stats}" if column == self.TARGET_COLUMN else run_stats
+        return None
+
+    def cells(self, job):
+        cells = self._cells.get(job["job_id"])
+        if cells is None:
+            cells = self._cells[job["job_id"]] = self.format_row(job)
+        return cells
+
+    def job_id(self, row):
+        return self.jobs[row]["job_id"]
+
+    def set_jobs(self, jobs):
+        """
+        Shows a new job snapshot. When jobs were only removed, just their rows are removed;
+        any other change resets the model, which costs the same as opening the list.
+        """
+        new_ids = [job["job_id"] for job in jobs]
+        kept = set(new_ids)
+        if [job["job_id"] for job in self.jobs if job["job_id"] in kept] == new_ids:
+            for row in reversed(range(len(self.jobs))):
+                if self.jobs[row]["job_id"] not in kept:
+                    self.remove_row(row)
+            # Next run times may have moved on
+            self.jobs = list(jobs)
+            self._cells.clear()
+            if self.jobs:
+                self.dataChanged.emit(self.index(0, 0), self.index(len(self.jobs) - 1, len(self.COLUMNS) - 1))
+            return
+
+        self.beginResetModel()
+        self.jobs = list(jobs)
+        self._cells.clear()
+        self.endResetModel()
+
+    def remove_job(self, job_id):
+        """Removes a job's row, if it's listed."""
+        for row, job in enumerate(self.jobs):
+            if job["job_id"] == job_id:
+                self.remove_row(row)
+                return
+
+    def remove_row(self, row):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        job = self.jobs.pop(row)
+        self._cells.pop(job["job_id"], None)
+        self.endRemoveRows()
+
+
 class RunningJobsModal(BaseModalWindow):
     """
     Modal window for displaying scheduled jobs in a table-like format.
@@ -29,6 +126,8 @@ class RunningJobsModal(BaseModalWindow):
     """
 
     COLUMN_WIDTHS = {"Type": 93, "Target": 120, "Time": 35, "Days": 45, "Cancel": 13}
+    COLUMN_SPACING = 5  # Space between the columns of a row
+    ROW_HEIGHT = 22
 
     def __init__(self, scheduler_manager, parent=None):
         # Determine font size and weight based on platform
@@ -41,7 +140,8 @@ class RunningJobsModal(BaseModalWindow):
 
         super().__init__(width=400, height=400, style_sheet=INFO_WINDOW_STYLE, parent=parent)
         self.scheduler_manager = scheduler_manager
-        self.jobs_container_layout = None
+        self.jobs_model = None
+        self.task_stats = None  # Duration percentiles per task type from the run history, read on first use
         self.header_spacing = 5  # Default spacing between header columns
 
         # Center the modal relative to the parent
@@ -91,22 +191,37 @@ class RunningJobsModal(BaseModalWindow):
         # Separator below header
         self.main_layout.addWidget(create_separator())
 
-        # Scrollable job container
-        self.jobs_container = QWidget()
-        self.jobs_container_layout = QVBoxLayout(self.jobs_container)
-        self.jobs_container_layout.setContentsMargins(0, 0, 0, 0)
-        self.jobs_container_layout.setSpacing(0)
-
-        scroll_area = QScrollArea()
-        self.jobs_container.setStyleSheet(
-            """
-            background-color: #333333;  /* Dark gray background */
-        """
+        # Job table; only the rows in view are laid out and painted
+        self.jobs_model = JobTableModel(self.format_row, self.run_stats_for, parent=self)
+        self.jobs_view = QTableView()
+        self.jobs_view.setModel(self.jobs_model)
+        self.jobs_view.horizontalHeader().hide()
+        self.jobs_view.verticalHeader().hide()
+        # Fixed row heights, so the view never measures rows off screen
+        self.jobs_view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.jobs_view.verticalHeader().setDefaultSectionSize(self.ROW_HEIGHT)
+        for column, width in enumerate(self.COLUMN_WIDTHS.values()):
+            self.jobs_view.setColumnWidth(column, width + self.COLUMN_SPACING)
+        self.jobs_view.setShowGrid(False)
+        self.jobs_view.setWordWrap(False)
+        self.jobs_view.setTextElideMode(Qt.ElideMiddle)
+        self.jobs_view.setAlternatingRowColors(True)
+        self.jobs_view.setSelectionMode(QAbstractItemView.NoSelection)
+        self.jobs_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.jobs_view.setFocusPolicy(Qt.NoFocus)
+        self.jobs_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.jobs_view.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.jobs_view.setStyleSheet(JOB_TABLE_STYLE.format(font_size=self.font_size))
+        self.jobs_view.clicked.connect(self.on_job_clicked)
+
+        # Pointer cursor over the cancel buttons
+        self.jobs_view.setMouseTracking(True)
+        self.jobs_view.entered.connect(
+            lambda index: self.jobs_view.viewport().setCursor(
+                Qt.PointingHandCursor if index.column() == JobTableModel.CANCEL_COLUMN else Qt.ArrowCursor
+            )
         )
-        scroll_area.setWidgetResizable(True)
-        scroll_area.setWidget(self.jobs_container)
-        scroll_area.setStyleSheet("border: none;")
-        self.main_layout.addWidget(scroll_area)
+        self.main_layout.addWidget(self.jobs_view)
 
         # Separator above bottom controls
         self.main_layout.addWidget(create_separator())
@@ -157,73 +272,68 @@ class RunningJobsModal(BaseModalWindow):
             return "-"
         return ", ".join(DAY_ABBREVIATIONS.get(day, day) for day in days_list)
 
-    def populate_jobs(self):
-        """Populate the job list with rows for each scheduled job."""
-        # Clear existing job rows
-        for i in reversed(range(self.jobs_container_layout.count())):
-            widget = self.jobs_container_layout.itemAt(i).widget()
-            if widget:
-                widget.deleteLater()
-
-        jobs = self.scheduler_manager.list_scheduled_jobs()
-
-        # Sort jobs by next_run_time (earliest first).
-        def parse_next_run(job):
-            time_str = job.get('next_run_time')
-            try:
-                return datetime.fromisoformat(time_str) if time_str else datetime.max
-            except Exception:
-                return datetime.max
-
-        jobs.sort(key=parse_next_run)
-
-        # Populate job rows in sorted order
-        for row_index, job_info in enumerate(jobs):
-            row_widget = self.create_job_row(job_info, row_index)
-            self.jobs_container_layout.addWidget(row_widget)
+    def format_duration(self, seconds):
+        """Format a duration in seconds as e.g. '45s' or '3m 20s'."""
+        if seconds is None:
+            return "-"
+        if seconds < 60:
+            return f"{seconds:.1f}s" if seconds < 10 else f"{seconds:.0f}s"
+        minutes, seconds = divmod(int(seconds), 60)
+        return f"{minutes}m {seconds}s"
+
+    def format_run_stats(self, stats):
+        """Describe the last duration of a task type and how it compares to its typical run."""
+        if not stats:
+            return "No runs recorded yet"
+
+        last, typical = stats["last"], stats["p50"]
+        if last > typical * 1.2:
+            trend = "slower than usual"
+        elif last < typical * 0.8:
+            trend = "faster than usual"
+        else:
+            trend = "steady"
 
-        self.jobs_container_layout.setAlignment(Qt.AlignTop)
+        return (
+            f"Last run: {self.format_duration(last)} ({trend})\n"
+            f"Typical: {self.format_duration(typical)}, slowest 10%: {self.format_duration(stats['p90'])}\n"
+            f"Based on {stats['count']} run(s)"
+        )
 
-    def create_job_row(self, job_info, row_index):
-        """Create a row for a single job's details."""
-        background_color = "#333333" if row_index % 2 == 0 else "#494949"
+    def populate_jobs(self):
+        """Show the scheduled jobs, earliest next run first, from the scheduler's cached job snapshot."""
+        self.task_stats = None
+        self.jobs_model.set_jobs(self.scheduler_manager.job_snapshot())
 
-        task_type = job_info.get("task_type", "Unknown")
+    def format_row(self, job_info):
+        """Format the Type, Target, Time and Days cells of a job's row."""
+        task_type = job_info.get("task_type") or "Unknown"
         folder_target = job_info.get("folder_target", "-")
-        next_run = self.format_time(job_info.get("next_run_time"))
-        recurring_days = self.format_days(job_info.get("recurring_days", []))
-        job_id = job_info.get("job_id")
-
-        friendly_type = TASK_LABELS.get(task_type, task_type)
 
         # Display email recipients for email jobs, folder path for file jobs
         display_target = folder_target
         if task_type == "send_email":
             display_target = folder_target or "No recipients"
 
-        row_layout = QHBoxLayout()
-        row_layout.setContentsMargins(5, 0, 5, 0)
-        row_layout.setSpacing(5)
-
-        row_data = {"Type": friendly_type, "Target": display_target, "Time": next_run, "Days": recurring_days}
-
-        for column_name, text in row_data.items():
-            label = ElidedLabel(text, max_width=self.COLUMN_WIDTHS[column_name], font_size=self.font_size)
-            label.setAlignment(Qt.AlignLeft)
-            label.setFixedWidth(self.COLUMN_WIDTHS[column_name])
-            row_layout.addWidget(label)
+        return (
+            TASK_LABELS.get(task_type, task_type),
+            display_target,
+            self.format_time(job_info.get("next_run")),
+            self.format_days(job_info.get("recurring_days", [])),
+        )
 
-        cancel_btn = create_icon_button("assets/icons/cancel.png", icon_size=(11, 11), button_size=(13, 13))
-        cancel_btn.clicked.connect(lambda _, j_id=job_id: self.on_cancel_job(j_id))
-        cancel_btn.setFixedWidth(self.COLUMN_WIDTHS["Cancel"])
-        row_layout.addWidget(cancel_btn)
+    def run_stats_for(self, job_info):
+        """Describe past runs of a job's task type, reading the run history on first use."""
+        if self.task_stats is None:
+            self.task_stats = self.scheduler_manager.get_task_statistics(percents=(50, 90))
+        return self.format_run_stats(self.task_stats.get(job_info.get("task_type")))
 
-        row_widget = QWidget()
-        row_widget.setLayout(row_layout)
-        row_widget.setStyleSheet(f"background-color: {background_color}; font-size: {self.font_size}pt; color: white;")
-        return row_widget
+    def on_job_clicked(self, index):
+        """Cancel the job whose cancel button was clicked."""
+        if index.column() == JobTableModel.CANCEL_COLUMN:
+            self.on_cancel_job(self.jobs_model.job_id(index.row()))
 
     def on_cancel_job(self, job_id):
-        """Remove a job and refresh the job list."""
+        """Remove a job and its row."""
         self.scheduler_manager.remove_scheduled_job(job_id)
-        self.populate_jobs()
+        self.jobs_model.remove_job(job_id)
@@ -192,6 +192,38 @@ QPushButton:focus {
 }
 """
 
+################ Progress Bar Style ################
+
+# Thin bar shown while a view's operation runs in the background
+PROGRESS_BAR_STYLE = """
+QProgressBar {
+    background-color: #4B5D5C;
+    border: none;
+    border-radius: 3px;
+}
+QProgressBar::chunk {
+    background-color: #007BFF;
+    border-radius: 3px;
+}
+"""
+
+################ Scheduled Jobs Table Style ################
+
+# Rows of the running jobs modal; {font_size} is filled in per platform
+JOB_TABLE_STYLE = """
+QTableView {{
+    background-color: #333333;
+    alternate-background-color: #494949;
+    color: white;
+    border: none;
+    font-size: {font_size}pt;
+}}
+QTableView::item {{
+    border: none;
+    padding-left: 5px;
+}}
+"""
+
 ################ ToastNotification Style ################
 
 TOAST_NOTIFICATION_STYLE = """
@@ -0,0 +1,113 @@
+import threading
+import time
+
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+# Seconds between progress updates sent to the UI, about one per frame at 60 fps
+PROGRESS_INTERVAL = 1 / 60
+
+_thread_pool = None
+_running_tasks = set()
+
+
+class TaskCancelled(Exception):
+    """Raised inside a background task's progress callback once the task was cancelled."""
+
+
+class TaskSignals(QObject):
+    """
+    Signals of a BackgroundTask. They're emitted from the worker thread and delivered
+    on the GUI thread, so connected slots can update widgets directly.
+    """
+
+    progress = pyqtSignal(int, int)  # done, total
+    finished = pyqtSignal(object)  # the function's return value
+    failed = pyqtSignal(object)  # the exception it raised
+    cancelled = pyqtSignal()
+
+
+class BackgroundTask(QRunnable):
+    """
+    Runs a function on the shared thread pool, so long operations don't block the GUI.
+
+    With `report_progress`, the function is also called with `progress=task.report`, a
+    `progress(done, total)` callback that forwards progress to the UI and raises TaskCancelled
+    once cancel() was called. Cancellation is cooperative: it takes effect at the function's
+    next progress report, except the final one (done >= total), which functions make once their
+    work is committed, so a late cancel doesn't report finished work as cancelled.
+    """
+
+    def __init__(self, fn, *args, report_progress=False, **kwargs):
+        super().__init__()
+        # The view holding the task owns it, so its signals outlive the pool's worker
+        self.setAutoDelete(False)
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        if report_progress:
+            self.kwargs["progress"] = self.report
+        self.signals = TaskSignals()
+        self._cancel_event = threading.Event()
+        self._last_report = 0.0
+
+    def cancel(self):
+        """Asks the task to stop at its next progress report."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def report(self, done, total):
+        """Progress callback for the task's function. Updates are throttled to one per frame."""
+        if done < total and self._cancel_event.is_set():
+            raise TaskCancelled()
+        now = time.monotonic()
+        if done >= total or now - self._last_report >= PROGRESS_INTERVAL:
+            self._last_report = now
+            self.signals.progress.emit(done, total)
+
+    def run(self):
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.failed.emit(e)
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            _running_tasks.discard(self)
+
+
+def get_thread_pool():
+    """Returns the thread pool the views run their operations on, created on first use."""
+    global _thread_pool
+    if _thread_pool is None:
+        _thread_pool = QThreadPool()
+    return _thread_pool
+
+
+def start_task(fn, *args, report_progress=False, **kwargs):
+    """
+    Runs `fn(*args, **kwargs)` in the background and returns its BackgroundTask.
+    Connect to `task.signals` right away; signals are only delivered once control
+    returns to the event loop, so none are missed.
+    """
+    task = BackgroundTask(fn, *args, report_progress=report_progress, **kwargs)
+    _running_tasks.add(task)
+    get_thread_pool().start(task)
+    return task
+
+
+def wait_for_tasks(msecs=-1):
+    """
+    Cancels every task and waits for the ones already running to stop, e.g. when the app closes.
+    Tasks stop at their next progress report; ones that don't report progress run to the end.
+    Returns False if tasks were still running after `msecs` (-1 waits indefinitely).
+    """
+    for task in list(_running_tasks):
+        task.cancel()
+    if _thread_pool is None:
+        return True
+    _thread_pool.clear()
+    return _thread_pool.waitForDone(msecs)
@@ -23,10 +23,12 @@ from src.ui.components.components import (
     create_separator,
 )
 from src.ui.components.file_attachment import FileAttachmentWidget
+from src.ui.components.task_progress import TaskProgress
 from src.ui.components.toast_notification import ToastNotification
 from src.ui.modals.info_modal import InfoWindow
 from src.ui.modals.schedule_modal import ScheduleModalWindow
 from src.ui.style import BLUE_BUTTON_STYLE, GRAY_BUTTON_STYLE
+from src.ui.task_runner import start_task
 from src.utils.undo_manager import undo_data_operation
 
 
@@ -46,6 +48,9 @@ class DataView(QWidget):
         self.single_file_path = None
         self.multi_file_paths = []
 
+        # Merge or mirror running in the background, if any
+        self.task = None
+
         # 1) Instantiate the toast
         self.toast = ToastNotification(self)
 
@@ -169,6 +174,10 @@ class DataView(QWidget):
         # Action Buttons (Undo / Run)
         btn_layout = QHBoxLayout()
         btn_layout.setSpacing(10)
+
+        # Progress of a running merge or mirror, with its Cancel button
+        self.task_progress = TaskProgress()
+        btn_layout.addWidget(self.task_progress, 1)
         btn_layout.addStretch()
 
         self.undo_btn = create_button("Undo", GRAY_BUTTON_STYLE)
@@ -197,7 +206,9 @@ class DataView(QWidget):
         """Opens a file dialog for selecting a master file."""
         dlg = QFileDialog(self, "Select a single CSV/Excel File", os.getcwd())
         dlg.setFileMode(QFileDialog.ExistingFile)
-        dlg.setNameFilters(["CSV Files (*.csv)", "Excel Files (*.xlsx *.xls)"])
+        dlg.setNameFilters(
+            ["CSV Files (*.csv)", "Excel Files (*.xlsx *.xls)", "Parquet/Feather Files (*.parquet *.feather)"]
+        )
         if dlg.exec_():
             selected = dlg.selectedFiles()[0]
             self.single_file_path = selected
@@ -222,7 +233,7 @@ class DataView(QWidget):
         self.merge_radio.setChecked(True)
 
     def on_run_clicked(self):
-        """Perform merge or mirror immediately, always forcing single 'Full Name' column."""
+        """Start a merge or mirror in the background, always forcing single 'Full Name' column."""
         mode = "Merge" if self.merge_radio.isChecked() else "Mirror"
         if not self.single_file_path:
             self.toast.show_message("No master file selected.", "info")
@@ -231,30 +242,35 @@ class DataView(QWidget):
             self.toast.show_message("No additional files selected.", "info")
             return
 
-        if mode == "Merge":
-            merge_data(
-                source_directory=self.single_file_path,
-                data_params={
-                    "master_file": self.single_file_path,
-                    "other_files": self.multi_file_paths,
-                    "column_map": None,
-                    "mode": "merge",
-                    "force_single_name_col": True,  # Force a single Full Name column
-                },
-            )
-        else:  # Mirror
-            mirror_data(
-                source_directory=self.single_file_path,
-                data_params={
-                    "master_file": self.single_file_path,
-                    "other_files": self.multi_file_paths,
-                    "column_map": None,
-                    "mode": "mirror",
-                    "force_single_name_col": True,  # Force single name col
-                },
-            )
-
-        self.toast.show_message(f"{mode} completed", "success")
+        data_params = {
+            "master_file": self.single_file_path,
+            "other_files": list(self.multi_file_paths),
+            "column_map": None,
+            "mode": mode.lower(),
+            "force_single_name_col": True,  # Force a single Full Name column
+        }
+        operation = merge_data if mode == "Merge" else mirror_data
+        self.task = start_task(
+            operation, source_directory=self.single_file_path, data_params=data_params, report_progress=True
+        )
+        self.task.signals.finished.connect(lambda _: self.toast.show_message(f"{mode} completed", "success"))
+        self.task.signals.failed.connect(lambda e: self.toast.show_message(f"{mode} failed: {str(e)}", "error"))
+        self.task.signals.cancelled.connect(lambda: self.toast.show_message(f"{mode} cancelled", "info"))
+        self.task.signals.finished.connect(self.on_task_done)
+        self.task.signals.failed.connect(self.on_task_done)
+        self.task.signals.cancelled.connect(self.on_task_done)
+        self.task_progress.track(self.task)
+        self.set_running(True)
+
+    def on_task_done(self, *_):
+        self.task = None
+        self.set_running(False)
+
+    def set_running(self, running):
+        """Locks the inputs and buttons while a merge or mirror is running."""
+        widgets = (self.run_btn, self.undo_btn, self.file_icon_btn, self.multi_file_area)
+        for widget in widgets + (self.merge_radio, self.mirror_radio):
+            widget.setEnabled(not running)
 
     def on_undo_clicked(self):
         """Handles the Undo button click by attempting to revert the last data operation."""
@@ -296,6 +312,7 @@ class DataView(QWidget):
             "column_map": None,
             "mode": operation_mode,
             "force_single_name_col": True,
+            "use_cache": True,  # Reuse parsed inputs across recurring runs
         }
 
         if self.scheduler_manager:
@@ -4,12 +4,15 @@ from PyQt5.QtCore import Qt
 from PyQt5.QtGui import QPixmap
 from PyQt5.QtWidgets import QHBoxLayout, QLabel, QLineEdit, QSizePolicy, QVBoxLayout, QWidget
 
-from src.automation.email_sender import is_valid_email, send_email_via_mailgun
+from src.automation.email_sender import is_valid_email, normalize_addresses
+from src.automation.email_transport import get_transport
 from src.ui.components.components import create_button, create_card, create_separator
 from src.ui.components.email_body import BodyWidget
+from src.ui.components.task_progress import TaskProgress
 from src.ui.components.toast_notification import ToastNotification
 from src.ui.modals.schedule_modal import ScheduleModalWindow
 from src.ui.style import BLUE_BUTTON_STYLE, EMAIL_INPUT_STYLE
+from src.ui.task_runner import start_task
 
 
 class EmailView(QWidget):
@@ -23,6 +26,9 @@ class EmailView(QWidget):
         self.setObjectName("EmailView")
         self.scheduler_manager = scheduler_manager
 
+        # Email being sent in the background, if any
+        self.task = None
+
         # Apply the global style for email fields
         self.setStyleSheet(EMAIL_INPUT_STYLE)
 
@@ -86,11 +92,13 @@ class EmailView(QWidget):
         fields_card_widgets.append(self.body_widget)
 
         # Group all fields into a card
-        fields_card = create_card(content_widgets=fields_card_widgets, margins=(8, 5, 8, 5), spacing=0)
-        main_layout.addWidget(fields_card)
+        self.fields_card = create_card(content_widgets=fields_card_widgets, margins=(8, 5, 8, 5), spacing=0)
+        main_layout.addWidget(self.fields_card)
 
-        # Send button
+        # Send button, with a progress indicator while sending
         btn_layout = QHBoxLayout()
+        self.task_progress = TaskProgress()
+        btn_layout.addWidget(self.task_progress, 1)
         btn_layout.addStretch()
         self.send_btn = create_button("Send", BLUE_BUTTON_STYLE)
         self.send_btn.clicked.connect(self.on_send_clicked)
@@ -106,8 +114,21 @@ class EmailView(QWidget):
         line_edit.setFixedHeight(21)
         return line_edit
 
+    def _parse_addresses(self, text):
+        """
+        Splits a comma-separated address field into clean, deduplicated addresses.
+        Shows the first malformed address and returns None if there is one.
+        """
+        addresses, invalid = normalize_addresses(text)
+        if invalid:
+            address, reason = invalid[0]
+            more = f"\n(+{len(invalid) - 1} more)" if len(invalid) > 1 else ""
+            self.toast.show_message(f"Invalid email: {address}\n{reason}{more}", "error")
+            return None
+        return addresses
+
     def on_send_clicked(self):
-        """Collect fields, send via mailgun, and clear on success."""
+        """Collect fields, send through the configured transport in the background, and clear on success."""
         to_text = self.to_input.text().strip()
         cc_text = self.cc_input.text().strip()
         subj_text = self.subj_input.text().strip()
@@ -122,29 +143,46 @@ class EmailView(QWidget):
             return
 
         # Split comma-separated emails into a list
-        to_list = [x for x in to_text.split(',') if x.strip()]
-        cc_list = [x for x in cc_text.split(',') if x.strip()]
-
-        try:
-            # Call the backend function
-            send_email_via_mailgun(
-                from_address=from_text,
-                to_addresses=to_list,
-                subject=subj_text,
-                body_text=body_text,
-                cc_addresses=cc_list,
-                attachments=attachments,
-            )
-            # Show success & clear fields
-            self.toast.show_message("Email sent", "success")
-            self.to_input.clear()
-            self.cc_input.clear()
-            self.subj_input.clear()
-            self.from_input.clear()
-            self.body_widget.clear_body()
+        to_list = self._parse_addresses(to_text)
+        cc_list = self._parse_addresses(cc_text)
+        if to_list is None or cc_list is None:
+            return
+
+        message = {
+            "from_address": from_text,
+            "to_addresses": to_list,
+            "subject": subj_text,
+            "body_text": body_text,
+            "cc_addresses": cc_list,
+            "attachments": list(attachments),
+        }
+        # The transport is looked up in the worker too, so a configuration error is reported like a failed send
+        self.task = start_task(lambda: get_transport().send_email(**message))
+        self.task.signals.finished.connect(self.on_email_sent)
+        self.task.signals.failed.connect(lambda e: self.toast.show_message(str(e), "error"))
+        self.task.signals.finished.connect(self.on_task_done)
+        self.task.signals.failed.connect(self.on_task_done)
+        # A message can't be called back once handed to the transport
+        self.task_progress.track(self.task, cancellable=False)
+        self.set_sending(True)
+
+    def on_email_sent(self, _):
+        """Show success & clear fields"""
+        self.toast.show_message("Email sent", "success")
+        self.to_input.clear()
+        self.cc_input.clear()
+        self.subj_input.clear()
+        self.from_input.clear()
+        self.body_widget.clear_body()
+
+    def on_task_done(self, *_):
+        self.task = None
+        self.set_sending(False)
 
-        except Exception as e:
-            self.toast.show_message(str(e), "error")
+    def set_sending(self, sending):
+        """Keeps the email from being edited or sent twice while it's being sent."""
+        self.fields_card.setEnabled(not sending)
+        self.send_btn.setEnabled(not sending)
 
     def open_schedule_modal(self):
         """Opens the Schedule Modal Window for setting email schedules,
@@ -162,12 +200,9 @@ class EmailView(QWidget):
             self.toast.show_message(f"Invalid email: {from_text}", "error")
             return
 
-        # Validate each email in the 'To' field (handle multiple addresses)
-        to_addresses = [addr.strip() for addr in to_text.split(',') if addr.strip()]
-        for addr in to_addresses:
-            if not is_valid_email(addr):
-                self.toast.show_message(f"Invalid email: {addr}", "error")
-                return
+        # Validate each email in the 'To' and 'Cc' fields (handle multiple addresses)
+        if self._parse_addresses(to_text) is None or self._parse_addresses(self.cc_input.text()) is None:
+            return
 
         # If validation passes, open the schedule modal
         schedule_modal = ScheduleModalWindow(self)
@@ -191,8 +226,8 @@ class EmailView(QWidget):
         # Store email parameters
         email_params = {
             "from_address": from_text,
-            "to_addresses": [x.strip() for x in to_text.split(',') if x.strip()],
-            "cc_addresses": [x.strip() for x in self.cc_input.text().split(',') if x.strip()],
+            "to_addresses": normalize_addresses(to_text)[0],
+            "cc_addresses": normalize_addresses(self.cc_input.text())[0],
             "subject": self.subj_input.text().strip(),
             "body_text": self.body_widget.get_body_text(),
             "attachments": self.body_widget.attachments,
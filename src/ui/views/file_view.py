@@ -19,12 +19,25 @@ from src.ui.components.components import (
     create_icon_button,
     create_separator,
 )
+from src.ui.components.task_progress import TaskProgress
 from src.ui.components.toast_notification import ToastNotification
 from src.ui.modals.info_modal import InfoWindow
 from src.ui.modals.schedule_modal import ScheduleModalWindow
 from src.ui.style import BLUE_BUTTON_STYLE, GRAY_BUTTON_STYLE
+from src.ui.task_runner import start_task
 from src.utils.undo_manager import undo_file_operation
 
+# Operation run for each checkbox, with the message shown once it's done
+FILE_OPERATIONS = {
+    "Sort by Type": (sort_by_type, "Files sorted by type"),
+    "Sort by Date": (sort_by_date, "Files sorted by date"),
+    "Sort by Size": (sort_by_size, "Files sorted by size"),
+    "Detect Duplicates": (detect_duplicates, "Duplicate files moved"),
+    "Rename Files": (rename_files, "Files renamed"),
+    "Compress Files": (compress_files, "Files compressed"),
+    "Backup Files": (backup_files, "Backup completed"),
+}
+
 
 class FileView(QWidget):
     def __init__(self, parent=None, scheduler_manager=None):
@@ -34,6 +47,9 @@ class FileView(QWidget):
         # Initialize the checkbox dictionary
         self.checkbox_dict = {}
 
+        # Operation running in the background, if any
+        self.task = None
+
         self.setObjectName("FileOrganizerDialog")
         self.toast = ToastNotification(self)
 
@@ -123,6 +139,10 @@ class FileView(QWidget):
         button_layout = QHBoxLayout()
         button_layout.setSpacing(10)
 
+        # Progress of a running operation, with its Cancel button
+        self.task_progress = TaskProgress()
+        button_layout.addWidget(self.task_progress, 1)
+
         # Spacer to push Undo and Run buttons to the right
         button_layout.addStretch()
 
@@ -211,48 +231,50 @@ class FileView(QWidget):
 
     def on_run_clicked(self):
         """
-        Executes the selected organization operation.
+        Starts the selected organization operation in the background.
         """
         folder_path = self.folder_input.text()  # Get the selected folder path
         if not folder_path:
             self.show_status("Select a folder", "info")
             return
 
-        try:
-            # If an operation is checked, run that operation
-            if any(checkbox.isChecked() for checkbox in self.checkboxes):
-                if self.checkbox_dict.get("Sort by Type", None) and self.checkbox_dict["Sort by Type"].isChecked():
-                    sort_by_type(folder_path)
-                    self.show_status("Files sorted by type", "success")
-                elif self.checkbox_dict.get("Sort by Date", None) and self.checkbox_dict["Sort by Date"].isChecked():
-                    sort_by_date(folder_path)
-                    self.show_status("Files sorted by date", "success")
-                elif self.checkbox_dict.get("Sort by Size", None) and self.checkbox_dict["Sort by Size"].isChecked():
-                    sort_by_size(folder_path)
-                    self.show_status("Files sorted by size", "success")
-                elif (
-                    self.checkbox_dict.get("Detect Duplicates", None)
-                    and self.checkbox_dict["Detect Duplicates"].isChecked()
-                ):
-                    detect_duplicates(folder_path)
-                    self.show_status("Duplicate files moved", "success")
-                elif self.checkbox_dict.get("Rename Files", None) and self.checkbox_dict["Rename Files"].isChecked():
-                    rename_files(folder_path)
-                    self.show_status("Files renamed", "success")
-                elif (
-                    self.checkbox_dict.get("Compress Files", None) and self.checkbox_dict["Compress Files"].isChecked()
-                ):
-                    compress_files(folder_path)
-                    self.show_status("Files compressed", "success")
-                elif self.checkbox_dict.get("Backup Files", None) and self.checkbox_dict["Backup Files"].isChecked():
-                    backup_files(folder_path)
-                    self.show_status("Backup completed", "success")
-            else:
-                self.show_status("Select an operation", "info")
-        except ValueError as e:
-            self.show_status(str(e))
-        except Exception as e:
-            self.show_status(f"An unexpected error occurred: {str(e)}", "error")
+        # Only one operation can be checked (see single_selection)
+        selected = next((label for label, checkbox in self.checkbox_dict.items() if checkbox.isChecked()), None)
+        if selected is None:
+            self.show_status("Select an operation", "info")
+            return
+
+        operation, success_message = FILE_OPERATIONS[selected]
+        self.task = start_task(operation, folder_path, report_progress=True)
+        self.task.signals.finished.connect(lambda _: self.show_status(success_message, "success"))
+        self.task.signals.failed.connect(self.on_task_failed)
+        self.task.signals.cancelled.connect(
+            lambda: self.show_status("Cancelled\nUndo reverts the changes made", "info")
+        )
+        self.task.signals.finished.connect(self.on_task_done)
+        self.task.signals.failed.connect(self.on_task_done)
+        self.task.signals.cancelled.connect(self.on_task_done)
+        self.task_progress.track(self.task)
+        self.set_running(True)
+
+    def on_task_failed(self, error):
+        """Shows why the background operation failed."""
+        if isinstance(error, ValueError):
+            self.show_status(str(error))
+        else:
+            self.show_status(f"An unexpected error occurred: {str(error)}", "error")
+
+    def on_task_done(self, *_):
+        self.task = None
+        self.set_running(False)
+
+    def set_running(self, running):
+        """Locks the buttons and options that would interfere with a running operation."""
+        self.run_btn.setEnabled(not running)
+        self.undo_btn.setEnabled(not running)
+        self.folder_icon_btn.setEnabled(not running)
+        for checkbox in self.checkboxes:
+            checkbox.setEnabled(not running)
 
     def open_schedule_modal(self):
         """
@@ -0,0 +1,132 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+
+logger = logging.getLogger(__name__)
+
+# Default location and size budget for parsed data files
+CACHE_DIR = ".data_cache"
+MAX_CACHE_BYTES = 256 * 1024 * 1024
+
+
+class FrameCache:
+    """
+    Disk cache of parsed DataFrames, keyed by file path, size and modification time.
+    Entries are stored as pickles and evicted least-recently-used once the cache
+    grows beyond `max_bytes`.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR, max_bytes: int = MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def _entry_path(self, path, options=None):
+        """
+        Returns the cache file for the current version of `path`, or None if it doesn't exist.
+        Any change to the file's size or mtime yields a new key.
+        """
+        try:
+            stat_info = os.stat(path)
+        except OSError:
+            return None
+
+        key_data = json.dumps(
+            [os.path.abspath(path), stat_info.st_size, stat_info.st_mtime_ns, options or {}],
+            sort_keys=True,
+            default=str,
+        )
+        key = hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.pkl")
+
+    def get(self, path, options=None):
+        """
+        Returns the cached DataFrame for `path`, or None on a miss.
+        Each hit returns a fresh copy, so callers may modify it in place.
+        """
+        entry = self._entry_path(path, options)
+        if not entry or not os.path.isfile(entry):
+            return None
+
+        try:
+            with open(entry, "rb") as f:
+                df = pickle.load(f)
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry for {path}: {e}")
+            self._remove(entry)
+            return None
+
+        # Mark as recently used for eviction
+        os.utime(entry)
+        return df
+
+    def put(self, path, df, options=None):
+        """
+        Stores the parsed DataFrame for `path` and evicts old entries if over budget.
+        """
+        entry = self._entry_path(path, options)
+        if not entry:
+            return
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        temp_entry = entry + ".tmp"
+        try:
+            with open(temp_entry, "wb") as f:
+                pickle.dump(df, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temp_entry, entry)
+        except Exception as e:
+            logger.warning(f"Could not cache {path}: {e}")
+            self._remove(temp_entry)
+            return
+
+        self.evict()
+
+    def load(self, path, reader, options=None):
+        """
+        Returns the cached frame for `path`, parsing it with `reader(path, **options)` on a miss.
+        """
+        df = self.get(path, options)
+        if df is None:
+            df = reader(path, **(options or {}))
+            self.put(path, df, options)
+        return df
+
+    def evict(self):
+        """
+        Removes least-recently-used entries until the cache fits within `max_bytes`.
+        """
+        if not os.path.isdir(self.cache_dir):
+            return
+
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".pkl"):
+                continue
+            entry = os.path.join(self.cache_dir, name)
+            try:
+                stat_info = os.stat(entry)
+            except OSError:
+                continue
+            entries.append((stat_info.st_mtime, stat_info.st_size, entry))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, entry in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            self._remove(entry)
+            total -= size
+
+    def clear(self):
+        """Removes every cached entry."""
+        if not os.path.isdir(self.cache_dir):
+            return
+        for name in os.listdir(self.cache_dir):
+            self._remove(os.path.join(self.cache_dir, name))
+
+    @staticmethod
+    def _remove(entry):
+        try:
+            os.remove(entry)
+        except OSError:
+            pass
@@ -0,0 +1,100 @@
+import mimetypes
+import os
+import uuid
+
+# Bytes read from an attachment at a time while the body is sent
+CHUNK_SIZE = 64 * 1024
+
+
+class MultipartEncoder:
+    """
+    Streams a multipart/form-data body without holding attachments in memory.
+
+    The body's length is computed up front from the field values and file sizes,
+    so it can be sent with a Content-Length header. Files are opened one at a time,
+    only when the upload reaches them, read in `chunk_size` pieces and closed
+    right after. Pass an instance as `data` to requests, with `content_type` as
+    the Content-Type header. A body can only be sent once; create a new encoder to retry.
+    """
+
+    def __init__(self, fields: dict, files: list, chunk_size: int = CHUNK_SIZE):
+        """
+        `fields` maps form names to a value or a list of values, `files` is a list of (form name, path).
+        """
+        self.boundary = uuid.uuid4().hex
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        self.chunk_size = chunk_size
+
+        # Each part is (headers, payload); payload is bytes, or a file path read lazily
+        self._parts = []
+        for name, value in fields.items():
+            values = value if isinstance(value, (list, tuple)) else [value]
+            for item in values:
+                if item is None:
+                    continue
+                headers = f'Content-Disposition: form-data; name="{self._quote(name)}"\r\n\r\n'
+                self._parts.append((self._part_start() + headers.encode("utf-8"), str(item).encode("utf-8")))
+
+        for name, path in files:
+            filename = os.path.basename(path)
+            content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+            headers = (
+                f'Content-Disposition: form-data; name="{self._quote(name)}"; filename="{self._quote(filename)}"\r\n'
+                f"Content-Type: {content_type}\r\n\r\n"
+            )
+            self._parts.append((self._part_start() + headers.encode("utf-8"), path))
+
+        self._closing = f"--{self.boundary}--\r\n".encode("ascii")
+        self.length = len(self._closing) + sum(
+            len(headers) + (os.path.getsize(payload) if isinstance(payload, str) else len(payload)) + 2
+            for headers, payload in self._parts
+        )
+
+        self._chunks = self._generate()
+        self._buffer = b""
+
+    def _part_start(self):
+        return f"--{self.boundary}\r\n".encode("ascii")
+
+    @staticmethod
+    def _quote(value):
+        return str(value).replace("\\", "\\\\").replace('"', "%22").replace("\r", "%0D").replace("\n", "%0A")
+
+    def _generate(self):
+        for headers, payload in self._parts:
+            yield headers
+            if isinstance(payload, str):
+                with open(payload, "rb") as f:
+                    while True:
+                        chunk = f.read(self.chunk_size)
+                        if not chunk:
+                            break
+                        yield chunk
+            else:
+                yield payload
+            yield b"\r\n"
+        yield self._closing
+
+    def __len__(self):
+        return self.length
+
+    def read(self, size: int = -1) -> bytes:
+        """Returns up to `size` bytes of the body (all remaining bytes if size is negative)."""
+        while size < 0 or len(self._buffer) < size:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                break
+            self._buffer += chunk
+
+        if size < 0:
+            data, self._buffer = self._buffer, b""
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def __iter__(self):
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
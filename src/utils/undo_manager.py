@@ -1,11 +1,27 @@
 import json
 import os
 import shutil
+import threading
 import zipfile
 
 # Define a log file for storing information about data operations
 LOG_FILE = "operation_log.json"
 
+# Serializes writes to the log from operations running on different threads, e.g. jobs on different folders
+_log_lock = threading.Lock()
+
+
+def write_operation_log(log_data):
+    """
+    Replaces the operation log with `log_data`, so Undo reverts that operation.
+    The file is replaced atomically, so concurrent writers never leave a torn log; the last one wins.
+    """
+    temp_path = f"{LOG_FILE}.{os.getpid()}.tmp"
+    with _log_lock:
+        with open(temp_path, "w") as log_f:
+            json.dump(log_data, log_f)
+        os.replace(temp_path, LOG_FILE)
+
 
 def log_operation(operation, master_file, backup_info):
     """
@@ -19,8 +35,7 @@ def log_operation(operation, master_file, backup_info):
         "backup_file": backup_info if operation == "merge_data" else None,
         "backups": backup_info if operation == "mirror_data" else None,
     }
-    with open(LOG_FILE, "w") as log_f:
-        json.dump(log_data, log_f)
+    write_operation_log(log_data)
 
 
 def undo_file_operation():
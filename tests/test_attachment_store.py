@@ -0,0 +1,80 @@
+import os
+
+import pytest
+
+from src.automation.scheduler import attachment_store
+from src.automation.scheduler.attachment_store import AttachmentStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    """
+    An AttachmentStore inside the temporary directory.
+    """
+    s = AttachmentStore(str(tmp_path / "scheduled_attachments"))
+    yield s
+    s.close()
+
+
+def content_dirs(store):
+    return [name for name in os.listdir(store.root) if attachment_store.DIGEST_PATTERN.match(name)]
+
+
+def test_same_content_is_stored_once(store, tmp_path):
+    """
+    Jobs attaching the same file share one stored copy; another name for the same content
+    is kept next to it without a second copy.
+    """
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"%PDF quarterly numbers")
+    renamed = tmp_path / "summary.pdf"
+    renamed.write_bytes(b"%PDF quarterly numbers")
+
+    first = store.store("job_1", [str(report)])
+    second = store.store("job_2", [str(report), str(tmp_path / "missing.pdf")])
+    third = store.store("job_3", [str(renamed)])
+
+    assert first == second
+    assert os.path.basename(first[0]) == "report.pdf"
+    assert os.path.basename(third[0]) == "summary.pdf"
+    assert len(content_dirs(store)) == 1
+    assert store.references(store.digest(first[0])) == {"job_1", "job_2", "job_3"}
+
+
+def test_content_is_collected_with_its_last_reference(store, tmp_path):
+    """
+    Stored content stays until the last job using it lets go, including when a job's attachments change.
+    """
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"v1")
+    notes = tmp_path / "notes.txt"
+    notes.write_bytes(b"notes")
+
+    (stored_report,) = store.store("job_1", [str(report)])
+    store.store("job_2", [str(report)])
+
+    store.release("job_1")
+    assert os.path.isfile(stored_report)
+
+    # job_2 now attaches something else
+    store.store("job_2", [str(notes)])
+    assert not os.path.exists(stored_report)
+    assert len(content_dirs(store)) == 1
+
+
+def test_unchanged_files_are_not_hashed_again(store, tmp_path, mocker):
+    """
+    Hashes are cached by path, size and modification time.
+    """
+    report = tmp_path / "report.pdf"
+    report.write_bytes(b"v1")
+    hash_file = mocker.spy(attachment_store, "hash_file")
+
+    store.store("job_1", [str(report)])
+    store.store("job_2", [str(report)])
+    assert hash_file.call_count == 1
+
+    report.write_bytes(b"version 2")
+    store.store("job_3", [str(report)])
+    assert hash_file.call_count == 2
+    assert len(content_dirs(store)) == 2
@@ -0,0 +1,151 @@
+import multiprocessing
+import time
+
+from src.automation.scheduler.coordination import CLAIM_BACKOFF_SECONDS, WorkerCoordinator
+from src.automation.scheduler.scheduler_manager import NOT_CLAIMED, SchedulerManager
+
+
+def claim_all(db_path, worker_id, run_keys, results):
+    """
+    Worker process body: tries to claim every run and reports the ones it won.
+    """
+    coordinator = WorkerCoordinator(db_path, worker_id=worker_id)
+    won = [key for key in run_keys if coordinator.claim_run(key, key)]
+    coordinator.close()
+    results.put((worker_id, won))
+
+
+def test_each_run_claimed_once(tmp_path):
+    """
+    Only the first worker to claim a run gets it.
+    """
+    db_path = str(tmp_path / "workers.db")
+    first = WorkerCoordinator(db_path, worker_id="a")
+    second = WorkerCoordinator(db_path, worker_id="b")
+
+    assert first.claim_run("job1:2024-01-01T02:00", "job1") is True
+    assert second.claim_run("job1:2024-01-01T02:00", "job1") is False
+    assert second.claim_run("job1:2024-01-02T02:00", "job1") is True
+    assert first.claimed_by("job1:2024-01-02T02:00") == "b"
+
+    first.close()
+    second.close()
+
+
+def test_claims_across_processes(tmp_path):
+    """
+    Workers racing in separate processes split the runs between them, each run exactly once.
+    """
+    db_path = str(tmp_path / "workers.db")
+    WorkerCoordinator(db_path).close()  # Create the schema up front
+    run_keys = [f"job{i}:2024-01-01T02:00" for i in range(50)]
+
+    results = multiprocessing.Queue()
+    workers = [
+        multiprocessing.Process(target=claim_all, args=(db_path, f"worker-{i}", run_keys, results)) for i in range(4)
+    ]
+    for worker in workers:
+        worker.start()
+    won = dict(results.get(timeout=30) for _ in workers)
+    for worker in workers:
+        worker.join(30)
+
+    claimed = [key for keys in won.values() for key in keys]
+    assert sorted(claimed) == sorted(run_keys)
+
+
+def test_leader_lease_fails_over(tmp_path):
+    """
+    One worker holds the leader lease; another takes over once it expires or is released.
+    """
+    db_path = str(tmp_path / "workers.db")
+    first = WorkerCoordinator(db_path, worker_id="a", lease_seconds=0.2)
+    second = WorkerCoordinator(db_path, worker_id="b", lease_seconds=0.2)
+
+    assert first.acquire_leadership() is True
+    assert first.acquire_leadership() is True  # Renewal
+    assert second.acquire_leadership() is False
+
+    time.sleep(0.3)
+    assert second.acquire_leadership() is True
+
+    second.release()
+    assert first.acquire_leadership() is True
+
+    first.close()
+    second.close()
+
+
+def test_busy_workers_wait_before_claiming(tmp_path):
+    """
+    A worker running more jobs than the least loaded one backs off before claiming.
+    """
+    db_path = str(tmp_path / "workers.db")
+    busy = WorkerCoordinator(db_path, worker_id="busy")
+    idle = WorkerCoordinator(db_path, worker_id="idle")
+    busy.heartbeat(active_jobs=3)
+    idle.heartbeat(active_jobs=1)
+
+    assert busy.claim_delay(3) == 2 * CLAIM_BACKOFF_SECONDS
+    assert idle.claim_delay(1) == 0
+    assert set(idle.live_workers()) == {"busy", "idle"}
+
+    busy.close()
+    idle.close()
+
+
+def test_slots_are_counted_across_workers(tmp_path):
+    """
+    Slots on a resource are shared by all workers, taken all or none, and expire with a dead worker's lease.
+    """
+    db_path = str(tmp_path / "workers.db")
+    first = WorkerCoordinator(db_path, worker_id="a", lease_seconds=0.2)
+    second = WorkerCoordinator(db_path, worker_id="b", lease_seconds=0.2)
+
+    assert first.acquire_slots("a:1", ["disk1"], limit=2) is True
+    assert second.acquire_slots("b:1", ["disk1"], limit=2) is True
+    assert second.acquire_slots("b:2", ["disk2", "disk1"], limit=2) is False
+    assert second.acquire_slots("b:2", ["disk2"], limit=2) is True  # Nothing of the failed attempt was kept
+
+    second.release_slots("b:1")
+    assert first.acquire_slots("a:2", ["disk1"], limit=2) is True
+
+    # Without heartbeats renewing them, a worker's slots expire with its lease
+    time.sleep(0.3)
+    assert second.acquire_slots("b:3", ["disk1"], limit=1) is True
+
+    first.close()
+    second.close()
+
+
+def test_managers_sharing_jobs_run_each_job_once(tmp_path, mocker):
+    """
+    Two workers scheduling the same job: the task runs on one, the other skips it.
+    """
+    calls = []
+    mocker.patch.dict(
+        "src.automation.scheduler.scheduler_manager.TASK_FUNCTIONS",
+        {"sort_by_type": lambda source_directory: calls.append(source_directory)},
+    )
+
+    jobs_file = str(tmp_path / "jobs.json")
+    db_path = str(tmp_path / "workers.db")
+    first = SchedulerManager(
+        jobs_file=jobs_file, start_scheduler=False, coordinator=WorkerCoordinator(db_path, worker_id="a")
+    )
+    job_id = first.add_scheduled_job(
+        task_type="sort_by_type", folder_target=str(tmp_path), run_time="02:00", recurring_days=["Monday"]
+    )
+    second = SchedulerManager(
+        jobs_file=jobs_file, start_scheduler=False, coordinator=WorkerCoordinator(db_path, worker_id="b")
+    )
+
+    try:
+        kwargs = {"source_directory": str(tmp_path)}
+        assert first._run_key(job_id) == second._run_key(job_id)
+        assert first._run_task(job_id, "sort_by_type", 0, **kwargs) is None
+        assert second._run_task(job_id, "sort_by_type", 0, **kwargs) is NOT_CLAIMED
+        assert calls == [str(tmp_path)]
+    finally:
+        first.shutdown()
+        second.shutdown()
@@ -5,8 +5,10 @@ from src.automation.data_entry import (
     combine_first_last_into_full,
     merge_data,
     mirror_data,
+    read_csv_or_excel,
     split_full_into_first_last,
     unify_column_name,
+    write_csv_or_excel,
 )
 from src.utils.undo_manager import undo_data_operation
 
@@ -181,3 +183,292 @@ def test_undo_data_operation(data_temp_dir):
     undone_df = pd.read_csv(master_file)
     assert len(undone_df) == 1
     assert undone_df.loc[0, "First Name"] == "Alice"
+
+
+def test_read_xlsx_streaming_matches_pandas(data_temp_dir):
+    """
+    The streaming openpyxl reader should return the same frame as pandas' default Excel reader.
+    """
+    path = data_temp_dir / "people.xlsx"
+    pd.DataFrame({
+        "Full Name": ["Alice Smith", "Bob Johnson", None],
+        "Age": [30, None, 41],
+        "Score": [1.5, 2.25, 3.0],
+    }).to_excel(path, index=False)
+
+    assert read_csv_or_excel(str(path)).equals(pd.read_excel(path))
+
+
+def test_read_with_inferred_dtypes_and_usecols(data_temp_dir):
+    """
+    Identifier-like columns keep their leading zeros, and usecols accepts unified names.
+    """
+    path = data_temp_dir / "contacts.csv"
+    path.write_text("Full Name,Zip Code,Notes\nAlice Smith,01234,VIP\nBob Johnson,00501,\n")
+
+    df = read_csv_or_excel(str(path), usecols=["full_name", "postal_code"], dtype="infer")
+
+    assert df.columns.tolist() == ["Full Name", "Zip Code"]
+    assert df["Zip Code"].tolist() == ["01234", "00501"]
+
+
+def test_pyarrow_reader_matches_c_parser(data_temp_dir):
+    """
+    Integers too big for int64 stay exact and empty columns stay float NaN with the pyarrow reader.
+    """
+    pytest.importorskip("pyarrow")
+    path = data_temp_dir / "accounts.csv"
+    path.write_text("Account,Full Name,Notes,Balance\n12345678901234567890,Alice Smith,,1.5\n5,Bob Johnson,,\n")
+
+    df = read_csv_or_excel(str(path), engine="pyarrow")
+    expected = pd.read_csv(path)
+
+    assert df["Account"].tolist() == [12345678901234567890, 5]
+    assert df["Notes"].dtype == "float64"
+    pd.testing.assert_frame_equal(df, expected)
+
+
+def test_merge_data_keeps_large_integers(data_temp_dir):
+    """
+    Merging doesn't rewrite long account numbers in scientific notation.
+    """
+    master_file = data_temp_dir / "master.csv"
+    other_file = data_temp_dir / "other.csv"
+    master_file.write_text("Account,Full Name\n12345678901234567890,Alice Smith\n")
+    other_file.write_text("Account,Full Name\n98765432109876543210,Bob Johnson\n")
+
+    merge_data(
+        source_directory=str(data_temp_dir),
+        data_params={"master_file": str(master_file), "other_files": [str(other_file)]},
+    )
+
+    text = master_file.read_text()
+    assert "12345678901234567890" in text
+    assert "98765432109876543210" in text
+
+
+def test_parquet_round_trip(data_temp_dir):
+    """
+    Parquet files can be used as masters, including columns mixing numbers and blanks.
+    """
+    pytest.importorskip("pyarrow")
+    path = data_temp_dir / "master.parquet"
+    df = pd.DataFrame({"Full Name": ["Alice Smith", "Bob Johnson"], "Age": [30, ""]})
+
+    write_csv_or_excel(df, str(path))
+    loaded = read_csv_or_excel(str(path))
+
+    assert loaded["Full Name"].tolist() == ["Alice Smith", "Bob Johnson"]
+    assert loaded["Age"].tolist() == ["30", ""]
+
+
+def test_mirror_data_incremental(data_temp_dir):
+    """
+    Incremental mirroring appends only new master rows, and skips targets already in sync.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({
+        "Full Name": ["Eve Brown", "Frank Green"],
+        "Email": ["eve@example.com", "frank@example.com"]
+    }).to_csv(master_file, index=False)
+
+    target_file = data_temp_dir / "target.csv"
+    pd.DataFrame({
+        "First Name": ["Eve"],
+        "Last Name": ["Brown"],
+        "Email": ["eve@example.com"]
+    }).to_csv(target_file, index=False)
+
+    data_params = {
+        "master_file": str(master_file),
+        "other_files": [str(target_file)],
+        "incremental": True,
+    }
+
+    mirror_data(source_directory=str(data_temp_dir), data_params=data_params)
+
+    # Only Frank was appended; Eve was already there
+    updated_target_df = pd.read_csv(target_file)
+    assert updated_target_df["First Name"].tolist() == ["Eve", "Frank"]
+    assert updated_target_df["Last Name"].tolist() == ["Brown", "Green"]
+
+    # A second run with nothing changed leaves the target untouched
+    mtime_before = target_file.stat().st_mtime_ns
+    mirror_data(source_directory=str(data_temp_dir), data_params=data_params)
+    assert target_file.stat().st_mtime_ns == mtime_before
+
+    # A new master row is appended on the next run
+    pd.DataFrame({
+        "Full Name": ["Eve Brown", "Frank Green", "Gina White"],
+        "Email": ["eve@example.com", "frank@example.com", "gina@example.com"]
+    }).to_csv(master_file, index=False)
+    mirror_data(source_directory=str(data_temp_dir), data_params=data_params)
+
+    updated_target_df = pd.read_csv(target_file)
+    assert updated_target_df["First Name"].tolist() == ["Eve", "Frank", "Gina"]
+    undo_data_operation()
+
+
+def test_mirror_data_parallel(data_temp_dir):
+    """
+    Parallel mirroring writes the same targets as sequential mirroring and reports per-target timings.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({
+        "Full Name": ["Eve Brown", "Frank Green"],
+        "Email": ["eve@example.com", "frank@example.com"]
+    }).to_csv(master_file, index=False)
+
+    targets = []
+    for i in range(3):
+        target_file = data_temp_dir / f"target{i}.csv"
+        pd.DataFrame({"First Name": [], "Last Name": [], "Email": []}).to_csv(target_file, index=False)
+        targets.append(str(target_file))
+
+    timings = mirror_data(
+        source_directory=str(data_temp_dir),
+        data_params={
+            "master_file": str(master_file),
+            "other_files": targets,
+            "parallel": True,
+            "max_workers": 2,
+        }
+    )
+
+    assert set(timings) == set(targets)
+    for target in targets:
+        updated_target_df = pd.read_csv(target)
+        assert updated_target_df["First Name"].tolist() == ["Eve", "Frank"]
+        assert updated_target_df["Last Name"].tolist() == ["Brown", "Green"]
+    undo_data_operation()
+
+
+def test_merge_data_parallel(data_temp_dir):
+    """
+    Parallel merging loads every file in worker processes and aligns new columns to a union schema.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({"Full Name": ["Carol Adams"]}).to_csv(master_file, index=False)
+
+    other_files = []
+    for i, extra_col in enumerate(["Email", "Phone", "Email"]):
+        other_file = data_temp_dir / f"month{i}.csv"
+        pd.DataFrame({
+            "First Name": [f"Person{i}"],
+            "Last Name": ["Williams"],
+            extra_col: [f"value{i}"]
+        }).to_csv(other_file, index=False)
+        other_files.append(str(other_file))
+
+    merge_data(
+        source_directory=str(data_temp_dir),
+        data_params={
+            "master_file": str(master_file),
+            "other_files": other_files,
+            "force_single_name_col": True,
+            "parallel": True,
+            "max_workers": 2,
+        }
+    )
+
+    merged_df = pd.read_csv(master_file, keep_default_na=False)
+    assert merged_df.columns.tolist() == ["Full Name", "Email", "Phone"]
+    assert merged_df["Full Name"].tolist() == [
+        "Carol Adams", "Person0 Williams", "Person1 Williams", "Person2 Williams"
+    ]
+    assert merged_df["Email"].tolist() == ["", "value0", "", "value2"]
+    undo_data_operation()
+
+
+def test_merge_data_cancelled_leaves_master(data_temp_dir):
+    """
+    Merging reports progress per input file; raising from the callback cancels before the master is written.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({"Full Name": ["Alice Smith"]}).to_csv(master_file, index=False)
+    other_files = []
+    for i in range(3):
+        other_file = data_temp_dir / f"other_{i}.csv"
+        pd.DataFrame({"Full Name": [f"Person {i}"]}).to_csv(other_file, index=False)
+        other_files.append(str(other_file))
+    data_params = {"master_file": str(master_file), "other_files": other_files, "force_single_name_col": True}
+
+    reports = []
+    merge_data(str(data_temp_dir), data_params, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)]
+
+    pd.DataFrame({"Full Name": ["Alice Smith"]}).to_csv(master_file, index=False)
+
+    def cancel_after_first(done, total):
+        if done == 1:
+            raise InterruptedError("cancelled")
+
+    with pytest.raises(InterruptedError):
+        merge_data(str(data_temp_dir), data_params, progress=cancel_after_first)
+    assert len(pd.read_csv(master_file)) == 1
+
+
+def test_parallel_merge_reports_progress_and_cancels(data_temp_dir):
+    """
+    Parallel merging reports progress as each input is loaded, and cancelling leaves the master untouched.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({"Full Name": ["Alice Smith"]}).to_csv(master_file, index=False)
+    other_files = []
+    for i in range(3):
+        other_file = data_temp_dir / f"other_{i}.csv"
+        pd.DataFrame({"Full Name": [f"Person {i}"]}).to_csv(other_file, index=False)
+        other_files.append(str(other_file))
+    data_params = {
+        "master_file": str(master_file),
+        "other_files": other_files,
+        "force_single_name_col": True,
+        "parallel": True,
+        "max_workers": 2,
+    }
+
+    reports = []
+    merge_data(str(data_temp_dir), data_params, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)]
+    # Inputs are merged in their given order, whichever worker finishes first
+    assert pd.read_csv(master_file)["Full Name"].tolist() == ["Alice Smith", "Person 0", "Person 1", "Person 2"]
+
+    pd.DataFrame({"Full Name": ["Alice Smith"]}).to_csv(master_file, index=False)
+
+    def cancel_after_first(done, total):
+        if done == 1:
+            raise InterruptedError("cancelled")
+
+    with pytest.raises(InterruptedError):
+        merge_data(str(data_temp_dir), data_params, progress=cancel_after_first)
+    assert len(pd.read_csv(master_file)) == 1
+
+
+def test_parallel_mirror_reports_progress_and_cancels(data_temp_dir):
+    """
+    Parallel mirroring reports progress as each target finishes; raising from the callback stops the mirror.
+    """
+    master_file = data_temp_dir / "master.csv"
+    pd.DataFrame({"Full Name": ["Eve Brown"], "Email": ["eve@example.com"]}).to_csv(master_file, index=False)
+    targets = []
+    for i in range(3):
+        target_file = data_temp_dir / f"target{i}.csv"
+        pd.DataFrame({"First Name": [], "Last Name": [], "Email": []}).to_csv(target_file, index=False)
+        targets.append(str(target_file))
+    data_params = {"master_file": str(master_file), "other_files": targets, "parallel": True, "max_workers": 2}
+
+    reports = []
+    mirror_data(str(data_temp_dir), data_params, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(0, 3), (1, 3), (2, 3), (3, 3)]
+
+    reports = []
+
+    def cancel_after_first(done, total):
+        reports.append((done, total))
+        if done == 1:
+            raise InterruptedError("cancelled")
+
+    with pytest.raises(InterruptedError):
+        mirror_data(str(data_temp_dir), data_params, progress=cancel_after_first)
+    assert reports == [(0, 3), (1, 3)]
+    undo_data_operation()
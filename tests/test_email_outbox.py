@@ -0,0 +1,135 @@
+import os
+import smtplib
+
+import pytest
+
+from src.automation import email_outbox
+from src.automation.email_outbox import EmailOutbox, OutboxSender, is_permanent_failure, queue_email
+from src.automation.email_sender import InvalidAddressError, MailgunError
+
+
+def make_message(to="recipient@example.com", attachments=None):
+    """Builds the keyword arguments of one email."""
+    return {
+        "from_address": "sender@example.com",
+        "to_addresses": [to],
+        "subject": "Report",
+        "body_text": "See attached.",
+        "attachments": attachments,
+    }
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    """
+    An outbox spooled inside the temporary directory.
+    """
+    box = EmailOutbox(str(tmp_path / "outbox.db"), attachments_dir=str(tmp_path / "spool"))
+    yield box
+    box.close()
+
+
+def test_messages_sent_in_batches(outbox, tmp_path):
+    """
+    Queued messages are sent by the sender, and spooled attachments removed once sent.
+    """
+    attachment = tmp_path / "report.csv"
+    attachment.write_text("a,b\n1,2\n")
+
+    ids = [outbox.enqueue(make_message(f"user{i}@example.com", [str(attachment)])) for i in range(5)]
+    attachment.unlink()  # The outbox keeps its own copy
+
+    sent = []
+
+    def fake_send(**message):
+        assert all(os.path.isfile(path) for path in message["attachments"])
+        sent.append(message["to_addresses"][0])
+        return {"id": f"<{message['to_addresses'][0]}>"}
+
+    sender = OutboxSender(outbox, send=fake_send, batch_size=2)
+    assert [sender.drain_once() for _ in range(4)] == [2, 2, 1, 0]
+
+    assert sorted(sent) == sorted(f"user{i}@example.com" for i in range(5))
+    assert outbox.counts() == {"sent": 5}
+    assert outbox.get(ids[0])["mailgun_id"] == "<user0@example.com>"
+    assert os.listdir(tmp_path / "spool") == []
+
+
+def test_transient_failures_retry_then_dead_letter(outbox, monkeypatch):
+    """
+    Outages are retried with backoff until attempts run out; then the message is dead-lettered.
+    """
+    monkeypatch.setattr(email_outbox, "MAX_ATTEMPTS", 3)
+    message_id = outbox.enqueue(make_message())
+
+    def failing_send(**message):
+        raise MailgunError("Service unavailable", 503)
+
+    sender = OutboxSender(outbox, send=failing_send)
+    assert sender.drain_once() == 1
+    record = outbox.get(message_id)
+    assert (record["status"], record["attempts"]) == ("pending", 1)
+    assert sender.drain_once() == 0  # Not due until the backoff passes
+
+    for attempt in (2, 3):
+        outbox._connection.execute("UPDATE messages SET next_attempt_at = 0 WHERE id = ?", (message_id,))
+        sender.drain_once()
+
+    assert outbox.get(message_id)["status"] == "dead"
+    assert outbox.dead_letters()[0]["error"] == "Service unavailable"
+
+    # A dead letter can be requeued once the outage is over
+    assert outbox.requeue(message_id) is True
+    sender.send = lambda **message: {"id": "<ok>"}
+    sender.drain_once()
+    assert outbox.get(message_id)["status"] == "sent"
+
+
+def test_permanent_failures_dead_letter_immediately(outbox):
+    """
+    Messages Mailgun rejects outright are not retried.
+    """
+    message_id = outbox.enqueue(make_message())
+
+    def rejecting_send(**message):
+        raise MailgunError("'to' parameter is not a valid address", 400)
+
+    OutboxSender(outbox, send=rejecting_send).drain_once()
+    record = outbox.get(message_id)
+    assert (record["status"], record["attempts"]) == ("dead", 1)
+
+
+def test_refused_recipients_are_permanent_only_when_all_rejected():
+    """
+    SMTP recipient refusals dead-letter a message only when every code is permanent (5xx).
+    """
+    rejected = smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user"), "b@example.com": (553, b"")})
+    greylisted = smtplib.SMTPRecipientsRefused({"a@example.com": (550, b"No such user"), "b@example.com": (450, b"")})
+
+    assert is_permanent_failure(rejected) is True
+    assert is_permanent_failure(greylisted) is False
+
+
+def test_stale_claims_are_retried(outbox, monkeypatch):
+    """
+    A message claimed by a sender that died is picked up again after the lease.
+    """
+    message_id = outbox.enqueue(make_message())
+    assert len(outbox.claim_batch()) == 1
+    assert outbox.claim_batch() == []
+
+    monkeypatch.setattr(email_outbox, "SENDING_LEASE", -1)
+    assert [item[0] for item in outbox.claim_batch()] == [message_id]
+
+
+def test_queue_email_validates_and_enqueues(outbox, monkeypatch):
+    """
+    queue_email rejects malformed addresses right away and queues the rest.
+    """
+    monkeypatch.setattr(email_outbox, "_outbox", outbox)
+
+    with pytest.raises(InvalidAddressError):
+        queue_email("sender@example.com", ["not-an-address"], "Hi", "Body")
+
+    message_id = queue_email("sender@example.com", ["recipient@example.com"], "Hi", "Body")
+    assert outbox.get(message_id)["status"] == "pending"
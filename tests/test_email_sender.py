@@ -1,13 +1,32 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
 import os
+import socket
+import threading
+import time
+from urllib.parse import parse_qs
 
 import pytest
+import requests
 
-from src.automation.email_sender import send_email_via_mailgun
+from src.automation import email_sender
+from src.automation.email_sender import (
+    AttachmentTooLargeError,
+    RateLimiter,
+    chunk_recipients,
+    get_http_session,
+    normalize_addresses,
+    render_template,
+    retry_delay,
+    send_bulk_emails,
+    send_email_via_mailgun,
+)
 
 '''
-Pytest's monkeypatch is used to override the requests.post method with fake implementations
+Pytest's monkeypatch is used to override the shared session's post method with fake implementations
 (fake_post_success and fake_post_failure). This prevents real API calls from being made during
 tests and allows controlled responses for verifying different scenarios.
+The retry tests instead run against a local stub HTTP server.
 '''
 
 
@@ -25,9 +44,9 @@ class FakeResponse:
         return self._json  # Simulate requests.Response.json()
 
 
-def fake_post_success(url, auth, data, files=None):
+def fake_post_success(url, auth, data, files=None, timeout=None):
     """
-    Mock requests.post function to simulate a successful Mailgun API response.
+    Mock session.post function to simulate a successful Mailgun API response.
     """
     return FakeResponse(
         status_code=200,
@@ -35,9 +54,9 @@ def fake_post_success(url, auth, data, files=None):
     )
 
 
-def fake_post_failure(url, auth, data, files=None):
+def fake_post_failure(url, auth, data, files=None, timeout=None):
     """
-    Mock requests.post function to simulate a failed Mailgun API response.
+    Mock session.post function to simulate a failed Mailgun API response.
     """
     return FakeResponse(
         status_code=400,
@@ -61,10 +80,10 @@ def teardown_env():
 def test_send_email_success(monkeypatch):
     """
     Test case for a successful email send.
-    Uses monkeypatch to replace requests.post with a mock success response.
+    Uses monkeypatch to replace the session's post with a mock success response.
     """
     setup_env()
-    monkeypatch.setattr("requests.post", fake_post_success)  # Patch requests.post
+    monkeypatch.setattr(get_http_session(), "post", fake_post_success)  # Patch session.post
 
     response = send_email_via_mailgun(
         from_address="sender@example.com",
@@ -99,10 +118,10 @@ def test_missing_credentials():
 def test_send_email_failure(monkeypatch):
     """
     Test case for an email send failure.
-    Uses monkeypatch to replace requests.post with a mock failure response.
+    Uses monkeypatch to replace the session's post with a mock failure response.
     """
     setup_env()
-    monkeypatch.setattr("requests.post", fake_post_failure)  # Patch requests.post
+    monkeypatch.setattr(get_http_session(), "post", fake_post_failure)  # Patch session.post
     with pytest.raises(Exception) as exc_info:
         send_email_via_mailgun(
             from_address="sender@example.com",
@@ -113,3 +132,273 @@ def test_send_email_failure(monkeypatch):
     # Update the assertion to check for the new error message format
     assert "Mailgun error" in str(exc_info.value) or "Bad Request" in str(exc_info.value)
     teardown_env()
+
+
+class StubMailgunHandler(BaseHTTPRequestHandler):
+    """
+    Replies to each POST with the next scripted (status, headers) pair, then 200.
+    """
+
+    protocol_version = "HTTP/1.1"  # Keep connections alive like the real API
+
+    def do_POST(self):
+        payload = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        server = self.server
+        server.requests.append((self.path, self.client_address[1]))
+        server.payloads.append(payload)
+        status, headers = server.script.pop(0) if server.script else (200, {})
+        body = b'{"message": "Queued. Thank you."}' if status == 200 else b'{"message": "Slow down"}'
+
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass  # Keep test output quiet
+
+
+@pytest.fixture
+def stub_server(monkeypatch):
+    """
+    A local HTTP server standing in for the Mailgun API.
+    """
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubMailgunHandler)
+    server.script = []
+    server.requests = []
+    server.payloads = []
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    setup_env()
+    monkeypatch.setenv("MAILGUN_API_URL", f"http://127.0.0.1:{server.server_address[1]}/v3")
+    yield server
+
+    teardown_env()
+    server.shutdown()
+    server.server_close()
+
+
+def send_test_email(**kwargs):
+    return send_email_via_mailgun(
+        from_address="sender@example.com",
+        to_addresses=["recipient@example.com"],
+        subject="Test Subject",
+        body_text="This is a test email.",
+        **kwargs,
+    )
+
+
+def test_retries_honor_retry_after(stub_server, monkeypatch, tmp_path):
+    """
+    Rate-limited and failed requests are retried, waiting as long as Retry-After asks,
+    and attachments are re-sent in full.
+    """
+    delays = []
+    monkeypatch.setattr(email_sender.time, "sleep", delays.append)
+    stub_server.script = [(429, {"Retry-After": "3"}), (503, {})]
+
+    attachment = tmp_path / "report.txt"
+    attachment.write_text("quarterly numbers")
+    response = send_test_email(attachments=[str(attachment)])
+
+    assert response["message"] == "Queued. Thank you."
+    assert [path for path, _ in stub_server.requests] == ["/v3/fake-domain.com/messages"] * 3
+    assert delays[0] == 3
+    assert 0 <= delays[1] <= email_sender.RETRY_BACKOFF_BASE * 2
+    assert all(b"quarterly numbers" in payload for payload in stub_server.payloads)
+
+
+def test_oversized_attachments_are_rejected_before_upload(stub_server, monkeypatch, tmp_path):
+    """
+    Attachments over the size limit fail fast, without a request to Mailgun.
+    """
+    monkeypatch.setattr(email_sender, "MAX_ATTACHMENT_BYTES", 1024)
+    attachment = tmp_path / "scan.pdf"
+    attachment.write_bytes(b"x" * 2048)
+
+    with pytest.raises(AttachmentTooLargeError):
+        send_test_email(attachments=[str(attachment)])
+    assert stub_server.requests == []
+
+
+def test_gives_up_after_max_retries(stub_server, monkeypatch):
+    """
+    Once retries run out, the last error response is reported.
+    """
+    monkeypatch.setattr(email_sender.time, "sleep", lambda seconds: None)
+    monkeypatch.setattr(email_sender, "MAX_RETRIES", 2)
+    stub_server.script = [(503, {})] * 5
+
+    with pytest.raises(Exception, match="Slow down"):
+        send_test_email()
+    assert len(stub_server.requests) == 3
+
+
+def test_failures_after_sending_are_not_retried(stub_server, monkeypatch):
+    """
+    Errors that may come after the message was queued aren't retried, so it's never sent twice.
+    """
+    monkeypatch.setattr(email_sender.time, "sleep", lambda seconds: None)
+    stub_server.script = [(500, {})] * 2
+    with pytest.raises(Exception, match="Slow down"):
+        send_test_email()
+    assert len(stub_server.requests) == 1
+
+    calls = []
+
+    def read_timeout(*args, **kwargs):
+        calls.append(args)
+        raise requests.ReadTimeout("no reply")
+
+    monkeypatch.setattr(get_http_session(), "post", read_timeout)
+    with pytest.raises(requests.ReadTimeout):
+        send_test_email()
+    assert len(calls) == 1
+
+
+def test_refused_connections_are_retried(monkeypatch):
+    """
+    A connection that couldn't be opened sent nothing, so it's retried.
+    """
+    delays = []
+    monkeypatch.setattr(email_sender.time, "sleep", delays.append)
+    monkeypatch.setattr(email_sender, "MAX_RETRIES", 2)
+    closed = socket.socket()
+    closed.bind(("127.0.0.1", 0))
+    port = closed.getsockname()[1]
+    closed.close()
+
+    setup_env()
+    monkeypatch.setenv("MAILGUN_API_URL", f"http://127.0.0.1:{port}/v3")
+    try:
+        with pytest.raises(requests.ConnectionError):
+            send_test_email()
+    finally:
+        teardown_env()
+    assert len(delays) == 2
+
+
+def test_connections_are_reused(stub_server):
+    """
+    Consecutive sends go over the same kept-alive connection.
+    """
+    for _ in range(3):
+        send_test_email()
+
+    client_ports = {port for _, port in stub_server.requests}
+    assert len(stub_server.requests) == 3
+    assert len(client_ports) == 1
+
+
+def test_retry_delay_caps_and_jitter():
+    """
+    Retry-After is capped; without it the delay is jittered exponential backoff.
+    """
+
+    class Response:
+        headers = {"Retry-After": "100000"}
+
+    assert retry_delay(1, Response()) == email_sender.MAX_RETRY_AFTER
+    for attempt in range(1, 10):
+        assert 0 <= retry_delay(attempt) <= email_sender.RETRY_BACKOFF_MAX
+
+
+def test_render_template():
+    """
+    Known placeholders are filled in; unknown ones and stray braces are kept.
+    """
+    assert render_template("Hi {first_name}, {missing} {", {"first_name": "Ann"}) == "Hi Ann, {missing} {"
+
+
+def test_bulk_send_personalizes_and_reports_each_message(stub_server):
+    """
+    Each recipient gets their own message, all in one batch request; invalid addresses fail
+    and repeated ones are skipped without stopping the rest.
+    """
+    recipients = [{"email": f"user{i}@example.com", "first_name": f"User{i}"} for i in range(20)]
+    recipients.append({"email": "not-an-address", "first_name": "Nobody"})
+    recipients.append({"email": " USER0@example.com ", "first_name": "Again"})
+
+    results = send_bulk_emails(
+        from_address="sender@example.com",
+        recipients=recipients,
+        subject="Hello {first_name}",
+        body_text="Dear {first_name},\nNews inside.",
+        max_concurrency=4,
+    )
+
+    assert [r["to"] for r in results] == [[r["email"].strip()] for r in recipients]
+    assert [r["status"] for r in results] == ["sent"] * 20 + ["failed", "skipped"]
+    assert "Invalid email" in results[-2]["error"]
+
+    (payload,) = [parse_qs(p.decode()) for p in stub_server.payloads]
+    assert payload["to"] == [f"user{i}@example.com" for i in range(20)]
+    assert payload["subject"] == ["Hello %recipient.first_name%"]
+    variables = json.loads(payload["recipient-variables"][0])
+    assert variables["user3@example.com"] == {"first_name": "User3"}
+
+
+def test_bulk_send_splits_recipients_into_provider_sized_batches(stub_server, monkeypatch):
+    """
+    Recipient lists over the provider's cap go out in one request per chunk.
+    """
+    monkeypatch.setattr(email_sender, "MAX_RECIPIENTS_PER_REQUEST", 5)
+    recipients = [f"user{i}@example.com" for i in range(12)]
+
+    results = send_bulk_emails("sender@example.com", recipients, "Hi {email}", "Body")
+
+    assert all(r["status"] == "sent" for r in results)
+    batches = [parse_qs(p.decode())["to"] for p in stub_server.payloads]
+    assert sorted(len(batch) for batch in batches) == [2, 5, 5]
+    assert sorted(address for batch in batches for address in batch) == sorted(recipients)
+
+
+def test_normalize_addresses():
+    """
+    Entries are split and stripped, duplicates dropped regardless of case, and bad ones explained.
+    """
+    valid, invalid = normalize_addresses(
+        ["Ann@Example.com, bob@example.com;", " ann@example.com", "carol@example", "dan@@example.com", "e f@x.io"]
+    )
+
+    assert valid == ["Ann@Example.com", "bob@example.com"]
+    assert invalid == [
+        ("carol@example", "invalid domain 'example'"),
+        ("dan@@example.com", "more than one @"),
+        ("e f@x.io", "contains spaces"),
+    ]
+    assert normalize_addresses("a@example.com\nb@example.com", cache=False) == (
+        ["a@example.com", "b@example.com"],
+        [],
+    )
+
+
+def test_chunk_recipients():
+    assert chunk_recipients(list(range(7)), 3) == [[0, 1, 2], [3, 4, 5], [6]]
+    assert chunk_recipients([], 3) == []
+
+
+def test_bulk_send_fails_when_nothing_sent(stub_server, monkeypatch):
+    """
+    A bulk send where every message fails is reported as an error.
+    """
+    monkeypatch.setattr(email_sender, "MAX_RETRIES", 0)
+    stub_server.script = [(500, {})] * 3
+
+    with pytest.raises(Exception, match="No emails could be sent"):
+        send_bulk_emails("sender@example.com", ["a@example.com", "b@example.com"], "Hi", "Body")
+
+
+def test_rate_limiter_spaces_calls():
+    """
+    Calls beyond the rate wait for their slot.
+    """
+    limiter = RateLimiter(rate=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.acquire()
+    assert time.monotonic() - start >= 5 / 50 * 0.9
@@ -0,0 +1,179 @@
+from email import message_from_bytes, policy
+import smtplib
+import socketserver
+import threading
+
+import pytest
+
+from src.automation import email_transport
+from src.automation.email_outbox import is_permanent_failure
+from src.automation.email_sender import InvalidAddressError, send_bulk_emails
+from src.automation.email_transport import SMTPTransport, StubTransport, get_transport, set_transport
+
+'''
+SMTP tests run against a minimal SMTP server in a background thread,
+which accepts every message unless told to reject a recipient.
+'''
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """
+    Speaks just enough SMTP for smtplib: greets, accepts MAIL/RCPT/DATA and records each message.
+    """
+
+    def reply(self, line):
+        self.wfile.write(f"{line}\r\n".encode())
+
+    def handle(self):
+        server = self.server
+        with server.lock:
+            server.connections += 1
+        self.reply("220 localhost sink")
+        while line := self.rfile.readline():
+            command = line.decode().strip()
+            verb = command.split(" ", 1)[0].upper()
+            if verb == "EHLO":
+                self.reply("250-localhost")
+                self.reply("250 8BITMIME")
+            elif verb == "RCPT" and any(rejected in command for rejected in server.rejected):
+                self.reply("550 No such user")
+            elif verb == "DATA":
+                self.reply("354 End data with <CR><LF>.<CR><LF>")
+                data = b"".join(iter(self.rfile.readline, b".\r\n"))
+                with server.lock:
+                    server.messages.append(data)
+                self.reply("250 Queued")
+                if server.drop_after_message:
+                    return
+            elif verb == "QUIT":
+                self.reply("221 Bye")
+                return
+            else:
+                self.reply("250 OK")
+
+
+@pytest.fixture
+def smtp_sink():
+    """
+    A local SMTP server counting connections and keeping received messages.
+    """
+    server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), SMTPSinkHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.messages = []
+    server.rejected = []
+    server.drop_after_message = False
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def smtp_transport(smtp_sink):
+    transport = SMTPTransport("127.0.0.1", smtp_sink.server_address[1], starttls=False)
+    yield transport
+    transport.close()
+
+
+def send(transport, to="recipient@example.com", **kwargs):
+    return transport.send_email(
+        from_address="sender@example.com",
+        to_addresses=[to],
+        subject="Test Subject",
+        body_text="Line one\nLine two",
+        **kwargs,
+    )
+
+
+def test_smtp_reuses_connections(smtp_sink, smtp_transport, tmp_path):
+    """
+    Consecutive messages go over one connection; attachments are included.
+    """
+    attachment = tmp_path / "report.txt"
+    attachment.write_text("quarterly numbers")
+
+    for i in range(5):
+        send(smtp_transport, to=f"user{i}@example.com", attachments=[str(attachment)])
+
+    assert smtp_sink.connections == 1
+    assert len(smtp_sink.messages) == 5
+    message = message_from_bytes(smtp_sink.messages[0], policy=policy.default)
+    assert message["To"] == "user0@example.com"
+    assert message.get_body(("plain",)).get_content().splitlines() == ["Line one", "Line two"]
+    (part,) = message.iter_attachments()
+    assert part.get_filename() == "report.txt"
+    assert part.get_content().strip() == "quarterly numbers"
+
+
+def test_smtp_reconnects_after_server_drops_connection(smtp_sink, smtp_transport):
+    """
+    A pooled connection the server closed is replaced without failing the send.
+    """
+    smtp_sink.drop_after_message = True
+    send(smtp_transport)
+    send(smtp_transport)
+
+    assert len(smtp_sink.messages) == 2
+    assert smtp_sink.connections == 2
+
+
+def test_smtp_rejection_is_permanent_and_keeps_connection(smtp_sink, smtp_transport):
+    """
+    A rejected recipient fails that message for good, while the connection stays in use.
+    """
+    smtp_sink.rejected = ["nobody@example.com"]
+    with pytest.raises(smtplib.SMTPRecipientsRefused) as exc_info:
+        send(smtp_transport, to="nobody@example.com")
+    assert is_permanent_failure(exc_info.value)
+
+    send(smtp_transport)
+    assert smtp_sink.connections == 1
+    assert len(smtp_sink.messages) == 1
+
+
+def test_stub_transport_drops_eml_files(tmp_path):
+    """
+    The stub keeps sent messages and writes them out as .eml files.
+    """
+    transport = StubTransport(directory=str(tmp_path / "drop"))
+    response = send(transport, cc_addresses=["cc@example.com"])
+
+    (eml,) = (tmp_path / "drop").glob("*.eml")
+    message = message_from_bytes(eml.read_bytes(), policy=policy.default)
+    assert message["Message-ID"] == response["id"]
+    assert message["Cc"] == "cc@example.com"
+    assert transport.sent[0]["to_addresses"] == ["recipient@example.com"]
+
+    with pytest.raises(InvalidAddressError):
+        send(transport, to="not-an-address")
+    assert transport.count == 1
+
+
+def test_transport_chosen_from_environment(monkeypatch):
+    """
+    EMAIL_TRANSPORT picks the shared transport; bulk sends go through it.
+    """
+    monkeypatch.setenv("EMAIL_TRANSPORT", "stub")
+    previous = set_transport(None)
+    try:
+        transport = get_transport()
+        assert isinstance(transport, StubTransport)
+        assert get_transport() is transport
+
+        results = send_bulk_emails(
+            from_address="sender@example.com",
+            recipients=[{"email": f"user{i}@example.com", "name": f"User {i}"} for i in range(20)],
+            subject="Hello {name}",
+            body_text="Hi {name}",
+        )
+        assert all(r["status"] == "sent" for r in results)
+        assert sorted(m["subject"] for m in transport.sent)[:2] == ["Hello User 0", "Hello User 1"]
+
+        monkeypatch.setenv("EMAIL_TRANSPORT", "carrier-pigeon")
+        with pytest.raises(ValueError):
+            email_transport.transport_from_env()
+    finally:
+        set_transport(previous)
@@ -1,5 +1,6 @@
 from datetime import datetime
 import shutil
+import threading
 
 import pytest
 
@@ -125,3 +126,96 @@ def test_undo_file_operation(test_directory):
     undo_file_operation()
     assert (test_directory / "image1.jpg").exists()
     assert not (test_directory / "images").exists()
+
+
+def test_progress_reports_every_file(test_directory):
+    """
+    Test that operations report progress per file, ending at the total.
+    """
+    reports = []
+    sort_by_type(test_directory, progress=lambda done, total: reports.append((done, total)))
+    assert reports == [(0, 4), (1, 4), (2, 4), (3, 4), (4, 4)]
+
+
+def test_cancelled_operation_can_be_undone(test_directory):
+    """
+    Test that files moved before a cancellation are logged, so Undo restores them.
+    """
+
+    class Cancelled(Exception):
+        pass
+
+    def progress(done, total):
+        if done == 2:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        sort_by_size(test_directory, progress=progress)
+    assert len(list((test_directory / "small").iterdir())) == 2
+
+    undo_file_operation()
+    assert sorted(p.name for p in test_directory.iterdir()) == ["audio1.mp3", "doc1.pdf", "image1.jpg", "small_file.txt"]
+
+
+def test_concurrent_operations_leave_a_complete_log(tmp_path):
+    """
+    Test that operations on different folders running at the same time leave the log
+    of one of them, whole, so Undo restores that folder.
+    """
+    folders = []
+    for i in range(4):
+        folder = tmp_path / f"folder{i}"
+        folder.mkdir()
+        for j in range(20):
+            (folder / f"file{j}.txt").write_text("content")
+        folders.append(folder)
+
+    threads = [threading.Thread(target=sort_by_type, args=(folder,)) for folder in folders]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    undo_file_operation()
+    restored = [folder for folder in folders if (folder / "file0.txt").exists()]
+    assert len(restored) == 1
+    assert sorted(p.name for p in restored[0].iterdir()) == sorted(f"file{j}.txt" for j in range(20))
+
+
+def test_cancelled_compression_keeps_originals(test_directory):
+    """
+    Test that cancelling compression removes the partial archive and keeps every original.
+    """
+
+    class Cancelled(Exception):
+        pass
+
+    def progress(done, total):
+        if done == 1:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        compress_files(test_directory, progress=progress)
+    assert not (test_directory / "compressed_files.zip").exists()
+    assert len(list(test_directory.iterdir())) == 4
+
+
+def test_cancel_at_last_report_keeps_completed_compression(test_directory):
+    """
+    Test that the final progress report comes after compression is committed, so a cancel
+    arriving then leaves the archive in place of the originals, logged for Undo.
+    """
+
+    class Cancelled(Exception):
+        pass
+
+    def progress(done, total):
+        if done == total:
+            raise Cancelled()
+
+    with pytest.raises(Cancelled):
+        compress_files(test_directory, progress=progress)
+    assert [p.name for p in test_directory.iterdir()] == ["compressed_files.zip"]
+
+    undo_file_operation()
+    assert sorted(p.name for p in test_directory.iterdir()) == ["audio1.mp3", "doc1.pdf", "image1.jpg", "small_file.txt"]
@@ -0,0 +1,135 @@
+import os
+import time
+
+import pandas as pd
+import pytest
+
+from src.automation import data_entry
+from src.automation.data_entry import merge_data, read_csv_or_excel
+from src.utils.frame_cache import FrameCache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    """
+    A FrameCache stored inside the temporary directory.
+    """
+    return FrameCache(cache_dir=str(tmp_path / "cache"))
+
+
+def test_cache_hit_and_invalidation(tmp_path, cache):
+    """
+    An unchanged file is served from the cache; a modified file is parsed again.
+    """
+    path = tmp_path / "people.csv"
+    path.write_text("Full Name\nAlice Smith\n")
+
+    calls = []
+
+    def reader(p):
+        calls.append(p)
+        return read_csv_or_excel(p)
+
+    first = cache.load(str(path), reader)
+    second = cache.load(str(path), reader)
+    assert len(calls) == 1
+    assert first.equals(second)
+
+    # Changing the file changes its size and mtime, so the entry no longer matches
+    path.write_text("Full Name\nAlice Smith\nBob Johnson\n")
+    third = cache.load(str(path), reader)
+    assert len(calls) == 2
+    assert len(third) == 2
+
+
+def test_cache_eviction(tmp_path):
+    """
+    Entries beyond the size budget are evicted, least recently used first.
+    """
+    cache = FrameCache(cache_dir=str(tmp_path / "cache"))
+    paths = []
+    for i in range(3):
+        path = tmp_path / f"file{i}.csv"
+        path.write_text(f"Full Name\nPerson {i}\n")
+        paths.append(str(path))
+
+    cache.load(paths[0], read_csv_or_excel)
+    cache.load(paths[1], read_csv_or_excel)
+    entries = [cache._entry_path(path) for path in paths]
+
+    # Room for two entries (they're the same size), with file0 older than file1
+    cache.max_bytes = 2 * os.path.getsize(entries[0])
+    now = time.time()
+    os.utime(entries[0], (now - 200, now - 200))
+    os.utime(entries[1], (now - 100, now - 100))
+
+    # Reading file0 makes it the most recently used, so adding file2 evicts file1
+    assert cache.get(paths[0]) is not None
+    cache.load(paths[2], read_csv_or_excel)
+
+    assert os.path.isfile(entries[0])
+    assert not os.path.exists(entries[1])
+    assert os.path.isfile(entries[2])
+
+
+def test_merge_data_uses_cache(tmp_path, cache):
+    """
+    merge_data with use_cache populates the cache and still produces the merged master.
+    """
+    master_file = tmp_path / "master.csv"
+    pd.DataFrame({"Full Name": ["Carol Adams"]}).to_csv(master_file, index=False)
+    other_file = tmp_path / "other.csv"
+    pd.DataFrame({"Full Name": ["Dan Williams"]}).to_csv(other_file, index=False)
+
+    merge_data(
+        source_directory=str(tmp_path),
+        data_params={
+            "master_file": str(master_file),
+            "other_files": [str(other_file)],
+            "force_single_name_col": True,
+            "use_cache": True,
+            "cache_dir": cache.cache_dir,
+        }
+    )
+
+    merged_df = pd.read_csv(master_file)
+    assert set(merged_df["Full Name"]) == {"Carol Adams", "Dan Williams"}
+    assert len(os.listdir(cache.cache_dir)) == 1
+    # The master is rewritten by every merge, so it isn't cached
+    assert cache.get(str(master_file)) is None
+
+
+def test_merge_cache_hit_skips_normalization(tmp_path, cache, mocker):
+    """
+    Incoming files are cached after normalization, keyed by the normalization options.
+    """
+    master_file = tmp_path / "master.csv"
+    other_file = tmp_path / "other.csv"
+    pd.DataFrame({"First Name": ["Dan"], "Last Name": ["Williams"]}).to_csv(other_file, index=False)
+
+    def merge(column_map=None):
+        pd.DataFrame({"Full Name": ["Carol Adams"]}).to_csv(master_file, index=False)
+        merge_data(
+            source_directory=str(tmp_path),
+            data_params={
+                "master_file": str(master_file),
+                "other_files": [str(other_file)],
+                "column_map": column_map,
+                "force_single_name_col": True,
+                "use_cache": True,
+                "cache_dir": cache.cache_dir,
+            }
+        )
+        return pd.read_csv(master_file)
+
+    merge()
+    normalize_spy = mocker.spy(data_entry, "_normalize_incoming")
+    merged_df = merge()
+
+    assert normalize_spy.call_count == 0
+    assert set(merged_df["Full Name"]) == {"Carol Adams", "Dan Williams"}
+    assert list(merged_df.columns) == ["Full Name"]
+
+    # Different normalization options miss the cache
+    merge(column_map={str(other_file): {"Last Name": "Surname"}})
+    assert normalize_spy.call_count == 1
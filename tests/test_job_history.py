@@ -0,0 +1,79 @@
+import pytest
+
+from src.automation.scheduler.job_history import JobHistory, measure_inputs, percentile
+
+
+@pytest.fixture
+def history(tmp_path):
+    """
+    A JobHistory database inside the temporary directory.
+    """
+    h = JobHistory(str(tmp_path / "history.db"))
+    yield h
+    h.close()
+
+
+def test_percentile_interpolates():
+    """
+    Percentiles interpolate between the closest ranks.
+    """
+    values = [1, 2, 3, 4, 5]
+    assert percentile(values, 50) == 3
+    assert percentile(values, 90) == pytest.approx(4.6)
+    assert percentile([], 50) is None
+
+
+def test_record_and_summarize(history):
+    """
+    Successful runs are summarized per task type; failures are kept but not summarized.
+    """
+    for i, duration in enumerate([10, 20, 30, 40]):
+        history.record(
+            "job1",
+            "compress_files",
+            "success",
+            scheduled_at=100 * i,
+            started_at=100 * i + 1,
+            finished_at=100 * i + 1 + duration,
+            files=3,
+            bytes_processed=300,
+        )
+    history.record("job1", "compress_files", "error", started_at=500, finished_at=999)
+    history.record("job2", "sort_by_type", "success", scheduled_at=0, started_at=5, finished_at=6)
+
+    stats = history.percentiles(metric="duration", percents=(50, 90))
+    assert stats["compress_files"] == {"count": 4, "last": 40, "p50": 25, "p90": pytest.approx(37)}
+    assert stats["sort_by_type"]["last"] == 1
+
+    delays = history.percentiles(task_type="sort_by_type", metric="queue_delay")
+    assert delays["sort_by_type"]["p50"] == 5
+
+    runs = history.runs(job_id="job1", limit=2)
+    assert [r["status"] for r in runs] == ["error", "success"]
+    assert runs[1]["bytes"] == 300
+
+    with pytest.raises(ValueError):
+        history.percentiles(metric="job_id")
+
+
+def test_history_is_rolling(tmp_path):
+    """
+    Only the most recent max_rows runs are kept.
+    """
+    history = JobHistory(str(tmp_path / "history.db"), max_rows=3)
+    for i in range(5):
+        history.record(f"job{i}", "rename_files", "success", started_at=i, finished_at=i + 1)
+
+    assert [r["job_id"] for r in history.runs()] == ["job4", "job3", "job2"]
+    history.close()
+
+
+def test_measure_inputs(tmp_path):
+    """
+    Folders count the files directly inside them; missing paths are ignored.
+    """
+    (tmp_path / "a.txt").write_text("12345")
+    (tmp_path / "sub").mkdir()
+    (tmp_path / "sub" / "b.txt").write_text("123")
+
+    assert measure_inputs([str(tmp_path), str(tmp_path / "sub" / "b.txt"), str(tmp_path / "missing")]) == (2, 8)
@@ -0,0 +1,154 @@
+import json
+import os
+
+from src.automation.scheduler import job_store
+from src.automation.scheduler.job_store import JobStore
+
+
+def make_job(job_id, run_time="10:00"):
+    """Builds a minimal job record."""
+    return {
+        "job_id": job_id,
+        "task_type": "sort_by_type",
+        "folder_target": "/test/folder",
+        "run_time": run_time,
+        "recurring_days": ["Monday"],
+    }
+
+
+def test_put_get_remove(tmp_path):
+    """
+    Jobs can be saved, looked up and removed, and the file matches json.dump(indent=2) output.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = JobStore(str(path))
+
+    store.put(make_job("job1"))
+    store.put(make_job("job2"))
+    store.put(make_job("job1", run_time="11:00"))  # Replaced jobs move to the end
+
+    assert store.get("job1")["run_time"] == "11:00"
+    assert path.read_text() == json.dumps([make_job("job2"), make_job("job1", run_time="11:00")], indent=2)
+
+    assert store.remove("job2") is True
+    assert store.remove("job2") is False
+    assert store.get("job2") is None
+    assert [j["job_id"] for j in json.loads(path.read_text())] == ["job1"]
+
+
+def test_detects_external_changes(tmp_path):
+    """
+    A change written by another process is picked up on the next lookup.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = JobStore(str(path))
+    store.put(make_job("job1"))
+
+    # Another process rewrites the file
+    path.write_text(json.dumps([make_job("job1"), make_job("job2")], indent=2))
+
+    assert store.get("job2") is not None
+    assert len(store) == 2
+
+
+def test_batch_writes_once(tmp_path, mocker):
+    """
+    Changes inside a batch are written to the file once, when the batch exits.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = JobStore(str(path))
+    flush = mocker.spy(store, "_flush")
+
+    with store.batch():
+        for i in range(5):
+            store.put(make_job(f"job{i}"))
+        assert not path.exists()
+
+    assert flush.call_count == 1
+    assert len(json.loads(path.read_text())) == 5
+
+
+def make_large_store(path, monkeypatch, count=20):
+    """Builds a store past the journal threshold, lowered for the test."""
+    monkeypatch.setattr(job_store, "JOURNAL_THRESHOLD_BYTES", 1024)
+    store = JobStore(str(path))
+    with store.batch():
+        for i in range(count):
+            store.put(make_job(f"job{i}"))
+    return store
+
+
+def test_large_store_appends_changes_to_journal(tmp_path, monkeypatch, mocker):
+    """
+    Past the threshold, a change appends one journal line instead of rewriting the file,
+    and other stores replay it.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = make_large_store(path, monkeypatch)
+    other = JobStore(str(path))
+    file_content = path.read_text()
+    flush = mocker.spy(store, "_flush")
+
+    store.put(make_job("job3", run_time="12:00"))
+    assert store.remove("job5") is True
+
+    assert flush.call_count == 0
+    assert path.read_text() == file_content
+    with open(store.journal_path) as f:
+        assert len(f.readlines()) == 3  # The header and two changes
+    assert other.get("job3")["run_time"] == "12:00"
+    assert "job5" not in other
+    assert [job["job_id"] for job in JobStore(str(path)).all()] == [job["job_id"] for job in store.all()]
+
+
+def test_journal_is_folded_into_file_once_it_outgrows_it(tmp_path, monkeypatch):
+    """
+    The journal is folded into the file once it's larger than the file, keeping writes amortized O(1).
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = make_large_store(path, monkeypatch)
+    file_size = path.stat().st_size
+
+    writes = 0
+    while os.path.exists(store.journal_path) or writes == 0:
+        writes += 1
+        store.put(make_job(f"job{writes % 20}", run_time="12:00"))
+
+    # Each change is a small fraction of the file, so many are journaled before one rewrite
+    assert writes > 5
+    assert os.path.getsize(path) >= file_size
+    assert json.loads(path.read_text()) == store.all()
+
+
+def test_file_edited_by_hand_makes_journal_obsolete(tmp_path, monkeypatch):
+    """
+    A file replaced without the journal (e.g. edited by hand) takes precedence over it.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = make_large_store(path, monkeypatch)
+    store.put(make_job("job1", run_time="12:00"))
+
+    path.write_text(json.dumps([make_job("job1", run_time="07:30")], indent=2))
+
+    assert [job["run_time"] for job in JobStore(str(path)).all()] == ["07:30"]
+    assert [job["run_time"] for job in store.all()] == ["07:30"]
+
+
+def test_incomplete_journal_line_waits(tmp_path, monkeypatch):
+    """
+    A journal line still being written is only applied once it's complete.
+    """
+    path = tmp_path / "scheduled_jobs.json"
+    store = make_large_store(path, monkeypatch)
+    store.put(make_job("job1", run_time="12:00"))
+    other = JobStore(str(path))
+
+    line = json.dumps({"put": make_job("new")}) + "\n"
+    with open(store.journal_path, "a") as f:
+        f.write(line[:10])
+    assert "new" not in other
+
+    with open(store.journal_path, "a") as f:
+        f.write(line[10:])
+    assert "new" in other
+    assert other.get("job1")["run_time"] == "12:00"
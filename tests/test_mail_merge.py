@@ -0,0 +1,105 @@
+import pandas as pd
+import pytest
+
+from src.automation import mail_merge as mail_merge_module
+from src.automation.email_transport import StubTransport
+from src.automation.mail_merge import MergeTemplate, mail_merge
+
+
+@pytest.fixture
+def contacts(tmp_path):
+    """
+    A spreadsheet of contacts with a malformed and a repeated address.
+    """
+    path = tmp_path / "contacts.csv"
+    pd.DataFrame(
+        {
+            "E-mail": [" ann@example.com", "bob@example.com", "not-an-address", "ANN@example.com", "cy@example.com"],
+            "First Name": ["Ann", "Bob", "Nobody", "Ann again", "Cy"],
+            "Account": ["007", "042", "000", "007", ""],
+        }
+    ).to_csv(path, index=False)
+    return str(path)
+
+
+class RecordingBatchTransport(StubTransport):
+    """A stub that takes recipients in batches, like Mailgun."""
+
+    name = "batch-stub"
+    batch_size = 2
+
+    def __init__(self):
+        super().__init__()
+        self.batches = []
+
+    def send_batch(self, from_address, recipients, subject, body_text, cc_addresses=None, attachments=None):
+        self.batches.append((recipients, subject, body_text))
+        return {"id": f"<batch-{len(self.batches)}@stub>"}
+
+
+def merge(data_file, **kwargs):
+    return mail_merge(
+        data_file,
+        from_address="sender@example.com",
+        subject="Statement for {first_name}",
+        body_text="Hi {first_name},\nyour account {Account} is ready.",
+        **kwargs,
+    )
+
+
+def test_template_renders_whole_columns():
+    """
+    Placeholders match columns by exact or unified name; unknown placeholders are an error.
+    """
+    frame = pd.DataFrame({"First Name": ["Ann", "Bob"], "city": ["Oslo", ""]})
+    template = MergeTemplate("{first_name} from {city}!", frame.columns)
+    assert template.render(frame).tolist() == ["Ann from Oslo!", "Bob from !"]
+
+    with pytest.raises(ValueError, match="No column for '{missing}'"):
+        MergeTemplate("Hi {missing}", frame.columns)
+
+
+def test_dry_run_writes_rendered_rows(contacts, tmp_path):
+    """
+    A dry run sends nothing and writes every row with what would happen to it.
+    """
+    output = tmp_path / "preview.csv"
+    summary = merge(contacts, dry_run_path=str(output), transport=RecordingBatchTransport())
+
+    preview = pd.read_csv(output, dtype=str, keep_default_na=False)
+    assert preview["to"].tolist()[:2] == ["ann@example.com", "bob@example.com"]
+    assert preview["subject"][0] == "Statement for Ann"
+    assert preview["body"][0] == "Hi Ann,\nyour account 007 is ready."
+    assert preview["status"].tolist() == ["send", "send", "invalid: missing @", "duplicate", "send"]
+    assert summary == {"rows": 5, "sent": 0, "failed": 1, "skipped": 1}
+
+
+def test_merge_sends_one_message_per_row(contacts):
+    """
+    Transports without batch sending get one rendered message per valid row.
+    """
+    transport = StubTransport()
+    summary = merge(contacts, transport=transport)
+
+    assert summary == {"rows": 5, "sent": 3, "failed": 1, "skipped": 1}
+    sent = {message["to_addresses"][0]: message for message in transport.sent}
+    assert sorted(sent) == ["ann@example.com", "bob@example.com", "cy@example.com"]
+    assert sent["bob@example.com"]["body_text"] == "Hi Bob,\nyour account 042 is ready."
+
+
+def test_merge_sends_batches_in_chunks(contacts, monkeypatch):
+    """
+    Batch transports get pre-rendered rows in chunks of their batch size, chunk by chunk of the file.
+    """
+    monkeypatch.setattr(mail_merge_module, "MERGE_CHUNK_ROWS", 4)
+    transport = RecordingBatchTransport()
+    summary = merge(contacts, transport=transport)
+
+    assert summary["sent"] == 3
+    assert [[r["email"] for r in recipients] for recipients, _, _ in transport.batches] == [
+        ["ann@example.com", "bob@example.com"],
+        ["cy@example.com"],
+    ]
+    recipients, subject, body_text = transport.batches[0]
+    assert (subject, body_text) == ("{subject}", "{body}")
+    assert recipients[1]["subject"] == "Statement for Bob"
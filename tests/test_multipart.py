@@ -0,0 +1,47 @@
+from email.parser import BytesParser
+from email.policy import HTTP
+
+from src.utils.multipart import MultipartEncoder
+
+
+def parse_body(encoder, body):
+    message = BytesParser(policy=HTTP).parsebytes(f"Content-Type: {encoder.content_type}\r\n\r\n".encode() + body)
+    return [(part.get_param("name", header="content-disposition"), part) for part in message.iter_parts()]
+
+
+def test_encoder_builds_a_parseable_body(tmp_path):
+    """
+    Fields and files come out as multipart parts, and the body matches the announced length.
+    """
+    report = tmp_path / "report.csv"
+    report.write_bytes(b"a,b\n1,2\n")
+    encoder = MultipartEncoder(
+        {"to": ["a@example.com", "b@example.com"], "cc": None, "subject": "Hi"}, [("attachment", str(report))]
+    )
+
+    body = encoder.read()
+    assert len(body) == len(encoder)
+
+    parts = parse_body(encoder, body)
+    assert [name for name, _ in parts] == ["to", "to", "subject", "attachment"]
+    attachment = parts[-1][1]
+    assert attachment.get_filename() == "report.csv"
+    assert attachment.get_payload(decode=True) == b"a,b\n1,2\n"
+
+
+def test_encoder_streams_files_in_chunks(tmp_path):
+    """
+    Large files are read piece by piece, and only opened once the upload reaches them.
+    """
+    big = tmp_path / "big.bin"
+    big.write_bytes(bytes(range(256)) * 1024)
+    encoder = MultipartEncoder({"subject": "Hi"}, [("attachment", str(big))], chunk_size=4096)
+
+    # Rewriting the file after the encoder is built shows it's read at upload time
+    content = bytes(reversed(range(256))) * 1024
+    big.write_bytes(content)
+
+    chunks = list(encoder)
+    assert max(len(chunk) for chunk in chunks) <= 4096
+    assert sum(len(chunk) for chunk in chunks) == len(encoder)
+    assert parse_body(encoder, b"".join(chunks))[-1][1].get_payload(decode=True) == content
@@ -0,0 +1,136 @@
+import threading
+import time
+
+from src.automation.scheduler import resource_gate
+from src.automation.scheduler.coordination import WorkerCoordinator
+from src.automation.scheduler.resource_gate import ResourceGate, normalize_target, targets_overlap
+
+
+def run_in_thread(gate, targets, events, name, priority=0, release=None):
+    """
+    Starts a thread that records when it enters and leaves the gate.
+    """
+
+    def worker():
+        with gate.hold(targets, priority=priority, label=name):
+            events.append(f"start {name}")
+            if release is not None:
+                release.wait(5)
+            events.append(f"end {name}")
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    return thread
+
+
+def wait_until(condition, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "Timed out waiting for condition"
+        time.sleep(0.01)
+
+
+def test_targets_overlap(tmp_path):
+    """
+    Nested folders overlap; siblings don't.
+    """
+    parent = normalize_target(str(tmp_path))
+    child = normalize_target(str(tmp_path / "child"))
+    sibling = normalize_target(str(tmp_path / "child2"))
+
+    assert targets_overlap(parent, child)
+    assert targets_overlap(child, child)
+    assert not targets_overlap(child, sibling)
+
+
+def test_same_folder_jobs_serialize(tmp_path):
+    """
+    A second job on a folder waits until the first one finishes.
+    """
+    gate = ResourceGate(io_slots_per_device=4)
+    events = []
+    release = threading.Event()
+
+    first = run_in_thread(gate, [str(tmp_path)], events, "sort", release=release)
+    wait_until(lambda: events == ["start sort"])
+    second = run_in_thread(gate, [str(tmp_path / "sub")], events, "compress")
+    wait_until(lambda: gate.waiting() == 1)
+
+    release.set()
+    first.join(5)
+    second.join(5)
+    assert events == ["start sort", "end sort", "start compress", "end compress"]
+
+
+def test_different_folders_run_in_parallel_up_to_disk_cap(tmp_path):
+    """
+    Jobs on separate folders run side by side until the disk's slots are used up.
+    """
+    gate = ResourceGate(io_slots_per_device=2)
+    events = []
+    release = threading.Event()
+
+    threads = [run_in_thread(gate, [str(tmp_path / name)], events, name, release=release) for name in "abc"]
+    wait_until(lambda: gate.running() == 2 and gate.waiting() == 1)
+
+    release.set()
+    for thread in threads:
+        thread.join(5)
+    assert gate.running() == 0
+    assert sorted(e for e in events if e.startswith("start")) == ["start a", "start b", "start c"]
+
+
+def test_waiting_jobs_admitted_by_priority(tmp_path):
+    """
+    When a folder frees up, the highest priority waiter runs next.
+    """
+    gate = ResourceGate()
+    events = []
+    release = threading.Event()
+
+    first = run_in_thread(gate, [str(tmp_path)], events, "running", release=release)
+    wait_until(lambda: gate.running() == 1)
+    low = run_in_thread(gate, [str(tmp_path)], events, "low", priority=0)
+    wait_until(lambda: gate.waiting() == 1)
+    high = run_in_thread(gate, [str(tmp_path)], events, "high", priority=5)
+    wait_until(lambda: gate.waiting() == 2)
+
+    release.set()
+    for thread in (first, low, high):
+        thread.join(5)
+    assert [e for e in events if e.startswith("start")] == ["start running", "start high", "start low"]
+
+
+def test_jobs_without_targets_pass_through():
+    """
+    Jobs that don't touch files (e.g. sending email) are never queued.
+    """
+    gate = ResourceGate(io_slots_per_device=1)
+    with gate.hold([]):
+        with gate.hold([None]):
+            assert gate.running() == 0
+
+
+def test_disk_cap_applies_across_workers(tmp_path, monkeypatch):
+    """
+    Gates of different daemon workers share the disk slots through the coordination database.
+    """
+    monkeypatch.setattr(resource_gate, "SHARED_SLOT_POLL_INTERVAL", 0.01)
+    db_path = str(tmp_path / "workers.db")
+    first = ResourceGate(io_slots_per_device=1, coordinator=WorkerCoordinator(db_path, worker_id="a"))
+    second = ResourceGate(io_slots_per_device=1, coordinator=WorkerCoordinator(db_path, worker_id="b"))
+    events = []
+    release = threading.Event()
+
+    running = run_in_thread(first, [str(tmp_path / "a")], events, "a", release=release)
+    wait_until(lambda: events == ["start a"])
+    waiting = run_in_thread(second, [str(tmp_path / "b")], events, "b")
+    time.sleep(0.2)
+    assert events == ["start a"]
+
+    release.set()
+    running.join(5)
+    waiting.join(5)
+    assert events == ["start a", "end a", "start b", "end b"]
+    first.coordinator.close()
+    second.coordinator.close()
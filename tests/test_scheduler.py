@@ -1,8 +1,18 @@
+from datetime import datetime, timedelta
 import json
+import os
+from pathlib import Path
+import subprocess
+import sys
+import threading
+import time
 
 from apscheduler.schedulers.base import SchedulerNotRunningError
 import pytest
+from watchdog.events import FileModifiedEvent
 
+from src.automation.scheduler import job_store
+from src.automation.scheduler.job_handler import TASK_FUNCTIONS, JSONFileChangeHandler, resolve_task
 from src.automation.scheduler.scheduler_manager import SchedulerManager
 
 
@@ -183,3 +193,362 @@ def test_shutdown(manager):
     (In practice, the fixture calls it, but here is done explicitly.)
     """
     manager.shutdown()
+
+
+def test_reload_only_touches_changed_jobs(manager, temp_jobs_file, mocker):
+    """
+    Reloading the file after editing one job reschedules only that job.
+    """
+    for i in range(3):
+        manager.add_scheduled_job(
+            task_type="sort_by_type",
+            folder_target=f"/folder{i}",
+            run_time="08:00",
+            recurring_days=["Monday"],
+            job_id=f"job{i}",
+        )
+
+    # Edit one job directly in the file, as the UI process would
+    data = json.loads(temp_jobs_file.read_text(encoding="utf-8"))
+    data[1]["run_time"] = "09:15"
+    temp_jobs_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+
+    schedule_spy = mocker.spy(manager, "_schedule_job")
+    manager.load_jobs_from_file()
+
+    assert schedule_spy.call_count == 1
+    assert schedule_spy.call_args[0][0]["job_id"] == "job1"
+    assert "minute='15'" in str(manager.scheduler.get_job("job1").trigger)
+
+
+def test_file_watcher_debounces_and_ignores_own_writes(manager, temp_jobs_file, mocker):
+    """
+    A burst of change events reloads once, and writes made by the manager itself don't reload.
+    """
+    handler = JSONFileChangeHandler(manager, debounce_seconds=0.05)
+    reload_spy = mocker.spy(manager, "load_jobs_from_file")
+
+    # The manager's own write is ignored
+    manager.add_scheduled_job(task_type="sort_by_type", folder_target="/own", run_time="08:00")
+    handler.on_modified(FileModifiedEvent(str(temp_jobs_file)))
+    time.sleep(0.2)
+    assert reload_spy.call_count == 0
+
+    # An external write emitting several events reloads once
+    data = json.loads(temp_jobs_file.read_text(encoding="utf-8"))
+    data[0]["run_time"] = "09:00"
+    temp_jobs_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    for _ in range(5):
+        handler.on_modified(FileModifiedEvent(str(temp_jobs_file)))
+    time.sleep(0.2)
+    assert reload_spy.call_count == 1
+
+
+def test_file_watcher_reloads_external_write_already_read_by_store(manager, temp_jobs_file, mocker):
+    """
+    An external write is still reloaded when the store reads the file before the debounce timer fires.
+    """
+    handler = JSONFileChangeHandler(manager, debounce_seconds=0.1)
+    manager.add_scheduled_job(task_type="sort_by_type", folder_target="/own", run_time="08:00", job_id="job0")
+    reload_spy = mocker.spy(manager, "load_jobs_from_file")
+
+    data = json.loads(temp_jobs_file.read_text(encoding="utf-8"))
+    data[0]["run_time"] = "09:30"
+    temp_jobs_file.write_text(json.dumps(data, indent=2), encoding="utf-8")
+    handler.on_modified(FileModifiedEvent(str(temp_jobs_file)))
+
+    # A lookup within the debounce window picks up the new content in the store
+    assert manager.job_store.get("job0")["run_time"] == "09:30"
+    time.sleep(0.3)
+
+    assert reload_spy.call_count == 1
+    assert "09:30" in str(manager.scheduler.get_job("job0").trigger)
+
+
+def test_file_watcher_reloads_job_cancelled_by_another_process(manager, temp_jobs_file):
+    """
+    A job another process adds and then cancels is unscheduled, even though the file
+    ends up byte-identical to the manager's own last write.
+    """
+    handler = JSONFileChangeHandler(manager, debounce_seconds=0.05)
+    # The manager's own last write leaves an empty list, like a one-time job cleanup
+    manager.add_scheduled_job(task_type="sort_by_type", folder_target="/once", run_time="08:00", job_id="once")
+    manager.remove_scheduled_job("once")
+    own_content = temp_jobs_file.read_bytes()
+
+    ui = SchedulerManager(jobs_file=str(temp_jobs_file))
+    try:
+        ui.add_scheduled_job(task_type="sort_by_type", folder_target="/ui", run_time="09:00", job_id="ui-job")
+        handler.on_modified(FileModifiedEvent(str(temp_jobs_file)))
+        time.sleep(0.2)
+        assert manager.scheduler.get_job("ui-job") is not None
+
+        ui.remove_scheduled_job("ui-job")
+        assert temp_jobs_file.read_bytes() == own_content
+        handler.on_modified(FileModifiedEvent(str(temp_jobs_file)))
+        time.sleep(0.2)
+        assert manager.scheduler.get_job("ui-job") is None
+    finally:
+        ui.shutdown()
+
+
+def test_file_watcher_reloads_journaled_changes(manager, temp_jobs_file, monkeypatch):
+    """
+    Changes another process appends to the journal of a large jobs file are reloaded.
+    """
+    monkeypatch.setattr(job_store, "JOURNAL_THRESHOLD_BYTES", 0)
+    handler = JSONFileChangeHandler(manager, debounce_seconds=0.05)
+    # Enough jobs that one more is appended to the journal rather than folded in right away
+    for i in range(10):
+        manager.add_scheduled_job(task_type="sort_by_type", folder_target=f"/own{i}", run_time="08:00")
+
+    ui = SchedulerManager(jobs_file=str(temp_jobs_file))
+    try:
+        ui.add_scheduled_job(task_type="sort_by_type", folder_target="/ui", run_time="09:00", job_id="ui-job")
+        assert os.path.exists(ui.job_store.journal_path)
+        handler.on_modified(FileModifiedEvent(ui.job_store.journal_path))
+        time.sleep(0.2)
+        assert manager.scheduler.get_job("ui-job") is not None
+    finally:
+        ui.shutdown()
+
+
+def test_reconcile_after_wake_only_touches_missed_jobs(manager):
+    """
+    After a wake-up, jobs due during the sleep gap are moved to now; later jobs keep their run time.
+    """
+    manager.add_scheduled_job(
+        task_type="sort_by_type", folder_target="/missed", run_time="08:00",
+        recurring_days=["Monday"], job_id="missed_job"
+    )
+    manager.add_scheduled_job(
+        task_type="sort_by_type", folder_target="/later", run_time="08:00",
+        recurring_days=["Monday"], job_id="later_job"
+    )
+
+    # Pause so the scheduler doesn't run the overdue job itself
+    manager.scheduler.pause()
+    now = datetime.now(manager.scheduler.timezone)
+    manager.scheduler.modify_job("missed_job", next_run_time=now - timedelta(hours=1))
+    later_run = manager.scheduler.get_job("later_job").next_run_time
+
+    assert manager._reconcile_after_wake() == 1
+    assert manager.scheduler.get_job("missed_job").next_run_time >= now
+    assert manager.scheduler.get_job("later_job").next_run_time == later_run
+
+
+def test_jobs_routed_to_executor_for_task_class(tmp_path):
+    """
+    CPU-heavy tasks run in the process pool, email in the network pool and the rest in the default pool.
+    Pool sizes can be overridden per executor class.
+    """
+    jobs_file = tmp_path / "jobs.json"
+    m = SchedulerManager(jobs_file=str(jobs_file), pool_sizes={"cpu": 2})
+    try:
+        assert m.pool_sizes["cpu"] == 2
+        assert m.pool_sizes["io"] == 10
+
+        routes = {}
+        for task_type in ("compress_files", "send_email", "sort_by_type"):
+            job_id = m.add_scheduled_job(task_type=task_type, folder_target="/test/folder", run_time="09:00")
+            routes[task_type] = m.scheduler.get_job(job_id).executor
+
+        assert routes == {"compress_files": "cpu", "send_email": "network", "sort_by_type": "default"}
+    finally:
+        m.shutdown()
+
+
+def test_run_task_serializes_jobs_on_same_folder(manager, tmp_path, mocker):
+    """
+    Scheduled tasks on the same folder never run at the same time.
+    """
+    active = []
+    overlaps = []
+
+    def fake_task(source_directory, **kwargs):
+        active.append(source_directory)
+        overlaps.append(len(active))
+        time.sleep(0.05)
+        active.remove(source_directory)
+
+    mocker.patch.dict("src.automation.scheduler.scheduler_manager.TASK_FUNCTIONS", {"sort_by_type": fake_task})
+
+    threads = [
+        threading.Thread(
+            target=manager._run_task, args=(f"job{i}", "sort_by_type", 0), kwargs={"source_directory": str(tmp_path)}
+        )
+        for i in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert overlaps == [1, 1, 1]
+
+
+def test_runs_recorded_in_history(manager, tmp_path, mocker):
+    """
+    Each executed job stores its timings and inputs, queryable as percentiles per task type.
+    """
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    (folder / "file.txt").write_text("hello")
+    mocker.patch.dict(
+        "src.automation.scheduler.scheduler_manager.TASK_FUNCTIONS", {"sort_by_type": lambda source_directory: None}
+    )
+
+    job_id = manager.add_scheduled_job(
+        task_type="sort_by_type", folder_target=str(folder), run_time="09:00", recurring_days=["Monday"]
+    )
+    manager.scheduler.get_job(job_id).modify(next_run_time=datetime.now(manager.scheduler.timezone))
+    manager.scheduler.wakeup()
+
+    deadline = time.monotonic() + 5
+    while not manager.get_job_history(job_id=job_id) and time.monotonic() < deadline:
+        time.sleep(0.05)
+
+    run = manager.get_job_history(job_id=job_id)[0]
+    assert run["status"] == "success"
+    assert run["files"] == 1 and run["bytes"] == 5
+    assert run["duration"] >= 0 and run["queue_delay"] >= 0
+    assert manager.get_task_statistics()["sort_by_type"]["count"] == 1
+
+
+def test_recurring_trigger_offset_crosses_midnight():
+    """
+    An offset past midnight moves the job to the next day of the week.
+    """
+    trigger = SchedulerManager._recurring_trigger(["Sunday"], "23:55", offset=400)
+    fields = {field.name: str(field) for field in trigger.fields}
+    assert (fields["day_of_week"], fields["hour"], fields["minute"], fields["second"]) == ("mon", "0", "1", "40")
+
+
+def test_jobs_at_same_time_are_spread(tmp_path):
+    """
+    With a spread window, recurring jobs saved for the same time start at distinct, stable offsets,
+    with longer tasks given more room. A lone job keeps its exact time.
+    """
+    jobs_file = tmp_path / "jobs.json"
+    m = SchedulerManager(jobs_file=str(jobs_file), spread_window=600)
+    try:
+        # compress_files typically takes far longer than the sorts
+        m.history.record("old", "compress_files", "success", started_at=0, finished_at=300)
+        m.history.record("old", "sort_by_type", "success", started_at=0, finished_at=10)
+        m.history.record("old", "sort_by_date", "success", started_at=0, finished_at=10)
+
+        # Fixed ids, with compress_files on the one the spread orders first, so a job always follows it
+        job_ids = sorted(["job-a", "job-b", "job-c"], key=SchedulerManager._spread_key)
+        for i, (job_id, task) in enumerate(zip(job_ids, ["compress_files", "sort_by_type", "sort_by_date"])):
+            m.add_scheduled_job(
+                task_type=task, folder_target=f"/f{i}", run_time="02:00", recurring_days=["Monday"], job_id=job_id
+            )
+        lone_id = m.add_scheduled_job(
+            task_type="rename_files", folder_target="/g", run_time="05:00", recurring_days=["Monday"]
+        )
+
+        offsets = {job_id: m.job_offsets[job_id] for job_id in job_ids}
+        assert len(set(offsets.values())) == 3
+        assert min(offsets.values()) == 0 and max(offsets.values()) < 600
+        assert m.job_offsets.get(lone_id, 0) == 0
+
+        # The job following compress_files starts well after the one following a sort
+        ordered = sorted(job_ids, key=offsets.get)
+        gaps = {m.job_metadata[a]["task_type"]: offsets[b] - offsets[a] for a, b in zip(ordered, ordered[1:])}
+        assert set(gaps) == {"compress_files", "sort_by_type"}
+        assert gaps["compress_files"] > 10 * gaps["sort_by_type"]
+    finally:
+        m.shutdown()
+
+    # Reloading the same jobs gives the same offsets
+    m2 = SchedulerManager(jobs_file=str(jobs_file), spread_window=600, history_file=str(tmp_path / "job_history.db"))
+    try:
+        assert {job_id: m2.job_offsets.get(job_id, 0) for job_id in job_ids} == offsets
+    finally:
+        m2.shutdown()
+
+
+def test_daemon_import_does_not_load_task_modules():
+    """
+    Importing the daemon leaves pandas and requests unloaded until a data or email job runs.
+    """
+    probe = "import sys, daemon; print(sorted(m for m in ('pandas', 'requests') if m in sys.modules))"
+    repo_root = Path(__file__).resolve().parents[1]
+    output = subprocess.run(
+        [sys.executable, "-c", probe], cwd=repo_root, capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "[]"
+
+
+def test_resolve_task_imports_on_first_use(mocker):
+    """
+    A task's dotted path is imported once and the function cached in the registry.
+    """
+    from src.automation.file_organizer import sort_by_size
+
+    mocker.patch.dict(TASK_FUNCTIONS, {"sort_by_size": "src.automation.file_organizer.sort_by_size"})
+    assert resolve_task("sort_by_size") is sort_by_size
+    assert TASK_FUNCTIONS["sort_by_size"] is sort_by_size
+
+    with pytest.raises(KeyError):
+        resolve_task("unknown_task")
+
+
+def test_email_jobs_share_stored_attachments(manager, tmp_path):
+    """
+    Jobs attaching the same file share one stored copy, removed with the last job using it.
+    """
+    attachment = tmp_path / "report.pdf"
+    attachment.write_bytes(b"%PDF quarterly numbers")
+    email_params = {
+        "from_address": "sender@example.com",
+        "to_addresses": ["recipient@example.com"],
+        "subject": "Report",
+        "body_text": "Attached.",
+        "attachments": [str(attachment)],
+    }
+
+    job_ids = [
+        manager.add_scheduled_job("send_email", None, "09:00", ["Monday"], email_params=dict(email_params))
+        for _ in range(3)
+    ]
+    stored = {manager.scheduler.get_job(job_id).kwargs["attachments"][0] for job_id in job_ids}
+    assert len(stored) == 1
+    (stored_path,) = stored
+
+    for job_id in job_ids[:-1]:
+        manager.remove_scheduled_job(job_id)
+    assert os.path.isfile(stored_path)
+
+    manager.remove_scheduled_job(job_ids[-1])
+    assert not os.path.exists(stored_path)
+
+
+def test_job_snapshot_is_cached_and_sorted(manager, temp_jobs_file, mocker):
+    """
+    The job snapshot lists jobs by next run, is reused until jobs change,
+    and loses a cancelled job without being rebuilt.
+    """
+    now = datetime.now()
+    times = [(now + timedelta(hours=hours)).strftime("%H:%M") for hours in (3, 1, 2)]
+    every_day = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+    job_ids = [
+        manager.add_scheduled_job("sort_by_type", f"/folder{i}", run_time, every_day)
+        for i, run_time in enumerate(times)
+    ]
+
+    snapshot = manager.job_snapshot()
+    assert [row["job_id"] for row in snapshot] == [job_ids[1], job_ids[2], job_ids[0]]
+    assert manager.job_snapshot() is snapshot
+
+    get_jobs = mocker.spy(manager.scheduler, "get_jobs")
+    manager.remove_scheduled_job(job_ids[2])
+    assert [row["job_id"] for row in manager.job_snapshot()] == [job_ids[1], job_ids[0]]
+    assert get_jobs.call_count == 0
+
+    # Another process editing the file invalidates the snapshot
+    time.sleep(0.01)
+    data = json.loads(temp_jobs_file.read_text(encoding="utf-8"))
+    temp_jobs_file.write_text(json.dumps(data[:1]), encoding="utf-8")
+    manager.load_jobs_from_file()
+    assert [row["job_id"] for row in manager.job_snapshot()] == [job_ids[0]]
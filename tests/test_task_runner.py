@@ -0,0 +1,46 @@
+import pytest
+
+pytest.importorskip("PyQt5")
+
+from src.ui.task_runner import BackgroundTask, TaskCancelled, wait_for_tasks  # noqa: E402
+
+
+def test_cancel_stops_at_next_report_but_not_the_final_one():
+    """
+    A cancelled task stops at its next progress report, but the final report,
+    made once the work is committed, doesn't turn finished work into a cancellation.
+    """
+    task = BackgroundTask(lambda progress: None, report_progress=True)
+    task.cancel()
+
+    with pytest.raises(TaskCancelled):
+        task.report(1, 3)
+    task.report(3, 3)
+
+
+def test_task_cancelled_at_last_report_finishes():
+    """
+    A task cancelled just before its final report emits finished with its result.
+    """
+
+    def work(progress):
+        progress(0, 2)
+        progress(1, 2)
+        task.cancel()
+        progress(2, 2)
+        return "done"
+
+    task = BackgroundTask(work, report_progress=True)
+    outcomes = []
+    task.signals.finished.connect(lambda result: outcomes.append(("finished", result)))
+    task.signals.cancelled.connect(lambda: outcomes.append(("cancelled", None)))
+    task.run()
+
+    assert outcomes == [("finished", "done")]
+
+
+def test_wait_for_tasks_reports_whether_tasks_finished():
+    """
+    wait_for_tasks returns True when no task is left running, so closing the app can go ahead.
+    """
+    assert wait_for_tasks(0) is True